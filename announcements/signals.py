@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tournamentapp.changes import record_change
+from tournamentapp.models import ChangeLogEntry
+
+from .models import Announcement
+
+
+@receiver([post_save, post_delete], sender=Announcement)
+def announcement_changed(sender, instance, **kwargs):
+    record_change(
+        instance.tournament_id, ChangeLogEntry.ANNOUNCEMENT, instance.pk,
+        deleted=kwargs['signal'] is post_delete,
+    )
@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib.auth import get_user_model
@@ -7,6 +8,13 @@ from tournamentapp.models import Tournament, Team, Field, Match
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def user(db):
     return User.objects.create_user(
@@ -0,0 +1,59 @@
+import apiClient, { snapshotUrl } from "./client";
+import type { ChangesResponse } from "../types/changes";
+
+export const getChanges = async (slug: string, since: number | null) => {
+  const response = await apiClient.get<ChangesResponse>(
+    `/tournaments/${slug}/changes/`,
+    { params: since === null ? {} : { since } }
+  );
+  return response.data;
+};
+
+interface ChangeHandlers {
+  // (Re)load everything; called first and whenever the cursor expires.
+  onReset: () => Promise<void> | void;
+  onChanges: (changes: ChangesResponse) => void;
+}
+
+/**
+ * Poll the tournament's change feed. The cursor is taken before the
+ * full load, so nothing that changes during it is missed (changes are
+ * idempotent to apply twice). Returns a function that stops polling.
+ * A published snapshot never changes, so it is loaded once instead.
+ */
+export function subscribeToChanges(
+  slug: string,
+  { onReset, onChanges }: ChangeHandlers,
+  intervalMs = 15000
+) {
+  if (snapshotUrl) {
+    Promise.resolve(onReset()).catch(console.error);
+    return () => {};
+  }
+
+  let cursor: number | null = null;
+  let busy = false;
+
+  const tick = async () => {
+    if (busy) return;
+    busy = true;
+    try {
+      const changes = await getChanges(slug, cursor);
+      const reset = cursor === null || changes.reset;
+      cursor = changes.cursor;
+      if (reset) {
+        await onReset();
+      } else {
+        onChanges(changes);
+      }
+    } catch (err) {
+      console.error(err);
+    } finally {
+      busy = false;
+    }
+  };
+
+  tick();
+  const interval = setInterval(tick, intervalMs);
+  return () => clearInterval(interval);
+}
@@ -7,5 +7,22 @@ const apiClient = axios.create({
   },
 });
 
+// A finished tournament is published as static JSON files; the page
+// tells us where they live and reads go straight to them.
+export const snapshotUrl =
+  document.getElementById("root")?.dataset.snapshotUrl || null;
 
-export default apiClient;
\ No newline at end of file
+const SNAPSHOT_PATH = /^\/tournaments\/[^/]+\/(?:([a-z-]+)\/)?$/;
+
+apiClient.interceptors.request.use((config) => {
+  const match = snapshotUrl && config.url?.match(SNAPSHOT_PATH);
+  if (match && (config.method ?? "get") === "get") {
+    config.url = `${snapshotUrl}/${match[1] ?? "meta"}.json`;
+    config.params = undefined;
+    config.headers.delete("Content-Type");
+  }
+  return config;
+});
+
+
+export default apiClient;
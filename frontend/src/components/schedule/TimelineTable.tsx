@@ -10,6 +10,7 @@ type MatchData = {
 };
 
 type TimelineRow = {
+  date?: string;
   time: string;
   matches?: (MatchData | null)[];
 };
@@ -17,12 +18,14 @@ type TimelineRow = {
 interface TimelineTableProps {
   fieldNames?: string[];
   timeline?: TimelineRow[];
+  showDate?: boolean;
   maxHeight?: number | string;
 }
 
 export default function TimelineTable({
   fieldNames = [],
   timeline = [],
+  showDate = false,
   maxHeight = "60vh",
 }: TimelineTableProps) {
   const containerRef = useRef<HTMLDivElement>(null);
@@ -167,11 +170,12 @@ export default function TimelineTable({
                     textAlign: "center",
                   }}
                 >
+                  {showDate && row.date && <div>{row.date}</div>}
                   {row.time}
                 </td>
 
                 {/* MATCH CELLS */}
-                {(row.matches ?? []).filter(Boolean).map((match, fIdx) => (
+                {(row.matches ?? []).map((match, fIdx) => (
                   <td
                     key={fIdx}
                     style={{
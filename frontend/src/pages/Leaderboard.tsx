@@ -1,14 +1,35 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import apiClient from "../api/client";
+import { subscribeToChanges } from "../api/changes";
 import type { LeaderboardResponse } from "../types/leaderboard";
+import type { StandingsDelta } from "../types/changes";
 
 interface Props {
   slug: string;
 }
 
+// Merge changed rows and reorder; null if a team in the new order is unknown.
+function applyStandingsChanges(
+  data: LeaderboardResponse,
+  delta: StandingsDelta
+): LeaderboardResponse | null {
+  const rows = new Map(data.standings.map((team) => [team.team_id, team]));
+  delta.teams.forEach((team) => rows.set(team.team_id, team));
+
+  const standings = delta.order.map((id) => rows.get(id));
+  if (standings.some((team) => !team)) return null;
+
+  return {
+    standings: standings as LeaderboardResponse["standings"],
+    top_scorers: delta.top_scorers,
+  };
+}
+
 export default function Leaderboard({ slug }: Props) {
   const [data, setData] = useState<LeaderboardResponse | null>(null);
   const [loading, setLoading] = useState(true);
+  const dataRef = useRef(data);
+  dataRef.current = data;
 
   const fetchLeaderboard = async () => {
     try {
@@ -24,9 +45,22 @@ export default function Leaderboard({ slug }: Props) {
   };
 
   useEffect(() => {
-    fetchLeaderboard();
-    const interval = setInterval(fetchLeaderboard, 80000);
-    return () => clearInterval(interval);
+    return subscribeToChanges(slug, {
+      onReset: fetchLeaderboard,
+      onChanges: (changes) => {
+        const delta = changes.standings;
+        if (!delta) return;
+
+        const current = dataRef.current;
+        if (!current) return;
+        const next = applyStandingsChanges(current, delta);
+        if (next) {
+          setData(next);
+        } else {
+          fetchLeaderboard();
+        }
+      },
+    });
   }, [slug]);
 
   if (loading)
@@ -69,12 +103,12 @@ export default function Leaderboard({ slug }: Props) {
             fontSize: "clamp(0.85rem, 1vw, 1rem)",
             background: "#ffffff",
             color: "#1b1b1b",
-            minWidth: 520,
+            minWidth: 620,
           }}
         >
           <thead>
             <tr>
-              {["#", "Team", "Pts", "W", "D", "L", "GF", "GA", "GD"].map(
+              {["#", "Team", "Pts", "W", "D", "L", "GF", "GA", "GD", "Form"].map(
                 (h) => (
                   <th
                     key={h}
@@ -105,7 +139,7 @@ export default function Leaderboard({ slug }: Props) {
 
               return (
                 <tr
-                  key={team.team_name}
+                  key={team.team_id}
                   style={{
                     background: isTop
                       ? "#fff8e1"
@@ -202,6 +236,41 @@ export default function Leaderboard({ slug }: Props) {
                       ? " ▼"
                       : ""}
                   </td>
+
+                  {/* Form: last five results, most recent last */}
+                  <td
+                    style={{ textAlign: "center", padding: "8px", whiteSpace: "nowrap" }}
+                    title={
+                      team.win_streak > 1
+                        ? `${team.win_streak} wins in a row`
+                        : team.unbeaten_streak > 1
+                        ? `Unbeaten in ${team.unbeaten_streak}`
+                        : undefined
+                    }
+                  >
+                    {team.form.split("").map((result, i) => (
+                      <span
+                        key={i}
+                        style={{
+                          display: "inline-block",
+                          width: 18,
+                          marginRight: 2,
+                          borderRadius: 3,
+                          fontSize: "0.75em",
+                          fontWeight: 800,
+                          color: "#fff",
+                          background:
+                            result === "W"
+                              ? "#2e7d32"
+                              : result === "D"
+                              ? "#9e9e9e"
+                              : "#c62828",
+                        }}
+                      >
+                        {result}
+                      </span>
+                    ))}
+                  </td>
                 </tr>
               );
             })}
@@ -239,7 +308,7 @@ export default function Leaderboard({ slug }: Props) {
                 transition: "background 0.2s ease",
               }}
             >
-              <div style={{ fontWeight: 800 }}>{i + 1}</div>
+              <div style={{ fontWeight: 800 }}>{p.position}</div>
 
               <div style={{ fontSize: "0.95rem", color: "#1b1b1b" }}>
                 {p.player_name}
@@ -1,15 +1,68 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import apiClient from "../api/client";
+import { subscribeToChanges } from "../api/changes";
 import type { ScheduleResponse } from "../types/match";
+import type { ChangesResponse } from "../types/changes";
 import TimelineTable from "../components/schedule/TimelineTable";
 
 interface Props {
   slug: string;
 }
 
+// Apply changed and deleted matches to the timeline; null when the
+// delta can't be applied (e.g. a field the timeline doesn't have).
+function applyMatchChanges(
+  data: ScheduleResponse,
+  changes: ChangesResponse
+): ScheduleResponse | null {
+  const changed = changes.matches ?? [];
+  const removed = new Set([
+    ...(changes.deleted_matches ?? []),
+    ...changed.map((m) => m.id),
+  ]);
+
+  const timeline = data.timeline.map((row) => ({
+    ...row,
+    matches: row.matches.map((m) => (m && removed.has(m.id) ? null : m)),
+  }));
+
+  for (const match of changed) {
+    const column = data.fields.findIndex((f) => f.id === match.field_id);
+    if (column < 0) return null;
+
+    let row = timeline.find((r) => r.slot === match.slot);
+    if (!row) {
+      row = {
+        slot: match.slot,
+        date: match.date,
+        time: match.time,
+        matches: data.fields.map(() => null),
+      };
+      timeline.push(row);
+    }
+    row.matches[column] = match;
+  }
+
+  // slots carry their UTC offset, which changes across DST
+  const rows = timeline
+    .filter((row) => row.matches.some(Boolean))
+    .sort((a, b) => Date.parse(a.slot) - Date.parse(b.slot));
+
+  return {
+    ...data,
+    days: [...new Set(rows.map((row) => row.date))],
+    timeline: rows,
+    current_matches: rows
+      .flatMap((row) => row.matches)
+      .filter((m): m is NonNullable<typeof m> => !!m && !m.is_finished),
+  };
+}
+
 export default function Schedule({ slug }: Props) {
   const [data, setData] = useState<ScheduleResponse | null>(null);
   const [loading, setLoading] = useState(true);
+  const dataRef = useRef(data);
+  dataRef.current = data;
 
   const fetchSchedule = async () => {
     try {
@@ -25,7 +78,25 @@ export default function Schedule({ slug }: Props) {
   };
 
   useEffect(() => {
-    fetchSchedule();
+    return subscribeToChanges(slug, {
+      onReset: fetchSchedule,
+      onChanges: (changes) => {
+        if (changes.schedule_changed) {
+          fetchSchedule();
+          return;
+        }
+        if (!changes.matches?.length && !changes.deleted_matches?.length) return;
+
+        const current = dataRef.current;
+        if (!current) return;
+        const next = applyMatchChanges(current, changes);
+        if (next) {
+          setData(next);
+        } else {
+          fetchSchedule();
+        }
+      },
+    });
   }, [slug]);
 
   if (loading) return <div>Loading schedule...</div>;
@@ -37,7 +108,8 @@ export default function Schedule({ slug }: Props) {
       <TimelineTable
         timeline={data.timeline}
         fieldNames={data.field_names}
+        showDate={data.days.length > 1}
       />
     </div>
   );
-}
\ No newline at end of file
+}
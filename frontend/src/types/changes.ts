@@ -0,0 +1,30 @@
+import type { Announcement } from "./announcement";
+import type { TimelineMatch } from "./match";
+import type { TeamStanding, TopScorer } from "./leaderboard";
+import type { Vendor } from "./vendors";
+
+export type ChangedMatch = TimelineMatch & {
+  slot: string;
+  date: string;
+  time: string;
+  start_time: string;
+};
+
+export type StandingsDelta = {
+  order: number[];
+  teams: TeamStanding[];
+  top_scorers: TopScorer[];
+};
+
+export type ChangesResponse = {
+  cursor: number;
+  reset: boolean;
+  schedule_changed?: boolean;
+  matches?: ChangedMatch[];
+  deleted_matches?: number[];
+  standings?: StandingsDelta;
+  announcements?: (Announcement & { id: number })[];
+  deleted_announcements?: number[];
+  vendors?: Vendor[];
+  deleted_vendors?: number[];
+};
@@ -1,15 +1,21 @@
 export type TeamStanding = {
+  team_id: number;
   team_name: string;
   points: number;
+  rating: number;
   wins: number;
   draws: number;
   losses: number;
   goals_for: number;
   goals_against: number;
   goal_difference: number;
+  form: string;
+  win_streak: number;
+  unbeaten_streak: number;
 };
 
 export type TopScorer = {
+  position: number;
   player_name: string;
   team_name: string;
   goals: number;
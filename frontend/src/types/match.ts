@@ -3,18 +3,29 @@ export type TimelineMatch = {
   home_team: string;
   away_team: string;
   field: string;
+  field_id: number;
   home_score: number;
   away_score: number;
   is_finished: boolean;
 };
 
+export type TimelineField = {
+  id: number;
+  name: string;
+};
+
 export type TimelineRow = {
+  slot: string;
+  date: string;
   time: string;
   matches: (TimelineMatch | null)[];
 };
 
 export type ScheduleResponse = {
+  timezone: string;
+  fields: TimelineField[];
   field_names: string[];
+  days: string[];
   timeline: TimelineRow[];
   current_matches: TimelineMatch[];
 };
\ No newline at end of file
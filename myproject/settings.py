@@ -2,6 +2,7 @@ from pathlib import Path
 import os
 from decouple import config, Csv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 import mimetypes
 
 
@@ -71,9 +72,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tournamentapp.middleware.RequestTimingMiddleware",
+    "tournamentapp.middleware.ReadYourWritesMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "tournamentapp.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -83,6 +86,57 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# ------------------------------------------------------------------------------
+# Request instrumentation (tournamentapp.middleware.RequestTimingMiddleware)
+# ------------------------------------------------------------------------------
+
+# Fraction of requests that are timed (0.0 - 1.0). Unsampled requests
+# skip the middleware entirely.
+PERF_INSTRUMENTATION_ENABLED = config("PERF_INSTRUMENTATION_ENABLED", default=True, cast=bool)
+PERF_SAMPLE_RATE = config("PERF_SAMPLE_RATE", default=1.0 if DEBUG else 0.1, cast=float)
+PERF_SERVER_TIMING_HEADER = config("PERF_SERVER_TIMING_HEADER", default=True, cast=bool)
+
+# Standings projection (tournamentapp.projection)
+# ------------------------------------------------------------------------------
+
+# Run simulations in the request instead of queueing a job.
+PROJECTION_RUN_INLINE = config("PROJECTION_RUN_INLINE", default=False, cast=bool)
+
+# Job queue (tournamentapp.jobs)
+# ------------------------------------------------------------------------------
+
+# Jobs of each queue that may run at once across all `run_workers` processes,
+# and the threads each process starts for it.
+JOB_QUEUES = {
+    "default": 1,
+    "warming": 2,
+    "snapshots": 1,
+}
+# Run jobs in the enqueueing process after commit instead of on a worker.
+JOBS_RUN_INLINE = config("JOBS_RUN_INLINE", default=False, cast=bool)
+
+# Cache warming (tournamentapp.warming)
+# ------------------------------------------------------------------------------
+
+# Seconds a burst of result changes is collected before one rebuild of the
+# tournament's public payloads; 0 rebuilds right after each commit.
+CACHE_WARM_DEBOUNCE = config("CACHE_WARM_DEBOUNCE", default=2.0, cast=float)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "tournamentapp.performance": {
+            "handlers": ["console"],
+            "level": config("PERF_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 CSRF_TRUSTED_ORIGINS = [
     "https://eventmanager-ep2v.onrender.com"
 ]
@@ -123,6 +177,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "tournamentapp.api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 # Database
@@ -130,7 +188,9 @@ DATABASE_URL = config("DATABASE_URL", default=None)
 
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        'default': dj_database_url.parse(
+            DATABASE_URL, conn_max_age=600, conn_health_checks=True,
+        )
     }
 
 else:
@@ -142,6 +202,77 @@ else:
         )
     }
 
+# Read replicas (tournamentapp.routers): the public API and SPA page read
+# from these; everything else uses the primary. Comma-separated URLs.
+DATABASE_REPLICA_URLS = config("DATABASE_REPLICA_URLS", default="", cast=Csv())
+
+# Replicas are connected like the primary, pool included (below).
+for index, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f"replica_{index}"] = {
+        **dj_database_url.parse(
+            url, conn_max_age=DATABASES["default"]["CONN_MAX_AGE"], conn_health_checks=True,
+        ),
+        # tests read the replica from the test database
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["tournamentapp.routers.ReplicaRouter"]
+
+# Seconds a browser reads from the primary after it wrote.
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+# Seconds an unreachable replica is skipped before it is tried again.
+REPLICA_RETRY_SECONDS = config("REPLICA_RETRY_SECONDS", default=30, cast=int)
+# Longest time a payload built from a replica is cached (it may predate
+# the write that invalidated the previous one).
+REPLICA_CACHE_TIMEOUT = config("REPLICA_CACHE_TIMEOUT", default=15, cast=int)
+
+# PostgreSQL connection pool (psycopg_pool), one per worker process. Sync
+# views under the ASGI workers run in a fresh thread per request, so
+# persistent per-thread connections were never reused; checking out of the
+# pool skips the connection setup. Connections are checked on checkout
+# (CONN_HEALTH_CHECKS) and go back to the pool when the request finishes.
+# Every alias gets its own pool, replica_N included. Keep DB_POOL_MAX_SIZE x
+# web processes (+ workers) under each server's connection limit.
+DB_POOL = config("DB_POOL", default=True, cast=bool)
+
+for alias, database in DATABASES.items():
+    if not DB_POOL or database["ENGINE"] != "django.db.backends.postgresql":
+        continue
+    database["CONN_MAX_AGE"] = 0
+    database.setdefault("OPTIONS", {})["pool"] = {
+        "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+        # seconds a request waits for a free connection before failing
+        "timeout": config("DB_POOL_TIMEOUT", default=10.0, cast=float),
+        # idle connections above min_size are closed after this many seconds
+        "max_idle": config("DB_POOL_MAX_IDLE", default=300.0, cast=float),
+        "name": alias,
+    }
+
+# Cache
+# Public API payloads are cached under per-tournament version counters
+# (tournamentapp.cache), which live in the cache too. Every web worker
+# and the job worker must therefore share one cache: a version bumped in
+# one process's LocMemCache is never seen by the others, which would keep
+# serving stale payloads until they expire.
+REDIS_URL = config("REDIS_URL", default="")
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.redis.RedisCache" if REDIS_URL
+            else "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=REDIS_URL or "tournamentmanager"),
+    }
+}
+if not DEBUG and CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    raise ImproperlyConfigured(
+        "LocMemCache is per process, so cache invalidations would not reach the other "
+        "workers. Set REDIS_URL (or CACHE_BACKEND/CACHE_LOCATION) to a shared cache."
+    )
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -262,6 +393,7 @@ AZURE_CONNECTION_STRING = config("AZURE_CONNECTION_STRING", default="")
 AZURE_CONTAINER = config("AZURE_CONTAINER", default="")
 AZURE_CONTAINER_STATIC = "static"
 AZURE_CONTAINER_MEDIA = "media"
+AZURE_CONTAINER_SNAPSHOTS = config("AZURE_CONTAINER_SNAPSHOTS", default="snapshots")
 STATIC_URL = f'https://{AZURE_ACCOUNT_NAME}.blob.core.windows.net/{AZURE_CONTAINER_STATIC}/'
 
 
@@ -285,6 +417,18 @@ STORAGES = {
             "connection_string": AZURE_CONNECTION_STRING,
             "cache_control": AZURE_BLOB_CACHE_CONTROL,
         }
-    }
+    },
+    # Published JSON of finished tournaments; every publish gets a new
+    # path, so the files can be cached forever.
+    "snapshots": {
+        "BACKEND": "storages.backends.azure_storage.AzureStorage",
+        "OPTIONS": {
+            "azure_container": AZURE_CONTAINER_SNAPSHOTS,
+            "account_name": AZURE_ACCOUNT_NAME,
+            "account_key": AZURE_ACCOUNT_KEY,
+            "connection_string": AZURE_CONNECTION_STRING,
+            "cache_control": AZURE_BLOB_CACHE_CONTROL,
+        }
+    },
 }
 
@@ -5,6 +5,14 @@ AZURE_ACCOUNT_NAME = "test"
 AZURE_ACCOUNT_KEY = "test"
 SECRET_KEY = "test-secret-key"
 
+STORAGES = {
+    **STORAGES,
+    "snapshots": {
+        "BACKEND": "django.core.files.storage.InMemoryStorage",
+        "OPTIONS": {"base_url": "/snapshots/"},
+    },
+}
+
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
@@ -13,5 +21,15 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
-    }
-}
\ No newline at end of file
+    },
+    # routing tests turn it on with DATABASE_REPLICAS
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+DATABASE_REPLICAS = []
+PERF_SAMPLE_RATE = 1.0
+PROJECTION_RUN_INLINE = True
+JOBS_RUN_INLINE = True
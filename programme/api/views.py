@@ -1,26 +1,22 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.permissions import AllowAny
-from django.shortcuts import get_object_or_404
-
-from tournamentapp.models import Tournament
+from tournamentapp.api.base import PublicAPIView
+from tournamentapp.snapshots import snapshot_redirect
 from programme.models import SideEvent
 from .serializers import SideEventSerializer
 
 
-class SideEventListAPIView(APIView):
-    permission_classes = [AllowAny]
-
-    def get(self, request, slug):
-        tournament = get_object_or_404(Tournament, slug=slug)
+class SideEventListAPIView(PublicAPIView):
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
 
         if not tournament.show_side_events:
-            return Response(
-                {'detail': 'Side Events are not public for this tournament.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            return self.error('Side Events are not public for this tournament.', 404)
+
+        published = snapshot_redirect(tournament, 'side-events')
+        if published:
+            return published
 
-        side_events = SideEvent.objects.filter(tournament=tournament, is_active=True)
+        side_events = [
+            obj async for obj in SideEvent.objects.filter(tournament=tournament, is_active=True)
+        ]
         serializer = SideEventSerializer(side_events, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return self.respond(serializer.data)
\ No newline at end of file
@@ -5,4 +5,5 @@ from .models import SponsorBanner
 @admin.register(SponsorBanner)
 class SponsorBannerAdmin(admin.ModelAdmin):
     list_display = ("name", "tournament", "uploaded_at")
+    list_select_related = ("tournament__owner",)
     list_filter = ("tournament",)
\ No newline at end of file
@@ -2,7 +2,7 @@ from django.contrib import admin
 
 # Register your models here.
 from django.contrib import admin
-from .models import Team, Player, Match, GoalEvent, Field, MatchEvent, Tournament
+from .models import Team, Player, Match, GoalEvent, Field, MatchEvent, Tournament, RatingChange, SuspensionLog, Job
 
 @admin.register(Tournament)
 class TournamentAdmin(admin.ModelAdmin):
@@ -11,18 +11,22 @@ class TournamentAdmin(admin.ModelAdmin):
 
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
-    list_display = ('name', 'tournament_points', 'tournament')
+    list_display = ('name', 'tournament_points', 'rating', 'tournament')
+    list_select_related = ('tournament__owner',)
     search_fields = ('name',)
 
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
     list_display = ('name', 'team',)
+    list_select_related = ('team',)
     list_filter = ('team',)
     search_fields = ('name',)
+    readonly_fields = ('goal_count',)
 
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     list_display = ('home_team', 'away_team', 'start_time', 'field', 'home_score', 'away_score', 'is_finished')
+    list_select_related = ('home_team', 'away_team', 'field')
     list_filter = ('field', 'is_finished')
     search_fields = ('home_team__name', 'away_team__name')
     ordering = ('start_time',)
@@ -30,16 +34,38 @@ class MatchAdmin(admin.ModelAdmin):
 @admin.register(GoalEvent)
 class GoalAdmin(admin.ModelAdmin):
     list_display = ('match', 'player', 'team')
+    list_select_related = ('match__home_team', 'match__away_team', 'player__team', 'team')
     search_fields = ('player__name', 'team__name')
 
 @admin.register(Field)
 class FieldAdmin(admin.ModelAdmin):
     list_display = ('name', 'tournament')
+    list_select_related = ('tournament__owner',)
     search_fields = ('name', 'tournament__name')
 
 @admin.register(MatchEvent)
 class MatchEventAdmin(admin.ModelAdmin):
     list_display = ('match', 'event_type', 'player', 'team', 'minute')
+    list_select_related = ('match__home_team', 'match__away_team', 'player__team', 'team')
     list_filter = ('event_type', 'team')
     search_fields = ('player__name', 'team__name')
-    ordering = ('match', 'minute')
\ No newline at end of file
+    ordering = ('match', 'minute')
+
+@admin.register(RatingChange)
+class RatingChangeAdmin(admin.ModelAdmin):
+    list_display = ('team', 'match', 'rating_before', 'rating_after')
+    list_select_related = ('team', 'match__home_team', 'match__away_team')
+    search_fields = ('team__name',)
+
+@admin.register(SuspensionLog)
+class SuspensionLogAdmin(admin.ModelAdmin):
+    list_display = ('player', 'match', 'action', 'reason', 'games', 'created_at')
+    list_select_related = ('player__team', 'match__home_team', 'match__away_team')
+    list_filter = ('action', 'reason')
+    search_fields = ('player__name',)
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'queue', 'status', 'attempts', 'run_at', 'locked_by')
+    list_filter = ('queue', 'status')
+    search_fields = ('name', 'dedupe_key')
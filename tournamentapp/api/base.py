@@ -0,0 +1,49 @@
+"""
+Async base view for the public read API.
+
+The public endpoints are anonymous, read-only and mostly answered from
+the cache, so under ASGI they run on the event loop: a slow client only
+holds a coroutine while its response is written, not a worker thread.
+Cache reads use Django's async cache API and lookups the async ORM; the
+synchronous payload builders run in Django's ORM thread on a cache miss.
+
+DRF's `APIView` is synchronous, so these are plain Django views that
+keep the DRF views' JSON conventions (`{'detail': ...}` errors, the
+same renderer). Organiser and staff views stay on the sync path.
+
+Their reads go to a read replica when one is configured (`routers.py`).
+"""
+from django.http import Http404
+from django.views import View
+
+from tournamentapp.routers import replica_reads
+from tournamentapp.slugs import aresolve_tournament
+
+from .responses import json_response
+
+
+class PublicAPIView(View):
+    http_method_names = ['get', 'head', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            with replica_reads(request):
+                return await super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return self.error('Not found.', 404)
+
+    @staticmethod
+    async def get_tournament(slug):
+        """The tournament with `slug`, usually without a query (see `slugs.py`)."""
+        tournament = await aresolve_tournament(slug)
+        if tournament is None:
+            raise Http404
+        return tournament
+
+    @staticmethod
+    def respond(payload, status=200):
+        return json_response(payload, status)
+
+    @staticmethod
+    def error(detail, status):
+        return json_response({'detail': detail}, status)
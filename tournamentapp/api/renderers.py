@@ -0,0 +1,32 @@
+"""
+JSON renderer backed by orjson when it is installed.
+
+orjson encodes the plain dicts and lists the public views build several
+times faster than the standard library. Output matches DRF's
+`JSONRenderer` (UTC datetimes end in "Z", anything orjson doesn't know is
+handed to DRF's encoder). Without orjson, or when the client asks for
+indented output, the stock renderer is used.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=_encoder.default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
@@ -0,0 +1,142 @@
+"""
+Public API responses cached pre-rendered and pre-compressed.
+
+The JSON body of a cached payload is rendered once per content version
+and stored with its gzip and (when the `brotli` package is installed)
+brotli encodings. Requests only pick the best stored body for their
+`Accept-Encoding`, so no compression happens on the request path, and
+the proxy passes already-encoded responses through untouched.
+"""
+import gzip
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from tournamentapp.cache import PAYLOAD_TIMEOUT, apayload_key, payload_key, stale_key
+from tournamentapp.singleflight import single_flight
+
+from .renderers import FastJSONRenderer
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+# Smaller bodies fit in a packet either way.
+MIN_COMPRESS_SIZE = 512
+
+# Most preferred first.
+PREFERENCE = ('br', 'gzip', 'identity')
+
+
+def encode_body(payload):
+    """Identity body of `payload` plus every encoding that's smaller."""
+    body = FastJSONRenderer().render(payload)
+    entry = {
+        'etag': '"%s"' % hashlib.sha1(body).hexdigest()[:20],
+        'identity': body,
+    }
+    if len(body) >= MIN_COMPRESS_SIZE:
+        entry['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            entry['br'] = brotli.compress(body, quality=11)
+    return entry
+
+
+def parse_accept_encoding(header):
+    """`{coding: q}` from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header, available):
+    accepted = parse_accept_encoding(header or '')
+    wildcard = accepted.get('*')
+    for coding in PREFERENCE:
+        if coding not in available:
+            continue
+        q = accepted.get(coding, wildcard)
+        if coding == 'identity' and q is None:
+            return coding  # acceptable unless explicitly refused
+        if q:
+            return coding
+    return 'identity'
+
+
+def cached_entry(name, tournament_id, scopes, builder, timeout=PAYLOAD_TIMEOUT):
+    """
+    The encoded bodies of the payload `name` of a tournament. `builder()`
+    is only called when nothing is cached for the current versions of
+    `scopes`, by one request at a time (see `singleflight.py`). Its result
+    is stored under those versions, so a cached payload it reads must be
+    fetched with `stale=False`.
+    """
+    key = payload_key(name, tournament_id, scopes) + ':encoded'
+    entry = cache.get(key)
+    if entry is None:
+        entry = _fill(key, name, tournament_id, builder, timeout)
+    return entry
+
+
+def cached_response(request, name, tournament_id, scopes, builder, timeout=PAYLOAD_TIMEOUT):
+    """
+    An HttpResponse for the payload `name` of a tournament (see
+    `cached_entry`), encoded as the client prefers.
+    """
+    return _respond(request, cached_entry(name, tournament_id, scopes, builder, timeout))
+
+
+async def acached_response(request, name, tournament_id, scopes, builder, timeout=PAYLOAD_TIMEOUT):
+    """
+    `cached_response` for async views. A cache hit never leaves the event
+    loop; a miss runs the (synchronous) `builder()` in the ORM thread.
+    """
+    key = await apayload_key(name, tournament_id, scopes) + ':encoded'
+    entry = await cache.aget(key)
+    if entry is None:
+        entry = await sync_to_async(_fill)(key, name, tournament_id, builder, timeout)
+    return _respond(request, entry)
+
+
+def _fill(key, name, tournament_id, builder, timeout):
+    # one request per payload version encodes; the rest get the last body
+    return single_flight(
+        key, lambda: encode_body(builder()), timeout,
+        stale_key(f'{name}:encoded', tournament_id),
+    )
+
+
+def _respond(request, entry):
+    if entry['etag'] in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        coding = choose_encoding(request.headers.get('Accept-Encoding'), entry)
+        response = HttpResponse(entry[coding], content_type='application/json')
+        if coding != 'identity':
+            response['Content-Encoding'] = coding
+    response['ETag'] = entry['etag']
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def json_response(payload, status=200):
+    """An uncached JSON HttpResponse rendered like the DRF views'."""
+    return HttpResponse(
+        FastJSONRenderer().render(payload), status=status, content_type='application/json',
+    )
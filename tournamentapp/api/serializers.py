@@ -26,26 +26,39 @@ class ScheduleSerializer(serializers.Serializer):
     timeline = TimelineRowSerializer(many=True)
 
 class TopScorerSerializer(serializers.Serializer):
+    position = serializers.IntegerField()
     player_name = serializers.CharField()
     team_name = serializers.CharField()
     goals = serializers.IntegerField()
 
 
 class TeamStandingSerializer(serializers.Serializer):
+    team_id = serializers.IntegerField()
     team_name = serializers.CharField()
     points = serializers.IntegerField()
+    rating = serializers.IntegerField()
     wins = serializers.IntegerField()
     draws = serializers.IntegerField()
     losses = serializers.IntegerField()
     goals_for = serializers.IntegerField()
     goals_against = serializers.IntegerField()
     goal_difference = serializers.IntegerField()
+    form = serializers.CharField(allow_blank=True)
+    win_streak = serializers.IntegerField()
+    unbeaten_streak = serializers.IntegerField()
 
 
 class LeaderboardSerializer(serializers.Serializer):
     standings = TeamStandingSerializer(many=True)
     top_scorers = TopScorerSerializer(many=True)
 
+
+class ScorersPageSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    page = serializers.IntegerField()
+    num_pages = serializers.IntegerField()
+    results = TopScorerSerializer(many=True)
+
 class TournamentMetaSerializer(serializers.ModelSerializer):
     is_finished = serializers.BooleanField()
     sponsors = serializers.SerializerMethodField()
@@ -1,8 +1,15 @@
 from django.urls import path
-from .views import ScheduleAPIView, LeaderboardAPIView, TournamentMetaAPIView
+from .views import ScheduleAPIView, LeaderboardAPIView, ScorersAPIView, CrossTableAPIView, ProjectionAPIView, MatchClockAPIView, FieldScoreboardAPIView, ChangesAPIView, TournamentMetaAPIView, PerformanceMetricsAPIView
 
 urlpatterns = [
     path('tournaments/<slug:slug>/', TournamentMetaAPIView.as_view(), name='api-tournament-meta'),
     path('tournaments/<slug:slug>/schedule/', ScheduleAPIView.as_view(), name='api-schedule'),
     path('tournaments/<slug:slug>/leaderboard/', LeaderboardAPIView.as_view(), name='api-leaderboard'),
+    path('tournaments/<slug:slug>/scorers/', ScorersAPIView.as_view(), name='api-scorers'),
+    path('tournaments/<slug:slug>/crosstable/', CrossTableAPIView.as_view(), name='api-crosstable'),
+    path('tournaments/<slug:slug>/projection/', ProjectionAPIView.as_view(), name='api-projection'),
+    path('tournaments/<slug:slug>/matches/<int:match_id>/clock/', MatchClockAPIView.as_view(), name='api-match-clock'),
+    path('tournaments/<slug:slug>/fields/<int:field_id>/scoreboard/', FieldScoreboardAPIView.as_view(), name='api-field-scoreboard'),
+    path('tournaments/<slug:slug>/changes/', ChangesAPIView.as_view(), name='api-changes'),
+    path('metrics/performance/', PerformanceMetricsAPIView.as_view(), name='api-performance-metrics'),
 ]
\ No newline at end of file
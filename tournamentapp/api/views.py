@@ -1,119 +1,98 @@
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.permissions import AllowAny
-from django.shortcuts import get_object_or_404
-from django.db.models import Q, Prefetch
-from tournamentapp.models import Tournament, Match, Team, Player
-from .serializers import ScheduleSerializer, LeaderboardSerializer, TournamentMetaSerializer
-from tournamentapp.utils import build_timeline, get_team_standings, get_top_scorers
-
-
-class ScheduleAPIView(APIView):
-    permission_classes = [AllowAny]
-
-    def get(self, request, slug):
-        tournament = get_object_or_404(Tournament, slug__iexact=slug)
-
-        timeline, field_names = build_timeline(tournament)
-
-        rows = []
-        for row in timeline:
-            rows.append({
-                "time": row["time"],
-                "matches": [
-                    {
-                        "id": m.pk,
-                        "home_team": m.home_team.name,
-                        "away_team": m.away_team.name,
-                        "field": m.field.name,
-                        "start_time": m.start_time.isoformat(),
-                        "home_score": m.home_score,
-                        "away_score": m.away_score,
-                        "is_finished": m.is_finished,
-                    } if m else None
-                    for m in row["matches"]
-                ]
-            })
+from rest_framework.permissions import IsAdminUser
+from django.db.models import Q, aprefetch_related_objects
+from django.http import Http404
+from django.utils import timezone
+from tournamentapp.models import Tournament, Match, Team, Player, ChangeLogEntry
+from announcements.models import Announcement
+from announcements.api.serializers import AnnouncementSerializer
+from vendors.models import Vendor
+from vendors.api.serializers import VendorSerializer
+from .serializers import TournamentMetaSerializer
+from .base import PublicAPIView
+from .responses import acached_response
+from tournamentapp.utils import build_crosstable, get_team_records, get_team_standings, get_top_scorers, get_scorers_page
+from tournamentapp.cache import RESULTS, SCHEDULE, cached_payload
+from tournamentapp.instrumentation import pool_stats, registry
+from tournamentapp.projection import request_projection
+from tournamentapp.clock import aget_clock_document, clock_minute
+from tournamentapp.scoreboard import aget_scoreboard_document
+from tournamentapp.changes import latest_cursor
+from tournamentapp.snapshots import snapshot_redirect
+from tournamentapp.timeline import get_timeline, timeline_matches
 
-        current_matches = Match.objects.filter(
-            tournament=tournament,
-            is_finished=False
-        ).select_related('field', 'home_team', 'away_team')
 
-        return Response({
-            "field_names": field_names,
-            "timeline": rows,
-            "current_matches": [
-                {
-                    "id": m.pk,
-                    "home_team": m.home_team.name,
-                    "away_team": m.away_team.name,
-                    "field": m.field.name,
-                    "home_score": m.home_score,
-                    "away_score": m.away_score,
-                }
-                for m in current_matches
-            ]
-        })
+class ScheduleAPIView(PublicAPIView):
+    """
+    Matches grouped by kick-off slot and field: the tournament's timeline
+    grid (see `timeline.py`), shared with the organiser's tournament page.
+    The encoded response is cached until the schedule or results change.
+    """
+
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
+        published = snapshot_redirect(tournament, 'schedule')
+        if published:
+            return published
+        return await acached_response(
+            request, 'schedule', tournament.pk, [SCHEDULE, RESULTS],
+            lambda: self.build(tournament),
+        )
 
+    @staticmethod
+    def build(tournament):
+        # encoded and cached under the current versions, so never stale
+        return get_timeline(tournament, stale=False)
 
-class LeaderboardAPIView(APIView):
-    permission_classes = [AllowAny]
 
-    def get(self, request, slug):
-        tournament = get_object_or_404(Tournament.objects.prefetch_related(
-            Prefetch('matches', queryset=Match.objects.filter(is_finished=True)
-                     .select_related('home_team', 'away_team'))
-        ), slug=slug)
+class LeaderboardAPIView(PublicAPIView):
+    """
+    Standings with form guide and streaks, plus the top scorers. The
+    whole payload is cached until the tournament's results change.
+    """
+
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
 
         if not tournament.show_leaderboard:
-            return Response(
-                {'detail': 'Leaderboard is not public for this tournament.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            return self.error('Leaderboard is not public for this tournament.', 404)
 
-        finished_matches = tournament.matches.all()
+        published = snapshot_redirect(tournament, 'leaderboard')
+        if published:
+            return published
+        return await acached_response(
+            request, 'leaderboard', tournament.pk, [RESULTS],
+            lambda: cached_payload(
+                'leaderboard', tournament.pk, [RESULTS],
+                lambda: self.build(tournament), stale=False,
+            ),
+        )
 
+    @staticmethod
+    def build(tournament):
         teams = get_team_standings(tournament)
+        records = get_team_records(tournament)
         top_scorers = get_top_scorers(tournament)
 
         standings = []
         for team in teams:
-            team_matches = [
-                m for m in finished_matches
-                if m.home_team_id == team.id or m.away_team_id == team.id
-            ]
-
-            wins = draws = losses = goals_for = goals_against = 0
-            for m in team_matches:
-                is_home = m.home_team_id == team.id
-                gf = m.home_score if is_home else m.away_score
-                ga = m.away_score if is_home else m.home_score
-                goals_for += gf
-                goals_against += ga
-                if gf > ga:
-                    wins += 1
-                elif gf == ga:
-                    draws += 1
-                else:
-                    losses += 1
-
+            record = records.get(team.id) or records.default_factory()
             standings.append({
+                'team_id': team.id,
                 'team_name': team.name,
                 'points': team.tournament_points,
-                'wins': wins,
-                'draws': draws,
-                'losses': losses,
-                'goals_for': goals_for,
-                'goals_against': goals_against,
-                'goal_difference': goals_for - goals_against,
+                'rating': round(team.rating),
+                'goal_difference': record['goals_for'] - record['goals_against'],
+                **record,
             })
 
-        data = {
+        return {
             'standings': standings,
             'top_scorers': [
                 {
+                    'position': p.position,
                     'player_name': p.name,
                     'team_name': p.team.name,
                     'goals': p.goal_count,
@@ -122,17 +101,261 @@ class LeaderboardAPIView(APIView):
             ]
         }
 
-        serializer = LeaderboardSerializer(data)
-        return Response(serializer.data)
 
+class ScorersAPIView(PublicAPIView):
+    """
+    Full, paginated scorers list (`?page=N`), ranked with shared
+    positions for tied players.
+    """
+    page_size = 25
 
-class TournamentMetaAPIView(APIView):
-    permission_classes = [AllowAny]
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
 
-    def get(self, request, slug):
-        tournament = get_object_or_404(
-            Tournament.objects.prefetch_related("sponsors"),
-            slug=slug
+        if not tournament.show_leaderboard:
+            return self.error('Leaderboard is not public for this tournament.', 404)
+
+        page = await sync_to_async(get_scorers_page)(
+            tournament, request.GET.get('page'), self.page_size
         )
-        serializer = TournamentMetaSerializer(tournament)
-        return Response(serializer.data)
\ No newline at end of file
+
+        return self.respond({
+            'count': page.paginator.count,
+            'page': page.number,
+            'num_pages': page.paginator.num_pages,
+            'results': [
+                {
+                    'position': p.position,
+                    'player_name': p.name,
+                    'team_name': p.team.name,
+                    'goals': p.goal_count,
+                }
+                for p in page.object_list
+            ],
+        })
+
+
+class CrossTableAPIView(PublicAPIView):
+    """
+    "Who beat whom" grid of finished matches, cached until the
+    tournament's results change.
+    """
+
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
+
+        if not tournament.show_leaderboard:
+            return self.error('Leaderboard is not public for this tournament.', 404)
+
+        published = snapshot_redirect(tournament, 'crosstable')
+        if published:
+            return published
+        return await acached_response(
+            request, 'crosstable', tournament.pk, [RESULTS],
+            lambda: build_crosstable(tournament),
+        )
+
+
+class ProjectionAPIView(PublicAPIView):
+    """
+    Monte Carlo finishing-position probabilities. Simulations run on a
+    background worker; until the one for the latest results is ready the
+    previous projection is served with `is_current: false`, or a 202 if
+    there is none yet.
+    """
+
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
+
+        if not tournament.show_leaderboard:
+            return self.error('Leaderboard is not public for this tournament.', 404)
+
+        payload, is_current = await sync_to_async(request_projection)(tournament)
+        if payload is None:
+            return self.error('Projection is being computed.', 202)
+        return self.respond({**payload, 'is_current': is_current})
+
+
+class MatchClockAPIView(PublicAPIView):
+    """
+    Live clock of a match, served from the cache so scoreboards can poll
+    it cheaply. `running_since` and `server_time` let clients keep
+    ticking between polls.
+    """
+
+    async def get(self, request, slug, match_id):
+        tournament = await self.get_tournament(slug)
+        document = await aget_clock_document(match_id)
+        if document is None or document['tournament_id'] != tournament.pk:
+            raise Http404
+
+        now = timezone.now()
+        return self.respond({
+            **document,
+            'minute': clock_minute(document, now),
+            'server_time': now.timestamp(),
+        })
+
+
+class FieldScoreboardAPIView(PublicAPIView):
+    """
+    Current and next match on a field with the live score and clock, for
+    venue displays. Both documents come from the cache, so polling
+    displays don't touch the database.
+    """
+
+    async def get(self, request, slug, field_id):
+        tournament = await self.get_tournament(slug)
+        document = await aget_scoreboard_document(field_id)
+        if document is None or document['tournament_id'] != tournament.pk:
+            raise Http404
+
+        now = timezone.now()
+        clock = None
+        if document['current_match']:
+            clock = await aget_clock_document(document['current_match']['id'])
+        if clock is not None:
+            clock = {**clock, 'minute': clock_minute(clock, now)}
+
+        return self.respond({
+            **document,
+            'clock': clock,
+            'server_time': now.timestamp(),
+        })
+
+
+class ChangesAPIView(PublicAPIView):
+    """
+    Everything that changed since `?since=<cursor>`, for clients that
+    keep the schedule, leaderboard, announcements and vendors in memory.
+    Without `since` only the current cursor is returned; clients take it
+    before their first full load.
+
+    Changed matches come in schedule form with their `time` row and
+    `field` column, changed teams as standings rows together with the
+    new standings order. `schedule_changed` means the schedule has to be
+    reloaded (fields, bulk reschedules, renamed teams) and `reset` that
+    the cursor is too old for a delta and everything has to be reloaded.
+    """
+    max_changes = 500
+
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
+
+        if 'since' not in request.GET:
+            # a client without a cursor has nothing to apply a delta to
+            cursor = await sync_to_async(latest_cursor)(tournament)
+            return self.respond({'cursor': cursor, 'reset': True})
+        try:
+            since = int(request.GET['since'])
+        except ValueError:
+            return self.error('since must be a cursor returned by this endpoint.', 400)
+
+        return self.respond(await sync_to_async(self.build)(tournament, since))
+
+    def build(self, tournament, since):
+        entries = list(
+            tournament.changes
+            .filter(id__gt=since)
+            .order_by('id')
+            .values_list('id', 'entity', 'entity_id', 'deleted')[:self.max_changes + 1]
+        )
+        if since < tournament.changes_floor or len(entries) > self.max_changes:
+            return {'cursor': latest_cursor(tournament), 'reset': True}
+
+        changed = {entity: set() for entity, _ in ChangeLogEntry.ENTITIES}
+        deleted = {entity: set() for entity, _ in ChangeLogEntry.ENTITIES}
+        for _, entity, entity_id, is_deleted in entries:
+            (deleted if is_deleted else changed)[entity].add(entity_id)
+
+        data = {
+            'cursor': entries[-1][0] if entries else max(since, tournament.changes_floor),
+            'reset': False,
+            'schedule_changed': bool(changed[ChangeLogEntry.SCHEDULE]),
+            'matches': [],
+            'deleted_matches': sorted(deleted[ChangeLogEntry.MATCH]),
+        }
+        if changed[ChangeLogEntry.MATCH]:
+            matches = timeline_matches(
+                Match.objects.filter(tournament=tournament, pk__in=changed[ChangeLogEntry.MATCH]),
+                tournament.tzinfo,
+            )
+            data['matches'] = matches
+            data['deleted_matches'] = sorted(
+                deleted[ChangeLogEntry.MATCH]
+                | (changed[ChangeLogEntry.MATCH] - {m['id'] for m in matches})
+            )
+
+        results_changed = (
+            changed[ChangeLogEntry.MATCH] or deleted[ChangeLogEntry.MATCH]
+            or changed[ChangeLogEntry.TEAM] or deleted[ChangeLogEntry.TEAM]
+        )
+        if tournament.show_leaderboard and results_changed:
+            # the standings have to match the cursor handed out with them
+            leaderboard = cached_payload(
+                'leaderboard', tournament.pk, [RESULTS],
+                lambda: LeaderboardAPIView.build(tournament), stale=False,
+            )
+            data['standings'] = {
+                'order': [team['team_id'] for team in leaderboard['standings']],
+                'teams': [
+                    team for team in leaderboard['standings']
+                    if team['team_id'] in changed[ChangeLogEntry.TEAM]
+                ],
+                'top_scorers': leaderboard['top_scorers'],
+            }
+
+        if tournament.show_announcements:
+            data['announcements'], data['deleted_announcements'] = self.build_delta(
+                Announcement.objects.filter(tournament=tournament),
+                AnnouncementSerializer,
+                changed[ChangeLogEntry.ANNOUNCEMENT],
+                deleted[ChangeLogEntry.ANNOUNCEMENT],
+            )
+        if tournament.show_vendors:
+            data['vendors'], data['deleted_vendors'] = self.build_delta(
+                Vendor.objects.filter(tournament=tournament),
+                VendorSerializer,
+                changed[ChangeLogEntry.VENDOR],
+                deleted[ChangeLogEntry.VENDOR],
+            )
+        return data
+
+    @staticmethod
+    def build_delta(queryset, serializer_class, changed_ids, deleted_ids):
+        """Serialized active objects among `changed_ids`, and the ids to drop."""
+        if not changed_ids:
+            return [], sorted(deleted_ids)
+        active = list(queryset.filter(pk__in=changed_ids, is_active=True))
+        serialized = [
+            {**serializer_class(obj).data, 'id': obj.pk} for obj in active
+        ]
+        gone = deleted_ids | (changed_ids - {obj.pk for obj in active})
+        return serialized, sorted(gone)
+
+
+class TournamentMetaAPIView(PublicAPIView):
+
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
+        published = snapshot_redirect(tournament, 'meta')
+        if published:
+            return published
+        await aprefetch_related_objects([tournament], 'sponsors')
+        return self.respond(TournamentMetaSerializer(tournament).data)
+
+
+class PerformanceMetricsAPIView(APIView):
+    """
+    Staff-only view of the rolling per-URL-name request histograms kept
+    by `RequestTimingMiddleware` in this process, and of its database
+    connection pools.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'window_seconds': registry.window_seconds * registry.window_count,
+            'views': registry.snapshot(),
+            'database_pools': pool_stats(),
+        })
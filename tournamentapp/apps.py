@@ -4,3 +4,6 @@ class TournamentappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tournamentapp'
     verbose_name = "Tournament Manager"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,140 @@
+"""
+Versioned caching for public tournament payloads.
+
+Every tournament has one version counter per scope: `results` changes
+with scores, events and points, `schedule` changes with kick-off
+times, fields and pairings, and `tournament` with the tournament row
+itself (see `slugs.py`). A cached payload's key includes the versions
+of the scopes it was built from. Bumping a counter therefore invalidates
+every payload that depends on it without having to know their keys.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .singleflight import single_flight
+
+RESULTS = 'results'
+SCHEDULE = 'schedule'
+TOURNAMENT = 'tournament'
+
+PAYLOAD_TIMEOUT = 60 * 60
+
+
+def _version_key(tournament_id, scope):
+    return f"tournament:{tournament_id}:{scope}:version"
+
+
+def _seed():
+    # A counter evicted from the cache must never restart at a value that
+    # stale payloads may still be stored under, so seed from the clock.
+    return time.time_ns() // 1000
+
+
+def get_versions(tournament_id, scopes):
+    keys = [_version_key(tournament_id, scope) for scope in scopes]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _seed(), timeout=None)
+            version = cache.get(key)
+        versions.append(version)
+    return versions
+
+
+async def aget_versions(tournament_id, scopes):
+    keys = [_version_key(tournament_id, scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    if len(found) < len(keys):
+        return await sync_to_async(get_versions)(tournament_id, scopes)
+    return [found[key] for key in keys]
+
+
+def get_version(tournament_id, scope):
+    return get_versions(tournament_id, [scope])[0]
+
+
+def is_process_local():
+    """
+    Whether the cache is private to this process. Version bumps made in
+    one process then never reach the others, see `CACHES` in settings.
+    """
+    return isinstance(caches['default'], LocMemCache)
+
+
+def _incr(tournament_id, scopes):
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(tournament_id, scope))
+        except ValueError:
+            cache.add(_version_key(tournament_id, scope), _seed(), timeout=None)
+
+
+def bump_version(tournament_id, *scopes):
+    """
+    Invalidate the given scopes of a tournament.
+
+    Inside a transaction the counters are bumped both now and again on
+    commit: a reader that rebuilds a payload from pre-commit data in
+    between would otherwise cache it under the new version for good.
+    """
+    _incr(tournament_id, scopes)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incr(tournament_id, scopes))
+
+
+def payload_key(name, tournament_id, scopes):
+    """Cache key of the payload `name` at the current versions of `scopes`."""
+    versions = get_versions(tournament_id, scopes)
+    return f"tournament:{tournament_id}:{name}:" + ":".join(map(str, versions))
+
+
+async def apayload_key(name, tournament_id, scopes):
+    versions = await aget_versions(tournament_id, scopes)
+    return f"tournament:{tournament_id}:{name}:" + ":".join(map(str, versions))
+
+
+def stale_key(name, tournament_id):
+    """Key of the last payload `name` built for a tournament, at any versions."""
+    return f"tournament:{tournament_id}:{name}:stale"
+
+
+def cached_payload(name, tournament_id, scopes, builder, timeout=PAYLOAD_TIMEOUT, stale=True):
+    """
+    Return the payload `name` for a tournament, calling `builder()` only
+    when nothing is cached for the current versions of `scopes`. While
+    another request rebuilds it, the previous version is returned unless
+    `stale` is false, in which case the caller waits for the new one.
+    """
+    key = payload_key(name, tournament_id, scopes)
+
+    payload = cache.get(key)
+    if payload is None:
+        payload = single_flight(
+            key, builder, timeout, stale_key(name, tournament_id) if stale else None,
+        )
+    return payload
+
+
+def scoreboard_key(field_id):
+    return f"field:{field_id}:scoreboard"
+
+
+def invalidate_scoreboards(field_ids):
+    """
+    Drop the scoreboard documents of the given fields (see
+    `scoreboard.py`). Like `bump_version`, this is repeated on commit so
+    a display polling mid-transaction can't cache a document built from
+    the old data.
+    """
+    keys = [scoreboard_key(field_id) for field_id in field_ids if field_id]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,150 @@
+"""
+Per-tournament change log behind the delta sync endpoint.
+
+Every change to a match, team, announcement or vendor replaces that
+entity's single `ChangeLogEntry`, so the log is compacted as it is
+written and the entry ids only grow: a client that remembers the highest
+id it has seen asks for everything after it. Deletions are kept as
+tombstones until `compact_change_log` drops the old ones and raises the
+tournament's `changes_floor`; clients behind the floor reload in full.
+
+Entries are written after the transaction that made the change commits
+(two queries for all the changes of a transaction, or of each of its
+savepoints that made any), so an id is never handed
+out to a client before the data it stands for is visible.
+"""
+import itertools
+import threading
+import weakref
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .cache import TOURNAMENT, bump_version
+from .models import ChangeLogEntry, Tournament
+
+TOMBSTONE_RETENTION = timedelta(days=1)
+
+_local = threading.local()
+# orders the changes recorded in different savepoints of a transaction
+_sequence = itertools.count()
+
+
+def _pending():
+    """This thread's batches awaiting commit, by (alias, savepoint ids)."""
+    batches = getattr(_local, 'batches', None)
+    if batches is None:
+        batches = _local.batches = weakref.WeakValueDictionary()
+    return batches
+
+
+def record_change(tournament_id, entity, entity_id, deleted=False):
+    """Log a change to one entity (`ChangeLogEntry.MATCH`, ...)."""
+    key = (tournament_id, entity, entity_id)
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _write({key: deleted})
+        return
+
+    # One batch per transaction and savepoint, registered once. Its
+    # on_commit callback is the only strong reference to it, so a
+    # rollback that discards the callback discards the batch too, and
+    # the next change starts a new one.
+    scope = (connection.alias, tuple(connection.savepoint_ids))
+    batches = _pending()
+    batch = batches.get(scope)
+    if batch is None:
+        batch = batches[scope] = _Batch(connection.alias)
+        transaction.on_commit(batch.flush)
+    batch.changes[key] = (next(_sequence), deleted)
+
+
+class _Batch:
+    def __init__(self, alias):
+        self.alias = alias
+        self.changes = {}
+
+    def flush(self):
+        batches = _pending()
+        for scope, batch in list(batches.items()):
+            if batch is self:
+                del batches[scope]
+        # An entity changed again in a later savepoint is written by that
+        # savepoint's batch, whose callback runs after this one.
+        later = {}
+        for batch in batches.values():
+            if batch.alias == self.alias:
+                for key, (sequence, _) in batch.changes.items():
+                    later[key] = max(sequence, later.get(key, -1))
+        changes = {
+            key: deleted for key, (sequence, deleted) in self.changes.items()
+            if later.get(key, -1) < sequence
+        }
+        self.changes = {}
+        if changes:
+            _write(changes)
+
+
+def _write(changes):
+    tournament_ids = sorted({tournament_id for tournament_id, _, _ in changes})
+    ids_by_group = defaultdict(list)
+    for tournament_id, entity, entity_id in changes:
+        ids_by_group[tournament_id, entity].append(entity_id)
+
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                # Clients page by entry id, so ids must be handed out in
+                # commit order: writers of a tournament queue on its row.
+                live = set(
+                    Tournament.objects
+                    .select_for_update()
+                    .filter(pk__in=tournament_ids)
+                    .order_by('pk')
+                    .values_list('pk', flat=True)
+                )
+                for (tournament_id, entity), entity_ids in ids_by_group.items():
+                    if tournament_id in live:
+                        ChangeLogEntry.objects.filter(
+                            tournament_id=tournament_id, entity=entity, entity_id__in=entity_ids,
+                        ).delete()
+                ChangeLogEntry.objects.bulk_create(
+                    ChangeLogEntry(
+                        tournament_id=tournament_id, entity=entity,
+                        entity_id=entity_id, deleted=deleted,
+                    )
+                    for (tournament_id, entity, entity_id), deleted in changes.items()
+                    if tournament_id in live
+                )
+            return
+        except IntegrityError:
+            # a concurrent writer inserted one of these entities first
+            if attempt:
+                raise
+
+
+def latest_cursor(tournament):
+    latest = tournament.changes.aggregate(latest=Max('id'))['latest']
+    return max(latest or 0, tournament.changes_floor)
+
+
+def compact_change_log(older_than=TOMBSTONE_RETENTION):
+    """
+    Drop tombstones older than `older_than` and raise each affected
+    tournament's floor past them. Returns the number of entries removed.
+    """
+    cutoff = timezone.now() - older_than
+    stale = ChangeLogEntry.objects.filter(deleted=True, changed_at__lt=cutoff)
+    floors = stale.values('tournament_id').annotate(floor=Max('id')).order_by()
+
+    with transaction.atomic():
+        for row in floors:
+            Tournament.objects.filter(
+                pk=row['tournament_id'], changes_floor__lt=row['floor'],
+            ).update(changes_floor=row['floor'])
+            bump_version(row['tournament_id'], TOURNAMENT)
+        removed, _ = stale.delete()
+    return removed
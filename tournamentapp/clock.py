@@ -0,0 +1,135 @@
+"""
+Live match clock.
+
+Every state change is written to the database and then published as a
+small JSON document in the cache, which is all that scoreboard screens
+and event recording read. The minute is derived from the document at read
+time, so a running clock never needs to be written to.
+
+In-process subscribers connect to `clock_changed`, which is sent after
+commit with `match_id` and `document`.
+"""
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Match, MatchClock
+from .routers import cache_timeout
+
+CLOCK_TIMEOUT = 6 * 60 * 60
+
+clock_changed = Signal()
+
+
+def _clock_key(match_id):
+    return f"match:{match_id}:clock"
+
+
+def build_document(match, clock=None):
+    tournament = match.tournament
+    period_minutes = tournament.half_duration if tournament.has_halves else tournament.game_duration
+    clock = clock or MatchClock(match=match)
+
+    document = {
+        'match_id': match.pk,
+        'tournament_id': tournament.pk,
+        'state': clock.state,
+        'period': clock.period,
+        'periods': 2 if tournament.has_halves else 1,
+        'period_minutes': period_minutes,
+        'elapsed_seconds': clock.elapsed_seconds,
+        'running_since': clock.running_since.timestamp() if clock.running_since else None,
+        'half_time_ends_at': None,
+    }
+    if clock.state == MatchClock.HALF_TIME and clock.changed_at:
+        document['half_time_ends_at'] = (
+            clock.changed_at.timestamp() + tournament.half_time_break * 60
+        )
+    return document
+
+
+def clock_minute(document, now=None):
+    """
+    Minute of play shown for a clock document: 0 before kick-off, 1 in
+    the first minute, counting on from the end of the first half in the
+    second. Added time is not capped.
+    """
+    if document['state'] == MatchClock.PENDING:
+        return 0
+    seconds = document['elapsed_seconds']
+    if document['running_since'] is not None:
+        now = timezone.now() if now is None else now
+        seconds += max(now.timestamp() - document['running_since'], 0)
+    offset = (document['period'] - 1) * document['period_minutes']
+    return offset + int(seconds // 60) + 1
+
+
+def get_clock_document(match_id):
+    """The clock document of a match, from the cache when possible."""
+    key = _clock_key(match_id)
+    document = cache.get(key)
+    if document is None:
+        match = (
+            Match.objects
+            .select_related('tournament', 'clock')
+            .filter(pk=match_id)
+            .first()
+        )
+        if match is None:
+            return None
+        document = build_document(match, getattr(match, 'clock', None))
+        cache.set(key, document, cache_timeout(CLOCK_TIMEOUT))
+    return document
+
+
+async def aget_clock_document(match_id):
+    document = await cache.aget(_clock_key(match_id))
+    if document is None:
+        document = await sync_to_async(get_clock_document)(match_id)
+    return document
+
+
+def current_minute(match):
+    return clock_minute(get_clock_document(match.pk))
+
+
+def change_clock(match, action, now=None):
+    """
+    Apply a clock action (`kick_off`, `pause`, `resume`, `half_time`,
+    `end`) to a match and publish the new state. Raises ValueError for
+    actions that aren't valid in the current state.
+    """
+    now = timezone.now() if now is None else now
+    with transaction.atomic():
+        MatchClock.objects.get_or_create(match=match)
+        clock = (
+            MatchClock.objects
+            .select_for_update()
+            .select_related('match__tournament')
+            .get(match=match)
+        )
+        clock.apply(action, now)
+        clock.save()
+
+        document = build_document(clock.match, clock)
+        transaction.on_commit(lambda: _publish(match.pk, document))
+    return document
+
+
+def _publish(match_id, document):
+    cache.set(_clock_key(match_id), document, CLOCK_TIMEOUT)
+    clock_changed.send(sender=MatchClock, match_id=match_id, document=document)
+
+
+def forget_clock(match_id):
+    cache.delete(_clock_key(match_id))
+
+
+def stop_clock(match):
+    """End a running clock, e.g. when the match is finished directly."""
+    if MatchClock.objects.filter(match=match).exclude(
+        state__in=[MatchClock.PENDING, MatchClock.FINISHED]
+    ).exists():
+        change_clock(match, 'end')
@@ -1,26 +1,63 @@
 import re
+import zoneinfo
 from django import forms
 from django.utils.text import slugify
 from datetime import datetime, time, date
 from .models import Team, Match, Player, GoalEvent, Field, MatchEvent, Tournament
 from .utils import recalculate_match_points
+from .warming import schedule_cache_warm
+
+BAN_LENGTH_FIELDS = ('yellow_suspension_games', 'red_suspension_games')
+TIMEZONE_CHOICES = [(name, name.replace('_', ' ')) for name in sorted(zoneinfo.available_timezones())]
+
+
+def _optional_ban_lengths(form):
+    for name in BAN_LENGTH_FIELDS:
+        form.fields[name].required = False
+        form.fields[name].help_text = "0 keeps the player out until you lift the suspension."
+
+
+def _clean_ban_lengths(form, cleaned_data):
+    for name in BAN_LENGTH_FIELDS:
+        if cleaned_data.get(name) is None:
+            cleaned_data[name] = getattr(form.instance, name)
+
+
+def _optional_timezone(form):
+    form.fields['timezone'].required = False
+    form.fields['timezone'].help_text = "Kick-off times are entered and shown in this timezone."
+
+
+def _clean_timezone(form, cleaned_data):
+    if not cleaned_data.get('timezone'):
+        cleaned_data['timezone'] = form.instance.timezone
 
 class TournamentCreateForm(forms.ModelForm):
     class Meta:
         model = Tournament
-        fields = ['name', 'tournament_date', 'format', 'points_for_win', 'points_for_draw', 'yellow_cards_for_suspension']
+        fields = ['name', 'tournament_date', 'timezone', 'format', 'points_for_win', 'points_for_draw', 'yellow_cards_for_suspension', 'yellow_suspension_games', 'red_suspension_games']
         labels = {
             'points_for_win': 'Points for win',
             'points_for_draw': 'Points for draw',
             'yellow_cards_for_suspension': 'Yellow cards for suspension',
+            'yellow_suspension_games': 'Games banned for yellow cards',
+            'red_suspension_games': 'Games banned for a red card',
             'format': 'Tournament Format',
         }
         widgets = {
             'tournament_date': forms.DateInput(attrs={'type': 'date'}),
+            'timezone': forms.Select(choices=TIMEZONE_CHOICES),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _optional_ban_lengths(self)
+        _optional_timezone(self)
+
     def clean(self):
         cleaned_data = super().clean()
+        _clean_ban_lengths(self, cleaned_data)
+        _clean_timezone(self, cleaned_data)
         win = cleaned_data.get('points_for_win')
         draw = cleaned_data.get('points_for_draw')
         if win is not None and draw is not None and win <= draw:
@@ -35,11 +72,13 @@ class TournamentCreateForm(forms.ModelForm):
 class TournamentUpdateForm(forms.ModelForm):
     class Meta:
         model = Tournament
-        fields = ['name', 'tournament_date', 'points_for_win', 'points_for_draw', 'yellow_cards_for_suspension', 'show_leaderboard', 'show_vendors', 'show_side_events', 'show_announcements']
+        fields = ['name', 'tournament_date', 'timezone', 'points_for_win', 'points_for_draw', 'yellow_cards_for_suspension', 'yellow_suspension_games', 'red_suspension_games', 'show_leaderboard', 'show_vendors', 'show_side_events', 'show_announcements']
         labels = {
             'points_for_win': 'Points for win',
             'points_for_draw': 'Points for draw',
             'yellow_cards_for_suspension': "Yellow cards for suspension",
+            'yellow_suspension_games': 'Games banned for yellow cards',
+            'red_suspension_games': 'Games banned for a red card',
             'show_leaderboard': 'Show leaderboard on public page',
             'show_vendors': 'Show vendors on public page',
             'show_side_events': 'Show programme on public page',
@@ -47,10 +86,13 @@ class TournamentUpdateForm(forms.ModelForm):
         }
         widgets = {
             'tournament_date': forms.DateInput(attrs={'type': 'date'}),
+            'timezone': forms.Select(choices=TIMEZONE_CHOICES),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        _optional_ban_lengths(self)
+        _optional_timezone(self)
         # lock points fields if scored matches exist
         if self.instance and self.instance.pk:
             if self.instance.matches.filter(is_finished=True).exists():
@@ -69,6 +111,8 @@ class TournamentUpdateForm(forms.ModelForm):
 
     def clean(self):
         cleaned_data = super().clean()
+        _clean_ban_lengths(self, cleaned_data)
+        _clean_timezone(self, cleaned_data)
         win = cleaned_data.get('points_for_win')
         draw = cleaned_data.get('points_for_draw')  
         if win is not None and draw is not None and win <= draw:
@@ -218,6 +262,7 @@ class MatchEditForm(forms.ModelForm):
         
         if commit:
             match.save()
+            schedule_cache_warm(match.tournament_id)
 
         return match
 
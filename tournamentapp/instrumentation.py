@@ -0,0 +1,210 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import connections
+
+# Upper bounds of the histogram buckets. The last bucket is open-ended.
+DURATION_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+METRIC_BUCKETS = {
+    'total_ms': DURATION_BUCKETS_MS,
+    'db_ms': DURATION_BUCKETS_MS,
+    'view_ms': DURATION_BUCKETS_MS,
+    'render_ms': DURATION_BUCKETS_MS,
+    'queries': QUERY_COUNT_BUCKETS,
+}
+
+
+class RequestTimings:
+    """
+    Collects the timings of a single instrumented request.
+
+    `query_wrapper` is installed with `connection.execute_wrapper()` so every
+    SQL statement executed while the request is handled is counted and timed.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.view_ms = 0.0
+        self.render_ms = 0.0
+        self.total_ms = 0.0
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.queries += 1
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total_ms, 2),
+            'db_ms': round(self.db_ms, 2),
+            'view_ms': round(self.view_ms, 2),
+            'render_ms': round(self.render_ms, 2),
+            'queries': self.queries,
+        }
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'view;dur={self.view_ms:.1f}',
+            f'render;dur={self.render_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+
+class RollingHistogram:
+    """
+    Fixed-bucket histogram over a sliding time window.
+
+    The window is split into `window_count` slices of `window_seconds` each;
+    recording only touches the current slice, and slices older than the
+    window are recycled, so memory stays constant per metric.
+    """
+
+    def __init__(self, buckets, window_seconds=60, window_count=15):
+        self.buckets = buckets
+        self.window_seconds = window_seconds
+        self.window_count = window_count
+        # each slot: [slice_index, counts, total, max]
+        self._slots = [None] * window_count
+
+    def _slot(self, now):
+        index = int(now // self.window_seconds)
+        position = index % self.window_count
+        slot = self._slots[position]
+        if slot is None or slot[0] != index:
+            slot = [index, [0] * (len(self.buckets) + 1), 0.0, 0.0]
+            self._slots[position] = slot
+        return slot
+
+    def record(self, value, now=None):
+        slot = self._slot(time.monotonic() if now is None else now)
+        slot[1][bisect_left(self.buckets, value)] += 1
+        slot[2] += value
+        slot[3] = max(slot[3], value)
+
+    def snapshot(self, now=None):
+        now = time.monotonic() if now is None else now
+        oldest = int(now // self.window_seconds) - self.window_count + 1
+
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        maximum = 0.0
+        for slot in self._slots:
+            if slot is None or slot[0] < oldest:
+                continue
+            for i, c in enumerate(slot[1]):
+                counts[i] += c
+            total += slot[2]
+            maximum = max(maximum, slot[3])
+
+        count = sum(counts)
+        labels = [f"le_{b}" for b in self.buckets] + ["le_inf"]
+
+        return {
+            'count': count,
+            'mean': round(total / count, 2) if count else 0,
+            'max': round(maximum, 2),
+            'p50': self._quantile(counts, count, 0.50, maximum),
+            'p95': self._quantile(counts, count, 0.95, maximum),
+            'p99': self._quantile(counts, count, 0.99, maximum),
+            'buckets': dict(zip(labels, counts)),
+        }
+
+    def _quantile(self, counts, count, q, maximum):
+        """Upper bound of the bucket holding the q-quantile."""
+        if not count:
+            return 0
+        target = q * count
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else round(maximum, 2)
+        return round(maximum, 2)
+
+
+class PerformanceRegistry:
+    """
+    In-memory, per-process store of rolling histograms keyed by URL name.
+    """
+
+    def __init__(self, window_seconds=60, window_count=15):
+        self.window_seconds = window_seconds
+        self.window_count = window_count
+        self._lock = threading.Lock()
+        self._histograms = defaultdict(self._new_metrics)
+
+    def _new_metrics(self):
+        return {
+            metric: RollingHistogram(buckets, self.window_seconds, self.window_count)
+            for metric, buckets in METRIC_BUCKETS.items()
+        }
+
+    def record(self, url_name, timings, now=None):
+        values = timings.as_dict()
+        with self._lock:
+            metrics = self._histograms[url_name]
+            for metric, histogram in metrics.items():
+                histogram.record(values[metric], now)
+
+    def snapshot(self, now=None):
+        with self._lock:
+            return {
+                url_name: {
+                    metric: histogram.snapshot(now)
+                    for metric, histogram in metrics.items()
+                }
+                for url_name, metrics in sorted(self._histograms.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+registry = PerformanceRegistry()
+
+
+# psycopg_pool counters only appear once they are non-zero.
+POOL_STATS = {
+    'checkouts': 'requests_num',
+    'waits': 'requests_queued',
+    'wait_ms': 'requests_wait_ms',
+    'timeouts': 'requests_errors',
+    'connections_opened': 'connections_num',
+    'connections_failed': 'connections_errors',
+    'connections_lost': 'connections_lost',
+    'returned_bad': 'returns_bad',
+}
+
+
+def pool_stats():
+    """
+    Counters and current size of each database alias's connection pool
+    since this process started. Aliases without a pool are left out.
+    """
+    stats = {}
+    for alias in connections:
+        if not connections.settings[alias].get('OPTIONS', {}).get('pool'):
+            continue
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        raw = pool.get_stats()
+        stats[alias] = {
+            'min_size': raw.get('pool_min', 0),
+            'max_size': raw.get('pool_max', 0),
+            'size': raw.get('pool_size', 0),
+            'available': raw.get('pool_available', 0),
+            'waiting': raw.get('requests_waiting', 0),
+            **{name: raw.get(key, 0) for name, key in POOL_STATS.items()},
+        }
+    return stats
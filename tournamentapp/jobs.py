@@ -0,0 +1,231 @@
+"""
+In-database job queue for work that shouldn't run inside a request.
+
+Jobs are rows of the `Job` table, so enqueueing is part of the caller's
+transaction and no broker is needed. `run_workers` claims them with
+`SELECT ... FOR UPDATE SKIP LOCKED` where the database supports it
+(PostgreSQL); elsewhere (SQLite) the claim is a conditional update, which
+is just as safe, only slower under contention.
+
+A job is a function marked with `@job(queue=...)`, called with the JSON
+arguments it was enqueued with. Failures are retried with exponential
+backoff up to `max_attempts`; a `dedupe_key` keeps at most one queued
+job per key, which also makes a delayed job a debounce.
+
+`JOB_QUEUES` limits how many jobs of a queue run at once across every
+worker process: a claim counts the queue's running jobs first. A running
+job's worker renews its lock every `HEARTBEAT_SECONDS`, so only jobs
+whose worker died, and stopped renewing, are picked up again after
+`LOCK_TIMEOUT`.
+
+With `JOBS_RUN_INLINE` (tests, single-process development) jobs run in
+the process that enqueued them, right after the transaction commits.
+"""
+import logging
+import random
+import threading
+import traceback
+import zlib
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = 'default'
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 60 * 60
+LOCK_TIMEOUT = timedelta(minutes=5)
+HEARTBEAT_SECONDS = 60
+
+# SQLite takes one writer at a time and fails, rather than waits, on an
+# in-memory database's table locks; a process's workers take turns.
+_sqlite_turn = threading.Lock()
+
+
+def job(queue=DEFAULT_QUEUE, max_attempts=5):
+    """Mark a module-level function as runnable by the job queue."""
+    def decorate(func):
+        func.job_options = {'queue': queue, 'max_attempts': max_attempts}
+        return func
+    return decorate
+
+
+def _name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue(func, *args, dedupe_key=None, delay=0):
+    """
+    Queue `func(*args)`. With `dedupe_key`, nothing is queued while a job
+    with the same key is still waiting to run. `delay` is in seconds.
+    """
+    options = func.job_options
+    if getattr(settings, 'JOBS_RUN_INLINE', False):
+        transaction.on_commit(lambda: _run_inline(func, args))
+        return
+
+    try:
+        with transaction.atomic():
+            Job.objects.create(
+                queue=options['queue'],
+                name=_name(func),
+                args=list(args),
+                dedupe_key=dedupe_key,
+                max_attempts=options['max_attempts'],
+                run_at=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        if dedupe_key is None:
+            raise
+        # the queued job with this key hasn't started, so it will see our data
+
+
+def _run_inline(func, args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Job %s%r failed", _name(func), tuple(args))
+
+
+def backoff(attempts):
+    """Seconds before retry number `attempts`, with jitter."""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def queue_limit(queue):
+    """How many jobs of `queue` may run at once, or None for no limit."""
+    return getattr(settings, 'JOB_QUEUES', {}).get(queue)
+
+
+def _turn():
+    return _sqlite_turn if connection.vendor == 'sqlite' else nullcontext()
+
+
+def _lock_queue(queue):
+    # Claims of a queue take turns, so two can't both see a free slot.
+    # SQLite allows a single writer anyway.
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [zlib.crc32(f"jobs:{queue}".encode())])
+
+
+def claim(queue, worker_id):
+    """Lock the next due job of `queue` for `worker_id`, or return None."""
+    limit = queue_limit(queue)
+    while True:
+        now = timezone.now()
+        with _turn(), transaction.atomic():
+            _lock_queue(queue)
+            due = (
+                Job.objects
+                .filter(queue=queue)
+                .filter(
+                    Q(status=Job.QUEUED, run_at__lte=now)
+                    | Q(status=Job.RUNNING, locked_at__lt=now - LOCK_TIMEOUT)
+                )
+                .order_by('run_at', 'id')
+            )
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            candidate = due.first()
+            if candidate is None:
+                return None
+            claimable = Job.objects.filter(
+                pk=candidate.pk, status=candidate.status, locked_at=candidate.locked_at,
+            )
+            if limit is not None:
+                running = (
+                    Job.objects
+                    .filter(queue=queue, status=Job.RUNNING, locked_at__gte=now - LOCK_TIMEOUT)
+                    .order_by()
+                    .values('queue')
+                    .annotate(count=Count('pk'))
+                    .values('count')
+                )
+                claimable = claimable.alias(
+                    running=Coalesce(Subquery(running), 0),
+                ).filter(running__lt=limit)
+            claimed = claimable.update(
+                status=Job.RUNNING, locked_at=now, locked_by=worker_id,
+                attempts=F('attempts') + 1,
+            )
+        if claimed:
+            candidate.refresh_from_db()
+            return candidate
+        if limit is not None and Job.objects.filter(
+            pk=candidate.pk, status=candidate.status, locked_at=candidate.locked_at,
+        ).exists():
+            # still free: the queue is running as many jobs as it may
+            return None
+        # another worker claimed it first (databases without SKIP LOCKED)
+
+
+def _heartbeat(job_row, done):
+    while not done.wait(HEARTBEAT_SECONDS):
+        try:
+            with _turn():
+                Job.objects.filter(
+                    pk=job_row.pk, status=Job.RUNNING, locked_by=job_row.locked_by,
+                ).update(locked_at=timezone.now())
+        except Exception:
+            logger.exception("Could not renew the lock of job %s", job_row)
+    connection.close()
+
+
+def execute(job_row):
+    """Run a claimed job; delete it on success, reschedule or fail it otherwise."""
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(job_row, done), name=f"heartbeat-{job_row.pk}", daemon=True,
+    )
+    heartbeat.start()
+    try:
+        func = import_string(job_row.name)
+        func(*job_row.args)
+    except Exception:
+        logger.exception("Job %s failed (attempt %s)", job_row, job_row.attempts)
+        error = traceback.format_exc()
+        with _turn():
+            _failed(job_row, error)
+        return False
+    finally:
+        done.set()
+        heartbeat.join()
+    with _turn():
+        Job.objects.filter(pk=job_row.pk).delete()
+    return True
+
+
+def _failed(job_row, error):
+    if job_row.attempts >= job_row.max_attempts:
+        Job.objects.filter(pk=job_row.pk).update(status=Job.FAILED, last_error=error)
+        return
+    retry_at = timezone.now() + timedelta(seconds=backoff(job_row.attempts))
+    try:
+        with transaction.atomic():
+            Job.objects.filter(pk=job_row.pk).update(
+                status=Job.QUEUED, run_at=retry_at, locked_at=None, locked_by='',
+                last_error=error,
+            )
+    except IntegrityError:
+        # the same work was queued again meanwhile; that job will do it
+        Job.objects.filter(pk=job_row.pk).delete()
+
+
+def run_next(queue, worker_id):
+    """Claim and run one job of `queue`. Returns False if none was due."""
+    job_row = claim(queue, worker_id)
+    if job_row is None:
+        return False
+    execute(job_row)
+    return True
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tournamentapp.changes import TOMBSTONE_RETENTION, compact_change_log
+
+
+class Command(BaseCommand):
+    help = "Drop old deletion entries from the delta sync change log."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=int(TOMBSTONE_RETENTION.total_seconds() // 3600),
+            help="Keep deletions newer than this many hours.",
+        )
+
+    def handle(self, *args, **options):
+        removed = compact_change_log(timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} deletion(s) from the change log."))
@@ -0,0 +1,143 @@
+import http.client
+import socket
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _rss_mb(pid):
+    """Resident memory of a process and its children (Linux only)."""
+    total = 0
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+            with open(f'/proc/{current}/task/{current}/children') as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return total / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a public API URL against a running server: holds slow "
+        "clients open (mobile connections trickling their request in) while "
+        "measuring the latency of normal requests. Run it against the sync "
+        "and the ASGI deployment with the same number of worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="e.g. http://127.0.0.1:8000/api/tournaments/<slug>/schedule/")
+        parser.add_argument('--slow-clients', type=int, default=50)
+        parser.add_argument(
+            '--trickle', type=float, default=5.0,
+            help="Seconds each slow client takes to send its request.",
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument(
+            '--pid', type=int, action='append', default=[],
+            help="Server process to report the memory of (with its workers). Repeatable.",
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError("Only plain http:// URLs are supported.")
+        self.host, self.port = url.hostname, url.port or 80
+        self.path = url.path + (f'?{url.query}' if url.query else '')
+        self.timeout = options['timeout']
+
+        slow = [
+            threading.Thread(target=self._slow_client, args=(options['trickle'],), daemon=True)
+            for _ in range(options['slow_clients'])
+        ]
+        for thread in slow:
+            thread.start()
+        time.sleep(min(0.5, options['trickle'] / 2))  # let them connect
+
+        latencies, failures = [], []
+        lock = threading.Lock()
+        remaining = iter(range(options['requests']))
+
+        def fast_client():
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                started = time.perf_counter()
+                try:
+                    self._request()
+                except (OSError, http.client.HTTPException) as exc:
+                    with lock:
+                        failures.append(exc)
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=fast_client) for _ in range(options['concurrency'])]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        memory = sum(_rss_mb(pid) for pid in options['pid'])
+
+        for thread in slow:
+            thread.join(options['trickle'] + self.timeout)
+
+        self.stdout.write(
+            f"{len(latencies)} ok, {len(failures)} failed in {elapsed:.2f}s "
+            f"({len(latencies) / elapsed:.1f} req/s) with {options['slow_clients']} slow clients"
+        )
+        if latencies:
+            latencies.sort()
+            self.stdout.write(
+                f"latency ms: p50 {statistics.median(latencies):.1f}, "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}, max {latencies[-1]:.1f}"
+            )
+        if options['pid']:
+            self.stdout.write(f"server RSS: {memory:.0f} MB")
+        if failures:
+            self.stdout.write(self.style.WARNING(f"first failure: {failures[0]!r}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Done."))
+
+    def _request(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request('GET', self.path, headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 500:
+                raise http.client.HTTPException(f"HTTP {response.status}")
+        finally:
+            connection.close()
+
+    def _slow_client(self, trickle):
+        head = (
+            f"GET {self.path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            "Connection: close\r\nAccept-Encoding: gzip\r\n"
+        ).encode()
+        chunks = 20
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout + trickle) as sock:
+                sock.sendall(head)
+                for _ in range(chunks):
+                    time.sleep(trickle / chunks)
+                    sock.sendall(b"X-Padding: slow-client\r\n")
+                sock.sendall(b"\r\n")
+                while sock.recv(65536):
+                    pass
+        except OSError:
+            pass
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tournamentapp.cache import RESULTS, bump_version
+from tournamentapp.models import Player, Tournament
+from tournamentapp.utils import refresh_goal_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Player.goal_count from goal events to fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tournament',
+            help="Slug of the tournament to rebuild. Defaults to all tournaments.",
+        )
+
+    def handle(self, *args, **options):
+        players = Player.objects.all()
+        tournaments = Tournament.objects.all()
+
+        slug = options['tournament']
+        if slug:
+            tournaments = tournaments.filter(slug=slug)
+            if not tournaments.exists():
+                raise CommandError(f"Tournament '{slug}' does not exist.")
+            players = players.filter(team__tournament__in=tournaments)
+
+        updated = refresh_goal_counts(players)
+        for tournament_id in tournaments.values_list('pk', flat=True):
+            bump_version(tournament_id, RESULTS)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt goal counts for {updated} player(s)."))
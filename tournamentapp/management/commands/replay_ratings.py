@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tournamentapp.models import Tournament
+from tournamentapp.utils import replay_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute team ratings and rating history from finished matches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tournament',
+            help="Slug of the tournament to replay. Defaults to all tournaments.",
+        )
+
+    def handle(self, *args, **options):
+        tournaments = Tournament.objects.all()
+
+        slug = options['tournament']
+        if slug:
+            tournaments = tournaments.filter(slug=slug)
+            if not tournaments.exists():
+                raise CommandError(f"Tournament '{slug}' does not exist.")
+
+        replayed = sum(replay_ratings(tournament) for tournament in tournaments)
+        self.stdout.write(self.style.SUCCESS(f"Replayed ratings for {replayed} match(es)."))
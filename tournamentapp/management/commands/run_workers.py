@@ -0,0 +1,150 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from tournamentapp.cache import is_process_local
+from tournamentapp.jobs import run_next
+
+logger = logging.getLogger('tournamentapp.jobs')
+
+
+class Command(BaseCommand):
+    help = (
+        "Run job queue workers: per queue, as many threads as its concurrency "
+        "limit (JOB_QUEUES), in one or more processes. The limit holds across "
+        "all processes; threads beyond it wait for a free slot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue', action='append', default=[], metavar='NAME[=THREADS]',
+            help="Queue to work on, optionally with its thread count. Repeatable. "
+                 "Defaults to every queue in JOB_QUEUES.",
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help="Worker processes, each running the full set of threads.",
+        )
+        parser.add_argument(
+            '--poll', type=float, default=1.0,
+            help="Seconds to wait before checking an empty queue again.",
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help="Exit once no job is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        queues = self._queues(options['queue'])
+        if options['processes'] < 1:
+            raise CommandError("--processes must be at least 1.")
+
+        if is_process_local():
+            # the jobs warm caches and bump versions for the web processes
+            self.stderr.write(self.style.WARNING(
+                "The cache is private to this process: cache warming and snapshot "
+                "updates made here won't reach the web workers. Set REDIS_URL."
+            ))
+
+        summary = ", ".join(f"{name}×{threads}" for name, threads in queues.items())
+        self.stdout.write(f"Working on {summary} in {options['processes']} process(es).")
+
+        if options['processes'] == 1:
+            self._run_pool(queues, options['poll'], options['burst'])
+        else:
+            self._run_processes(queues, options)
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
+
+    def _queues(self, requested):
+        configured = getattr(settings, 'JOB_QUEUES', {'default': 1})
+        if not requested:
+            return dict(configured)
+        queues = {}
+        for spec in requested:
+            name, _, threads = spec.partition('=')
+            try:
+                queues[name] = int(threads) if threads else configured.get(name, 1)
+            except ValueError:
+                raise CommandError(f"Invalid thread count in --queue {spec!r}.")
+            if queues[name] < 1:
+                raise CommandError(f"Queue {name!r} needs at least one thread.")
+        return queues
+
+    def _run_processes(self, queues, options):
+        # children must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        children = [
+            context.Process(target=self._run_pool, args=(queues, options['poll'], options['burst']))
+            for _ in range(options['processes'])
+        ]
+        for child in children:
+            child.start()
+
+        def forward(signum, frame):
+            for child in children:
+                if child.is_alive():
+                    os.kill(child.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for child in children:
+            child.join()
+
+    def _run_pool(self, queues, poll, burst):
+        stop = threading.Event()
+
+        def shut_down(signum, frame):
+            # let running jobs finish
+            stop.set()
+
+        previous = {
+            signum: signal.signal(signum, shut_down)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(queue, f"{prefix}:{queue}:{i}", stop, poll, burst),
+                name=f"jobs-{queue}-{i}",
+            )
+            for queue, count in queues.items()
+            for i in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        # join with a timeout so signals still reach the main thread
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(0.5)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    @staticmethod
+    def _work(queue, worker_id, stop, poll, burst):
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                ran = run_next(queue, worker_id)
+            except Exception:
+                # e.g. the database is unreachable; try again later
+                logger.exception("Worker %s could not claim a job", worker_id)
+                ran = False
+            finally:
+                close_old_connections()
+            if not ran:
+                if burst:
+                    break
+                stop.wait(poll)
+        connections.close_all()
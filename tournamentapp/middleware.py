@@ -0,0 +1,190 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .instrumentation import RequestTimings, registry
+from .routers import PRIMARY_COOKIE, replicas
+
+logger = logging.getLogger('tournamentapp.performance')
+
+
+class RequestTimingMiddleware:
+    """
+    Records query count, DB time, view time and render time for a sample of
+    requests.
+
+    Sampled requests get a `Server-Timing` header, a structured log line and
+    an entry in the per-URL-name histograms served by the staff metrics
+    endpoint. `view` and `render` are wall-clock times and include the SQL
+    executed during each phase; `db` is the sum of all SQL time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PERF_INSTRUMENTATION_ENABLED', True)
+        self.sample_rate = getattr(settings, 'PERF_SAMPLE_RATE', 1.0)
+        self.server_timing = getattr(settings, 'PERF_SERVER_TIMING_HEADER', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        timings = request.timings = RequestTimings()
+        start = time.perf_counter()
+        with self._wrap_queries(timings):
+            response = self.get_response(request)
+        return self._finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        timings = request.timings = RequestTimings()
+        start = time.perf_counter()
+        # Connections are per thread and async views query from the
+        # request's ORM thread, so the wrappers are installed there.
+        wrappers = await sync_to_async(self._wrap_queries)(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+        return self._finish(request, response, timings, start)
+
+    def _sampled(self):
+        return self.enabled and random.random() < self.sample_rate
+
+    @staticmethod
+    def _wrap_queries(timings):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings.query_wrapper))
+        return stack
+
+    def _finish(self, request, response, timings, start):
+        timings.total_ms = (time.perf_counter() - start) * 1000
+        timings.view_ms = max(timings.total_ms - timings.render_ms, 0.0)
+
+        url_name = self._url_name(request)
+        registry.record(url_name, timings)
+
+        if self.server_timing:
+            response['Server-Timing'] = timings.server_timing()
+
+        logger.info(
+            "request url_name=%s method=%s status=%s total_ms=%.1f db_ms=%.1f "
+            "queries=%d view_ms=%.1f render_ms=%.1f",
+            url_name, request.method, response.status_code,
+            timings.total_ms, timings.db_ms, timings.queries,
+            timings.view_ms, timings.render_ms,
+            extra={
+                'url_name': url_name,
+                'method': request.method,
+                'status': response.status_code,
+                **timings.as_dict(),
+            },
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, 'timings', None)
+        if timings is None:
+            return response
+
+        render = response.render
+
+        def timed_render():
+            start = time.perf_counter()
+            try:
+                return render()
+            finally:
+                timings.render_ms += (time.perf_counter() - start) * 1000
+
+        response.render = timed_render
+        return response
+
+    @staticmethod
+    def _url_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '<unresolved>'
+        return match.view_name or match._func_path
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a write (any unsafe method), sets the cookie that keeps the
+    browser's reads on the primary database for `REPLICA_STICKY_SECONDS`,
+    longer than the replicas take to catch up (see `routers.py`).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._pin(request, await self.get_response(request))
+
+    def _pin(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE') and replicas():
+            response.set_cookie(
+                PRIMARY_COOKIE, '1', max_age=self.sticky_seconds,
+                secure=request.is_secure(), httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, usable in an async middleware chain.
+
+    WhiteNoise's middleware is sync-only, so under the ASGI workers Django
+    would run it and everything behind it in a thread for every request,
+    async API views included. Here only requests for a static file leave
+    the event loop, to open the file.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # looks the file up on disk
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
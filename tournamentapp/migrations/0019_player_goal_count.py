@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_goal_counts(apps, schema_editor):
+    Player = apps.get_model('tournamentapp', 'Player')
+    MatchEvent = apps.get_model('tournamentapp', 'MatchEvent')
+    goals = (
+        MatchEvent.objects
+        .filter(player=OuterRef('pk'), event_type='goal')
+        .order_by()
+        .values('player')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Player.objects.update(goal_count=Coalesce(Subquery(goals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0018_tournament_cache_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='goal_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['-goal_count', 'name'], name='player_goal_ranking_idx'),
+        ),
+        migrations.RunPython(populate_goal_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Copied from tournamentapp.ratings as it stood when this migration was
+# written, so later changes to the formula don't change its result.
+DEFAULT_RATING = 1500.0
+K_FACTOR = 30
+
+
+def rating_delta(home_rating, away_rating, home_score, away_score):
+    if home_score > away_score:
+        result = 1.0
+    elif home_score < away_score:
+        result = 0.0
+    else:
+        result = 0.5
+    goal_difference = abs(home_score - away_score)
+    if goal_difference <= 1:
+        weight = 1.0
+    elif goal_difference == 2:
+        weight = 1.5
+    else:
+        weight = (11 + goal_difference) / 8
+    expected = 1 / (1 + 10 ** ((away_rating - home_rating) / 400))
+    return K_FACTOR * weight * (result - expected)
+
+
+def populate_ratings(apps, schema_editor):
+    Team = apps.get_model('tournamentapp', 'Team')
+    Match = apps.get_model('tournamentapp', 'Match')
+    RatingChange = apps.get_model('tournamentapp', 'RatingChange')
+
+    ratings = {}
+    changes = []
+    results = (
+        Match.objects
+        .filter(is_finished=True)
+        .order_by('start_time', 'pk')
+        .values_list('pk', 'home_team_id', 'away_team_id', 'home_score', 'away_score')
+    )
+    for match_id, home_id, away_id, home_score, away_score in results:
+        home = ratings.get(home_id, DEFAULT_RATING)
+        away = ratings.get(away_id, DEFAULT_RATING)
+        delta = rating_delta(home, away, home_score, away_score)
+        for team_id, before, change in ((home_id, home, delta), (away_id, away, -delta)):
+            changes.append(RatingChange(
+                team_id=team_id, match_id=match_id,
+                rating_before=before, rating_after=before + change,
+            ))
+            ratings[team_id] = before + change
+
+    RatingChange.objects.bulk_create(changes, batch_size=500)
+    teams = list(Team.objects.filter(pk__in=ratings))
+    for team in teams:
+        team.rating = ratings[team.pk]
+    Team.objects.bulk_update(teams, ['rating'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0019_player_goal_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='rating',
+            field=models.FloatField(default=1500.0, verbose_name='Rating'),
+        ),
+        migrations.CreateModel(
+            name='RatingChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating_before', models.FloatField()),
+                ('rating_after', models.FloatField()),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_changes', to='tournamentapp.match')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_changes', to='tournamentapp.team')),
+            ],
+            options={
+                'unique_together': {('team', 'match')},
+            },
+        ),
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0020_team_rating_ratingchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchevent',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='matchevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key__isnull', False)), fields=('match', 'idempotency_key'), name='matchevent_unique_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0021_matchevent_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='red_cards_served',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='suspension_games',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='yellow_cards_served',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='red_suspension_games',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='yellow_suspension_games',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='SuspensionLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('suspended', 'Suspended'), ('sat_out', 'Sat out'), ('served', 'Ban served')], max_length=20)),
+                ('reason', models.CharField(blank=True, choices=[('yellow_cards', 'Yellow cards'), ('red_card', 'Red card')], max_length=20)),
+                ('games', models.PositiveSmallIntegerField(default=0, help_text="Length of the ban for 'suspended', games sat out so far otherwise.")),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suspension_log', to='tournamentapp.match')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suspension_log', to='tournamentapp.player')),
+            ],
+            options={
+                'ordering': ['created_at', 'pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0022_suspension_engine'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='game_duration',
+            field=models.PositiveSmallIntegerField(default=15),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='half_duration',
+            field=models.PositiveSmallIntegerField(default=15),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='half_time_break',
+            field=models.PositiveSmallIntegerField(default=5),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='has_halves',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='MatchClock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('pending', 'Not started'), ('running', 'Running'), ('paused', 'Paused'), ('half_time', 'Half-time'), ('finished', 'Full-time')], default='pending', max_length=20)),
+                ('period', models.PositiveSmallIntegerField(default=1)),
+                ('elapsed_seconds', models.FloatField(default=0)),
+                ('running_since', models.DateTimeField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField(blank=True, null=True)),
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='clock', to='tournamentapp.match')),
+            ],
+        ),
+    ]
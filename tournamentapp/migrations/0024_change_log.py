@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0023_match_clock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='changes_floor',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('match', 'Match'), ('team', 'Team'), ('announcement', 'Announcement'), ('vendor', 'Vendor'), ('schedule', 'Schedule')], max_length=20)),
+                ('entity_id', models.PositiveBigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='tournamentapp.tournament')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tournament', 'id'], name='tournamenta_tournam_0893c5_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tournament', 'entity', 'entity_id'), name='unique_change_per_entity')],
+            },
+        ),
+    ]
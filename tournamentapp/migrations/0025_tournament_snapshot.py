@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0024_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='snapshot',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
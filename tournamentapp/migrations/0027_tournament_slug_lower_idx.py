@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:32
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0026_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(django.db.models.functions.text.Lower('slug'), name='tournament_slug_lower_idx'),
+        ),
+    ]
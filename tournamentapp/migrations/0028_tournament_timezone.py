@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:39
+
+import tournamentapp.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0027_tournament_slug_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='timezone',
+            field=models.CharField(default=tournamentapp.models.default_timezone, max_length=63, validators=[tournamentapp.models.validate_timezone]),
+        ),
+    ]
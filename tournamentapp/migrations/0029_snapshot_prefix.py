@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def store_snapshot_prefix(apps, schema_editor):
+    # snapshots published before the prefix was stored live under the slug
+    # the tournament has now
+    Tournament = apps.get_model('tournamentapp', 'Tournament')
+    for tournament in Tournament.objects.exclude(snapshot=None):
+        if 'prefix' in tournament.snapshot:
+            continue
+        tournament.snapshot['prefix'] = f"tournaments/{tournament.slug}/{tournament.snapshot['version']}"
+        tournament.save(update_fields=['snapshot'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0028_tournament_timezone'),
+    ]
+
+    operations = [
+        migrations.RunPython(store_snapshot_prefix, migrations.RunPython.noop),
+    ]
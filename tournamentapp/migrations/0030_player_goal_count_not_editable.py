@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournamentapp', '0029_snapshot_prefix'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='goal_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
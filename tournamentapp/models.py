@@ -1,8 +1,29 @@
-from django.db import models
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Lower
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator
+from .cache import RESULTS, bump_version, invalidate_scoreboards
+from .ratings import DEFAULT_RATING, rating_delta
+
+# Slug allocations tried before giving up on concurrent saves of the same name.
+SLUG_ATTEMPTS = 5
+
+
+def default_timezone():
+    return settings.TIME_ZONE
+
+
+def validate_timezone(value):
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"Unknown timezone: {value}")
+
 
 class Tournament(models.Model):
     ROUND_ROBIN = 'round_robin'
@@ -26,6 +47,12 @@ class Tournament(models.Model):
     )
     cache_version = models.PositiveIntegerField(default=1)
     tournament_date = models.DateField(null=True, blank=True)
+    # Kick-off times are entered and shown in this timezone.
+    timezone = models.CharField(
+        max_length=63,
+        default=default_timezone,
+        validators=[validate_timezone],
+    )
     show_leaderboard = models.BooleanField(default=True)
     show_vendors = models.BooleanField(default=True)
     show_side_events = models.BooleanField(default=True)
@@ -38,7 +65,22 @@ class Tournament(models.Model):
         default=2,
         validators=[MinValueValidator(1)]
     )
+    # Match format, saved when the schedule is generated and used by the
+    # match clock.
+    has_halves = models.BooleanField(default=False)
+    half_duration = models.PositiveSmallIntegerField(default=15)
+    half_time_break = models.PositiveSmallIntegerField(default=5)
+    game_duration = models.PositiveSmallIntegerField(default=15)
+    # Matches a ban lasts; 0 keeps the player out until the organiser lifts it.
+    yellow_suspension_games = models.PositiveSmallIntegerField(default=0)
+    red_suspension_games = models.PositiveSmallIntegerField(default=0)
     is_finished = models.BooleanField(default=False)
+    # Change log entries up to this id have been compacted away; clients
+    # syncing from an older cursor have to reload (see `changes.py`).
+    changes_floor = models.PositiveBigIntegerField(default=0)
+    # `{'version', 'files'}` of the static copy published while the
+    # tournament is finished (see `snapshots.py`).
+    snapshot = models.JSONField(null=True, blank=True, editable=False)
 
     format = models.CharField(
         max_length=20,
@@ -47,19 +89,71 @@ class Tournament(models.Model):
         help_text="Tournament format. Only 'round_robin' is implemented currently."
     )
 
+    class Meta:
+        indexes = [
+            # public URLs are resolved case-insensitively (see `slugs.py`)
+            models.Index(Lower('slug'), name='tournament_slug_lower_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.owner.email})"
 
+    @property
+    def tzinfo(self):
+        return ZoneInfo(self.timezone)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so a rename can be detected without a query on save.
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
+    def _name_changed(self):
+        loaded = getattr(self, '_loaded_name', None)
+        if loaded is None:
+            # built by hand or loaded without the name
+            return Tournament.objects.filter(pk=self.pk).exclude(name=self.name).exists()
+        return loaded != self.name
+
+    def _free_slug(self):
+        """The slug of the name, suffixed with the lowest free number if taken."""
+        base = slugify(self.name) or 'tournament'
+        taken = set(
+            Tournament.objects
+            .annotate(slug_lower=Lower('slug'))
+            .filter(slug_lower__startswith=base)
+            .exclude(pk=self.pk)
+            .values_list('slug_lower', flat=True)
+        )
+        if base not in taken:
+            return base
+        n = 1
+        while f"{base}-{n}" in taken:
+            n += 1
+        return f"{base}-{n}"
+
     def save(self, *args, **kwargs):
-        if not self.pk or Tournament.objects.filter(pk=self.pk).exclude(name=self.name).exists():
-            base = slugify(self.name)
-            slug = base
-            n = 1
-            while Tournament.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base}-{n}"
-                n += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.pk and not self._name_changed():
+            super().save(*args, **kwargs)
+            self._loaded_name = self.name
+            return
+
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'slug'}
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = self._free_slug()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                # a concurrent save took the slug between our read and write
+                taken = Tournament.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if not taken or attempt == SLUG_ATTEMPTS - 1:
+                    raise
+                continue
+            break
+        self._loaded_name = self.name
     
 class Team(models.Model):
     name = models.CharField(
@@ -90,12 +184,25 @@ class Team(models.Model):
         verbose_name="Match Points",
         )
 
+    # Elo rating, updated as results come in; `replay_ratings` rebuilds it.
+    rating = models.FloatField(
+        default=DEFAULT_RATING,
+        verbose_name="Rating",
+        )
+
     class Meta:
         unique_together = ('name', 'tournament')
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so a rename can be told apart from a points update.
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
     def add_match_points(self, points):
         """Add points to the team's match points."""
         self.match_points += points
@@ -106,6 +213,20 @@ class Team(models.Model):
         self.tournament_points += points
         self.save()
     
+class PlayerQuerySet(models.QuerySet):
+    def with_event_counts(self):
+        """
+        Annotate goal and card counts (and load team and tournament) so
+        that `goals()`, `yellow_cards()`, `red_cards()` and `is_suspended()`
+        don't query per player.
+        """
+        return self.select_related('team__tournament').annotate(
+            annotated_goals=Count('match_events', filter=Q(match_events__event_type='goal')),
+            annotated_own_goals=Count('match_events', filter=Q(match_events__event_type='own_goal')),
+            annotated_yellow_cards=Count('match_events', filter=Q(match_events__event_type='yellow_card')),
+            annotated_red_cards=Count('match_events', filter=Q(match_events__event_type='red_card')),
+        )
+
 class Player(models.Model):
     name = models.CharField(
         max_length=100,
@@ -130,36 +251,83 @@ class Player(models.Model):
     games_sat_out = models.PositiveSmallIntegerField(
         default=0,
         )
+    # Length of the current ban in matches, 0 if it lasts until lifted.
+    suspension_games = models.PositiveSmallIntegerField(
+        default=0,
+        )
+    # Cards already paid for by a served ban; they no longer count
+    # towards a suspension.
+    yellow_cards_served = models.PositiveSmallIntegerField(
+        default=0,
+        )
+    red_cards_served = models.PositiveSmallIntegerField(
+        default=0,
+        )
+    # Maintained by MatchEvent.save()/delete(); `rebuild_goal_counts` fixes drift.
+    goal_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        )
 
+    objects = PlayerQuerySet.as_manager()
 
     class Meta:
         unique_together = ('name', 'team')
+        indexes = [
+            models.Index(fields=['-goal_count', 'name'], name='player_goal_ranking_idx'),
+        ]
         verbose_name = "Player"
         verbose_name_plural = "Players"
 
     def __str__(self):
         return f"Player: {self.name} (Team: {self.team.name})"
 
+    def save(self, *args, **kwargs):
+        # goal_count moves by F() updates as goals are recorded; writing
+        # back the value this instance was loaded with would undo them.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'goal_count'
+            ]
+        super().save(*args, **kwargs)
+
+    def _event_count(self, event_type):
+        annotated = getattr(self, f'annotated_{event_type}s', None)
+        if annotated is not None:
+            return annotated
+        return self.match_events.filter(event_type=event_type).count()
+
     def goals(self):
-        return self.match_events.filter(event_type='goal').count()
+        return self._event_count('goal')
 
     def own_goals(self):
-        return self.match_events.filter(event_type='own_goal').count()
+        return self._event_count('own_goal')
 
     def yellow_cards(self):
-        return self.match_events.filter(event_type='yellow_card').count()
+        return self._event_count('yellow_card')
 
     def red_cards(self):
-        return self.match_events.filter(event_type='red_card').count()
+        return self._event_count('red_card')
 
     def is_suspended(self):
-        return self.is_muted or self.yellow_cards() >= self.team.tournament.yellow_cards_for_suspension or self.red_cards() >= 1
+        return (
+            self.is_muted
+            or self.yellow_cards() - self.yellow_cards_served >= self.team.tournament.yellow_cards_for_suspension
+            or self.red_cards() > self.red_cards_served
+        )
         
     def unmute(self):
         self.is_muted = False
         self.games_sat_out = 0
+        self.suspension_games = 0
+        self.yellow_cards_served = 0
+        self.red_cards_served = 0
         self.match_events.filter(event_type__in=['yellow_card', 'red_card']).delete()
-        self.save(update_fields=['is_muted', 'games_sat_out'])
+        self.save(update_fields=[
+            'is_muted', 'games_sat_out', 'suspension_games',
+            'yellow_cards_served', 'red_cards_served',
+        ])
 
 class Field(models.Model):
     name = models.CharField(
@@ -219,6 +387,13 @@ class Match(models.Model):
 
     def __str__(self):
         return f"{self.home_team.name} vs {self.away_team.name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so a move to another field can refresh both fields' scoreboards.
+        instance._loaded_field_id = instance.__dict__.get('field_id')
+        return instance
     
     def clean(self):
         super().clean()
@@ -264,12 +439,223 @@ class Match(models.Model):
             self.home_team.tournament_points += tournament.points_for_draw
             self.away_team.tournament_points += tournament.points_for_draw
 
+        self.update_ratings(self.home_team, self.away_team, home_goals, away_goals)
+
         # Save everything
         self.home_team.save()
         self.away_team.save()
         self.is_finished = True
         self.save()
 
+    def update_ratings(self, home_team, away_team, home_score, away_score):
+        """
+        Apply this result's rating change to `home_team` and `away_team`
+        (the caller saves them) and record it in the rating history.
+
+        A result that was already rated is re-rated from the same
+        pre-match ratings, swapping the old change for the new one, so a
+        correction costs the same regardless of how many matches followed.
+        """
+        previous = {change.team_id: change for change in self.rating_changes.all()}
+        home_change = previous.get(home_team.pk)
+        away_change = previous.get(away_team.pk)
+
+        rated = home_change is not None and away_change is not None
+        if rated:
+            home_team.rating -= home_change.delta
+            away_team.rating -= away_change.delta
+        else:
+            home_change = RatingChange(
+                team=home_team, match=self, rating_before=home_team.rating,
+            )
+            away_change = RatingChange(
+                team=away_team, match=self, rating_before=away_team.rating,
+            )
+
+        delta = rating_delta(
+            home_change.rating_before, away_change.rating_before, home_score, away_score
+        )
+        home_change.rating_after = home_change.rating_before + delta
+        away_change.rating_after = away_change.rating_before - delta
+        home_team.rating += delta
+        away_team.rating -= delta
+
+        if rated:
+            RatingChange.objects.bulk_update([home_change, away_change], ['rating_after'])
+        else:
+            RatingChange.objects.bulk_create([home_change, away_change])
+
+class MatchClock(models.Model):
+    """
+    Live clock of a match. Only state changes are stored; the current
+    minute is derived from the running time of the current period.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    PAUSED = 'paused'
+    HALF_TIME = 'half_time'
+    FINISHED = 'finished'
+
+    STATES = (
+        (PENDING, 'Not started'),
+        (RUNNING, 'Running'),
+        (PAUSED, 'Paused'),
+        (HALF_TIME, 'Half-time'),
+        (FINISHED, 'Full-time'),
+    )
+    # action -> {from state: to state}
+    TRANSITIONS = {
+        'kick_off': {PENDING: RUNNING, HALF_TIME: RUNNING},
+        'pause': {RUNNING: PAUSED},
+        'resume': {PAUSED: RUNNING},
+        'half_time': {RUNNING: HALF_TIME, PAUSED: HALF_TIME},
+        'end': {RUNNING: FINISHED, PAUSED: FINISHED, HALF_TIME: FINISHED},
+    }
+
+    match = models.OneToOneField(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='clock'
+    )
+    state = models.CharField(max_length=20, choices=STATES, default=PENDING)
+    period = models.PositiveSmallIntegerField(default=1)
+    # Running time of the current period up to `running_since`.
+    elapsed_seconds = models.FloatField(default=0)
+    running_since = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.match}: {self.get_state_display()}"
+
+    def apply(self, action, now):
+        """Move to the state `action` leads to, or raise ValueError."""
+        target = self.TRANSITIONS.get(action, {}).get(self.state)
+        if target is None:
+            raise ValueError(f"Cannot {action.replace('_', ' ')} while the match is {self.get_state_display().lower()}.")
+        if action == 'half_time' and (self.period != 1 or not self.match.tournament.has_halves):
+            raise ValueError("This match is not played in halves.")
+
+        if self.state == self.RUNNING:
+            self.elapsed_seconds += (now - self.running_since).total_seconds()
+            self.running_since = None
+
+        if action == 'kick_off' and self.state == self.HALF_TIME:
+            self.period = 2
+            self.elapsed_seconds = 0
+        if target == self.RUNNING:
+            self.running_since = now
+
+        self.state = target
+        self.changed_at = now
+
+class ChangeLogEntry(models.Model):
+    """
+    The latest change to one entity of a tournament. Each entity has a
+    single entry that is replaced on every change, so `id` always grows
+    and serves as the delta sync cursor.
+    """
+    MATCH = 'match'
+    TEAM = 'team'
+    ANNOUNCEMENT = 'announcement'
+    VENDOR = 'vendor'
+    # Changes that clients can't apply piecemeal (fields, bulk reschedules).
+    SCHEDULE = 'schedule'
+
+    ENTITIES = (
+        (MATCH, 'Match'),
+        (TEAM, 'Team'),
+        (ANNOUNCEMENT, 'Announcement'),
+        (VENDOR, 'Vendor'),
+        (SCHEDULE, 'Schedule'),
+    )
+
+    tournament = models.ForeignKey(
+        Tournament,
+        on_delete=models.CASCADE,
+        related_name='changes'
+    )
+    entity = models.CharField(max_length=20, choices=ENTITIES)
+    entity_id = models.PositiveBigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tournament', 'entity', 'entity_id'],
+                name='unique_change_per_entity',
+            ),
+        ]
+        indexes = [models.Index(fields=['tournament', 'id'])]
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f"{self.get_entity_display()} {self.entity_id} {action}"
+
+class RatingChange(models.Model):
+    """One team's rating before and after a finished match."""
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        related_name='rating_changes'
+    )
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='rating_changes'
+    )
+    rating_before = models.FloatField()
+    rating_after = models.FloatField()
+
+    class Meta:
+        unique_together = ('team', 'match')
+
+    def __str__(self):
+        return f"{self.team}: {self.rating_before:.0f} -> {self.rating_after:.0f}"
+
+    @property
+    def delta(self):
+        return self.rating_after - self.rating_before
+
+class SuspensionLog(models.Model):
+    SUSPENDED = 'suspended'
+    SAT_OUT = 'sat_out'
+    SERVED = 'served'
+
+    ACTIONS = (
+        (SUSPENDED, 'Suspended'),
+        (SAT_OUT, 'Sat out'),
+        (SERVED, 'Ban served'),
+    )
+    REASONS = (
+        ('yellow_cards', 'Yellow cards'),
+        ('red_card', 'Red card'),
+    )
+
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='suspension_log'
+    )
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='suspension_log'
+    )
+    action = models.CharField(max_length=20, choices=ACTIONS)
+    reason = models.CharField(max_length=20, choices=REASONS, blank=True)
+    games = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Length of the ban for 'suspended', games sat out so far otherwise.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at', 'pk']
+
+    def __str__(self):
+        return f"{self.player.name}: {self.get_action_display()} ({self.match})"
+
 class MatchEvent(models.Model):
     EVENT_TYPES = (
         ('goal', 'Goal'),
@@ -325,11 +711,25 @@ class MatchEvent(models.Model):
         help_text="Timestamp when the event was created.",
         verbose_name="Created At",
     )
+    # Client-generated, so a batch resent after a dropped connection
+    # doesn't record its events twice.
+    idempotency_key = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         ordering = ['minute', 'created_at']
         verbose_name = "Match Event"
         verbose_name_plural = "Match Events"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['match', 'idempotency_key'],
+                condition=Q(idempotency_key__isnull=False),
+                name='matchevent_unique_idempotency_key',
+            ),
+        ]
 
     def __str__(self):
         minute = f"{self.minute}'" if self.minute else "?"
@@ -340,6 +740,43 @@ class MatchEvent(models.Model):
         else:
             return f"{self.get_event_type_display()} - {self.player} ({self.team}) at {minute}"
 
+    def save(self, *args, **kwargs):
+        # An edit can turn a goal into a card or credit it to someone else.
+        scored_by = None
+        if not self._state.adding:
+            stored = MatchEvent.objects.filter(pk=self.pk).values('event_type', 'player_id').first()
+            if stored and stored['event_type'] == 'goal':
+                scored_by = stored['player_id']
+        super().save(*args, **kwargs)
+        now_scored_by = self.player_id if self.event_type == 'goal' else None
+        if scored_by != now_scored_by:
+            if scored_by:
+                Player.objects.filter(pk=scored_by, goal_count__gt=0).update(
+                    goal_count=F('goal_count') - 1
+                )
+            if now_scored_by:
+                Player.objects.filter(pk=now_scored_by).update(
+                    goal_count=F('goal_count') + 1
+                )
+        self._changed()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        if self.event_type == 'goal' and self.player_id:
+            Player.objects.filter(pk=self.player_id, goal_count__gt=0).update(
+                goal_count=F('goal_count') - 1
+            )
+        self._changed()
+        return result
+
+    def _changed(self):
+        from .changes import record_change
+
+        bump_version(self.match.tournament_id, RESULTS)
+        invalidate_scoreboards([self.match.field_id])
+        # the delta feed sends the match, and with it the top scorers
+        record_change(self.match.tournament_id, ChangeLogEntry.MATCH, self.match_id)
+
     def clean(self):
         if self.substitute_player and self.substitute_player.team != self.team:
             raise ValidationError("Substitute must be from the same team.")
@@ -369,4 +806,48 @@ class GoalEvent(MatchEvent):
     def clean(self):
         super().clean()
         if self.event_type != 'goal':
-            raise ValidationError("This event must be a goal.")
\ No newline at end of file
+            raise ValidationError("This event must be a goal.")
+
+class Job(models.Model):
+    """
+    A unit of deferred work for the in-database queue (see `jobs.py`).
+    Finished jobs are deleted; failed ones are kept for inspection.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+
+    STATUSES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    )
+
+    queue = models.CharField(max_length=50, default='default')
+    # Dotted path of the function to call with `args`.
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    # At most one queued job per key; a running one doesn't count, so work
+    # arriving while it runs is queued again.
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=Q(status='queued'),
+                name='unique_queued_job_per_dedupe_key',
+            ),
+        ]
+        indexes = [models.Index(fields=['queue', 'status', 'run_at'])]
+
+    def __str__(self):
+        return f"{self.name}{tuple(self.args)} [{self.queue}, {self.status}]"
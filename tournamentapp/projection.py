@@ -0,0 +1,244 @@
+"""
+Monte Carlo projection of the final standings.
+
+The remaining fixtures are played out `runs` times at once with NumPy:
+each side's goals are drawn from a Poisson distribution whose mean comes
+from both teams' scoring and conceding rates so far, points are awarded
+with the tournament's `points_for_win/draw/loss`, and every simulated
+table is ordered exactly like `get_team_standings` (points, then goal
+difference in matches between the tied teams, then name).
+
+Simulations are too slow to run inside a request, so `request_projection`
+queues a `compute_projection` job (see `jobs.py`) and the result is cached
+under the tournament's results version.
+"""
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache import PAYLOAD_TIMEOUT, RESULTS, payload_key
+from .jobs import enqueue, job
+from .models import Match, MatchEvent, Team, Tournament
+
+DEFAULT_RUNS = 10_000
+BATCH_SIZE = 2_500
+# Pseudo-matches at the league average mixed into every team's rates so
+# that one lopsided early result doesn't dominate the projection.
+PRIOR_MATCHES = 2
+LEASE_SECONDS = 5 * 60
+
+
+def simulate_positions(
+    points,
+    head_to_head,
+    fixtures,
+    scoring_rates,
+    points_for=(3, 1, 0),
+    runs=DEFAULT_RUNS,
+    batch_size=BATCH_SIZE,
+    seed=None,
+):
+    """
+    Returns an (n, n) array where [i, k] is the probability that team i
+    finishes in position k + 1.
+
+    Teams are indexed in name order (the last tie-breaker).
+
+    Args:
+        points: (n,) current points.
+        head_to_head: (n, n) goals team i has scored against team j in
+            finished matches.
+        fixtures: (m, 2) home/away team indexes of the remaining matches.
+        scoring_rates: (m, 2) expected home/away goals of each fixture.
+        points_for: points for a win, a draw and a loss.
+    """
+    rng = np.random.default_rng(seed)
+    points = np.asarray(points, dtype=np.int64)
+    head_to_head = np.asarray(head_to_head, dtype=np.int64)
+    fixtures = np.asarray(fixtures, dtype=np.int64).reshape(-1, 2)
+    scoring_rates = np.asarray(scoring_rates, dtype=np.float64).reshape(-1, 2)
+    win, draw, loss = points_for
+
+    n = len(points)
+    home, away = fixtures[:, 0], fixtures[:, 1]
+    # one-hot incidence, so a batch's points are two matrix products
+    home_incidence = np.zeros((len(fixtures), n), dtype=np.int64)
+    away_incidence = np.zeros((len(fixtures), n), dtype=np.int64)
+    home_incidence[np.arange(len(fixtures)), home] = 1
+    away_incidence[np.arange(len(fixtures)), away] = 1
+    pair_home = home * n + away
+    pair_away = away * n + home
+    name_order = np.arange(n)
+
+    counts = np.zeros(n * n, dtype=np.int64)
+    done = 0
+    while done < runs:
+        size = min(batch_size, runs - done)
+        done += size
+
+        home_goals = rng.poisson(scoring_rates[:, 0], size=(size, len(fixtures)))
+        away_goals = rng.poisson(scoring_rates[:, 1], size=(size, len(fixtures)))
+
+        home_points = np.where(home_goals > away_goals, win,
+                               np.where(home_goals == away_goals, draw, loss))
+        away_points = np.where(away_goals > home_goals, win,
+                               np.where(home_goals == away_goals, draw, loss))
+        table = points + home_points @ home_incidence + away_points @ away_incidence
+
+        # goals[r, i, j]: goals i scored against j in run r
+        offsets = (np.arange(size) * n * n)[:, None]
+        goals = np.bincount(
+            np.concatenate([(offsets + pair_home).ravel(), (offsets + pair_away).ravel()]),
+            weights=np.concatenate([home_goals.ravel(), away_goals.ravel()]),
+            minlength=size * n * n,
+        ).reshape(size, n, n) + head_to_head
+        tied = table[:, :, None] == table[:, None, :]
+        tied_goal_difference = ((goals - goals.transpose(0, 2, 1)) * tied).sum(axis=2)
+
+        order = np.lexsort(
+            (np.broadcast_to(name_order, table.shape), -tied_goal_difference, -table),
+            axis=-1,
+        )
+        counts += np.bincount((order * n + name_order).ravel(), minlength=n * n)
+
+    return (counts / runs).reshape(n, n)
+
+
+def _scoring_rates(fixtures, goals_for, goals_against, played):
+    """Expected goals per side: attack strength x defence weakness x average."""
+    total_played = played.sum()
+    average = goals_for.sum() / total_played if total_played else 1.0
+    average = max(average, 0.1)
+
+    attack = (goals_for + average * PRIOR_MATCHES) / (played + PRIOR_MATCHES) / average
+    defence = (goals_against + average * PRIOR_MATCHES) / (played + PRIOR_MATCHES) / average
+
+    home, away = fixtures[:, 0], fixtures[:, 1]
+    return np.stack([
+        average * attack[home] * defence[away],
+        average * attack[away] * defence[home],
+    ], axis=1)
+
+
+def project_standings(tournament, runs=DEFAULT_RUNS, seed=None):
+    """
+    Runs the simulation for a tournament and returns the serializable
+    projection: per team, current points and the probability of every
+    finishing position, most likely winner first.
+    """
+    teams = list(
+        Team.objects.filter(tournament=tournament)
+        .order_by('name')
+        .values_list('id', 'name', 'tournament_points')
+    )
+    index = {team_id: i for i, (team_id, _, _) in enumerate(teams)}
+    n = len(teams)
+
+    goals_for = np.zeros(n)
+    goals_against = np.zeros(n)
+    played = np.zeros(n)
+    fixtures = []
+    matches = Match.objects.filter(tournament=tournament).values_list(
+        'home_team_id', 'away_team_id', 'home_score', 'away_score', 'is_finished'
+    )
+    for home_id, away_id, home_score, away_score, is_finished in matches:
+        home, away = index[home_id], index[away_id]
+        if not is_finished:
+            fixtures.append((home, away))
+            continue
+        goals_for[home] += home_score
+        goals_for[away] += away_score
+        goals_against[home] += away_score
+        goals_against[away] += home_score
+        played[home] += 1
+        played[away] += 1
+
+    # same source as the tie-breaker in get_team_standings: goal events
+    head_to_head = np.zeros((n, n), dtype=np.int64)
+    goal_events = (
+        MatchEvent.objects
+        .filter(match__tournament=tournament, match__is_finished=True, event_type='goal')
+        .values_list('team_id', 'match__home_team_id', 'match__away_team_id')
+        .annotate(goals=Count('id'))
+        .order_by()
+    )
+    for team_id, home_id, away_id, goals in goal_events:
+        opponent_id = away_id if team_id == home_id else home_id
+        head_to_head[index[team_id], index[opponent_id]] += goals
+
+    fixtures = np.array(fixtures, dtype=np.int64).reshape(-1, 2)
+    probabilities = simulate_positions(
+        points=[points for _, _, points in teams],
+        head_to_head=head_to_head,
+        fixtures=fixtures,
+        scoring_rates=_scoring_rates(fixtures, goals_for, goals_against, played),
+        points_for=(
+            tournament.points_for_win,
+            tournament.points_for_draw,
+            tournament.points_for_loss,
+        ),
+        runs=runs,
+        seed=seed,
+    )
+
+    projection = [
+        {
+            'team_name': name,
+            'points': points,
+            'positions': [round(float(p), 4) for p in probabilities[i]],
+            'top_two': round(float(probabilities[i, :2].sum()), 4),
+        }
+        for i, (_, name, points) in enumerate(teams)
+    ]
+    projection.sort(key=lambda team: [-p for p in team['positions']])
+    return {
+        'runs': runs,
+        'remaining_matches': len(fixtures),
+        'teams': projection,
+    }
+
+
+def _latest_key(tournament_id):
+    return f"tournament:{tournament_id}:projection:latest"
+
+
+def _key(tournament_id):
+    return payload_key('projection', tournament_id, [RESULTS])
+
+
+@job(max_attempts=3)
+def compute_projection(tournament_id):
+    """Cache the projection for the tournament's current results."""
+    key = _key(tournament_id)
+    try:
+        tournament = Tournament.objects.filter(pk=tournament_id).first()
+        if tournament is None:
+            return
+        payload = project_standings(tournament)
+        cache.set(key, payload, PAYLOAD_TIMEOUT)
+        cache.set(_latest_key(tournament_id), payload, PAYLOAD_TIMEOUT)
+    finally:
+        cache.delete(f"{key}:lease")
+
+
+def request_projection(tournament):
+    """
+    Returns `(payload, is_current)`.
+
+    If no projection exists for the current results version one is
+    queued (at most one per version across processes) and the previous
+    projection, if any, is returned meanwhile.
+    """
+    key = _key(tournament.pk)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload, True
+
+    if cache.add(f"{key}:lease", True, LEASE_SECONDS):
+        if getattr(settings, 'PROJECTION_RUN_INLINE', False):
+            compute_projection(tournament.pk)
+            return cache.get(key), True
+        enqueue(compute_projection, tournament.pk, dedupe_key=f"projection:{tournament.pk}")
+
+    return cache.get(_latest_key(tournament.pk)), False
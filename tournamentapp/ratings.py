@@ -0,0 +1,33 @@
+"""
+Elo team ratings weighted by goal difference (as in the World Football
+Elo ratings): a 4-0 moves ratings further than a 1-0, and beating a
+stronger team earns more than beating a weaker one.
+"""
+DEFAULT_RATING = 1500.0
+K_FACTOR = 30
+
+
+def expected_result(rating, opponent_rating):
+    """Probability-like expected result (win = 1, draw = 0.5) for `rating`."""
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def goal_difference_weight(goal_difference):
+    goal_difference = abs(goal_difference)
+    if goal_difference <= 1:
+        return 1.0
+    if goal_difference == 2:
+        return 1.5
+    return (11 + goal_difference) / 8
+
+
+def rating_delta(home_rating, away_rating, home_score, away_score, k=K_FACTOR):
+    """Rating points the home team gains (the away team loses as many)."""
+    if home_score > away_score:
+        result = 1.0
+    elif home_score < away_score:
+        result = 0.0
+    else:
+        result = 0.5
+    weight = goal_difference_weight(home_score - away_score)
+    return k * weight * (result - expected_result(home_rating, away_rating))
@@ -0,0 +1,108 @@
+"""
+Read-replica routing for public spectator traffic.
+
+The public read API and the SPA page read from the replica databases
+listed in `DATABASE_REPLICAS`, so spectators polling through a match
+don't load the primary that referees write every goal to. Organiser
+pages, background jobs and every write use the primary.
+
+Replica reads are opted into per request with `replica_reads()`; outside
+it the router leaves reads on the primary. The replica is picked on the
+request's first read and kept for the rest of it, so one response never
+mixes two replicas. A browser that has just written gets a short-lived
+cookie (`ReadYourWritesMiddleware`) and reads from the primary until it
+expires, so organisers see their own changes despite replication lag. A
+replica that can't be connected to is skipped for
+`REPLICA_RETRY_SECONDS` and its reads go to the primary meanwhile.
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = 'read_primary'
+
+# {'alias': ...} while replica reads are enabled; a dict so the alias
+# picked in the ORM thread is seen by the rest of the request
+_reads = ContextVar('replica_reads', default=None)
+# alias -> time.monotonic() until which the replica is skipped
+_down_until = {}
+
+
+def replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def must_read_primary(request):
+    """Whether `request` comes from a browser that wrote recently."""
+    return PRIMARY_COOKIE in request.COOKIES
+
+
+@contextmanager
+def replica_reads(request):
+    """Send the reads made inside the block to a replica, if there is one."""
+    enabled = bool(replicas()) and not must_read_primary(request)
+    token = _reads.set({'alias': None} if enabled else None)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def reading_replica():
+    """Whether reads in the current context may go to a replica."""
+    return _reads.get() is not None
+
+
+def cache_timeout(timeout):
+    """
+    Timeout for a value built in the current context. A replica may not
+    have the write that bumped the value's cache version yet, so what's
+    built from one is kept for at most `REPLICA_CACHE_TIMEOUT` seconds.
+    """
+    if not reading_replica():
+        return timeout
+    limit = getattr(settings, 'REPLICA_CACHE_TIMEOUT', 15)
+    return limit if timeout is None else min(timeout, limit)
+
+
+def _healthy_replica():
+    now = time.monotonic()
+    candidates = [alias for alias in replicas() if _down_until.get(alias, 0) <= now]
+    random.shuffle(candidates)
+    for alias in candidates:
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            logger.warning("Replica %s is unreachable, reading from the primary", alias, exc_info=True)
+            _down_until[alias] = now + getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+            continue
+        return alias
+    return DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        reads = _reads.get()
+        if reads is None:
+            return DEFAULT_DB_ALIAS
+        if reads['alias'] is None:
+            reads['alias'] = _healthy_replica()
+        return reads['alias']
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas get the schema through replication
+        return db == DEFAULT_DB_ALIAS
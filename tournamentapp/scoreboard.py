@@ -0,0 +1,90 @@
+"""
+Big-screen scoreboards for venue displays.
+
+Each field has one cached JSON document with its current and next match
+and the current match's live score. It is rebuilt only after something
+it shows has changed (a match on the field, one of its events, a team
+name), so any number of displays polling it costs a cache read each.
+The clock is not part of the document: it changes on its own schedule
+and is read from its own cached document (see `clock.py`).
+"""
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from .cache import invalidate_scoreboards, scoreboard_key
+from .models import Field, Match
+from .routers import cache_timeout
+
+SCOREBOARD_TIMEOUT = 6 * 60 * 60
+
+
+def _live_score(team, opponent):
+    return (
+        Count('events', filter=Q(events__event_type='goal', events__team_id=F(team)))
+        + Count('events', filter=Q(events__event_type='own_goal', events__team_id=F(opponent)))
+    )
+
+
+def build_scoreboard(field):
+    """
+    The scoreboard document of a field: its first two unfinished matches
+    in kick-off order, with the score of their events so far.
+    """
+    matches = (
+        Match.objects
+        .filter(field=field, is_finished=False)
+        .select_related('home_team', 'away_team')
+        .annotate(
+            live_home_score=_live_score('home_team_id', 'away_team_id'),
+            live_away_score=_live_score('away_team_id', 'home_team_id'),
+        )
+        .order_by('start_time')[:2]
+    )
+    current, upcoming = (list(matches) + [None, None])[:2]
+
+    def describe(match):
+        if match is None:
+            return None
+        return {
+            'id': match.pk,
+            'home_team': match.home_team.name,
+            'away_team': match.away_team.name,
+            'start_time': match.start_time.isoformat(),
+            'home_score': match.live_home_score,
+            'away_score': match.live_away_score,
+        }
+
+    return {
+        'field_id': field.pk,
+        'field_name': field.name,
+        'tournament_id': field.tournament_id,
+        'current_match': describe(current),
+        'next_match': describe(upcoming),
+    }
+
+
+def get_scoreboard_document(field_id):
+    """The scoreboard document of a field, from the cache when possible."""
+    key = scoreboard_key(field_id)
+    document = cache.get(key)
+    if document is None:
+        field = Field.objects.select_related('tournament').filter(pk=field_id).first()
+        if field is None:
+            return None
+        document = build_scoreboard(field)
+        cache.set(key, document, cache_timeout(SCOREBOARD_TIMEOUT))
+    return document
+
+
+async def aget_scoreboard_document(field_id):
+    document = await cache.aget(scoreboard_key(field_id))
+    if document is None:
+        document = await sync_to_async(get_scoreboard_document)(field_id)
+    return document
+
+
+def invalidate_tournament_scoreboards(tournament_id):
+    invalidate_scoreboards(
+        Field.objects.filter(tournament_id=tournament_id).values_list('pk', flat=True)
+    )
@@ -1,6 +1,15 @@
 from .forms import TeamCreateForm
 from django.contrib import messages
-from .models import Player
+from django.db import transaction
+from django.db.models import Count, Q
+from .cache import RESULTS, bump_version, invalidate_scoreboards
+from .changes import record_change
+from .models import ChangeLogEntry, Match, MatchEvent, Player
+from .utils import recalculate_points, refresh_goal_counts
+from .clock import current_minute
+
+BATCH_EVENT_TYPES = {'goal', 'own_goal', 'yellow_card', 'red_card', 'substitution'}
+MAX_EVENT_BATCH = 200
 
 def handle_batch_lines(request, tournament, lines):
     """
@@ -50,4 +59,157 @@ def handle_batch_lines(request, tournament, lines):
         else:
             messages.warning(request, f"Skipped unrecognizable line or no current team")
 
-    return created_teams, created_players
\ No newline at end of file
+    return created_teams, created_players
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_minute(value):
+    if value in (None, ''):
+        return None
+    minute = int(value)
+    if minute < 0:
+        raise ValueError
+    return minute
+
+
+def record_event_batch(match, events):
+    """
+    Record an ordered batch of referee events for a match.
+
+    Each event is a dict with `key` (client idempotency key),
+    `event_type`, `team_id`, `player_id`, optional `minute` (defaults to
+    the match clock) and, for substitutions, `substitute_player_id`. Events whose key was already
+    recorded are reported as duplicates with the stored id; invalid
+    events are rejected individually so the rest of a queued batch still
+    syncs. Suspensions are applied in order within the batch, so a
+    second yellow followed by a goal rejects the goal like separate
+    requests would.
+
+    Returns:
+        {
+            'results': [{'key', 'status', 'id'?, 'error'?}, ...] in input order,
+            'home_score': int,
+            'away_score': int,
+        }
+    """
+    tournament = match.tournament
+    team_ids = {match.home_team_id, match.away_team_id}
+    clock_minute = current_minute(match)
+    keys = [str(event.get('key') or '') for event in events]
+    player_ids = {
+        _int_or_none(event.get(field))
+        for event in events
+        for field in ('player_id', 'substitute_player_id')
+    } - {None}
+
+    with transaction.atomic():
+        # Serializes batches for the same match so replays racing each
+        # other can't both pass the duplicate check.
+        Match.objects.select_for_update().filter(pk=match.pk).exists()
+
+        recorded = dict(
+            MatchEvent.objects
+            .filter(match=match, idempotency_key__in=[k for k in keys if k])
+            .values_list('idempotency_key', 'pk')
+        )
+        players = {
+            player.pk: player
+            for player in Player.objects.filter(pk__in=player_ids, team_id__in=team_ids).annotate(
+                yellow_count=Count('match_events', filter=Q(match_events__event_type='yellow_card')),
+            )
+        }
+
+        results = []
+        new_events = []
+        muted = set()
+        for key, event in zip(keys, events):
+            if not key or len(key) > 64:
+                results.append({'key': key, 'status': 'rejected', 'error': 'Missing or invalid key.'})
+                continue
+            if key in recorded:
+                results.append({'key': key, 'status': 'duplicate'})
+                continue
+
+            error = None
+            event_type = event.get('event_type')
+            player = players.get(_int_or_none(event.get('player_id')))
+            substitute = players.get(_int_or_none(event.get('substitute_player_id')))
+            try:
+                minute = _parse_minute(event.get('minute'))
+            except (TypeError, ValueError):
+                minute = None
+                error = 'Invalid minute.'
+
+            if event_type not in BATCH_EVENT_TYPES:
+                error = 'Unknown event type.'
+            elif _int_or_none(event.get('team_id')) not in team_ids:
+                error = 'Team is not playing in this match.'
+            elif player is None or player.team_id != int(event['team_id']):
+                error = 'Player does not belong to this team.'
+            elif event_type == 'goal' and player.is_muted:
+                error = 'Player is suspended and cannot score.'
+            elif event_type == 'substitution' and (substitute is None or substitute.team_id != player.team_id):
+                error = 'Substitute must be from the same team.'
+
+            if error:
+                results.append({'key': key, 'status': 'rejected', 'error': error})
+                continue
+
+            if event_type == 'yellow_card':
+                player.yellow_count += 1
+                unserved = player.yellow_count - player.yellow_cards_served
+                if unserved >= tournament.yellow_cards_for_suspension:
+                    player.is_muted = True
+            elif event_type == 'red_card':
+                player.is_muted = True
+            if player.is_muted:
+                muted.add(player.pk)
+
+            new_events.append(MatchEvent(
+                match=match,
+                team_id=player.team_id,
+                player=player,
+                substitute_player=substitute if event_type == 'substitution' else None,
+                event_type=event_type,
+                minute=clock_minute if minute is None else minute,
+                idempotency_key=key,
+            ))
+            recorded[key] = None  # filled in once the batch is inserted
+            results.append({'key': key, 'status': 'created'})
+
+        created = MatchEvent.objects.bulk_create(new_events)
+        recorded.update((event.idempotency_key, event.pk) for event in created)
+        for result in results:
+            if result['status'] in ('created', 'duplicate'):
+                result['id'] = recorded[result['key']]
+
+        if created:
+            Player.objects.filter(pk__in=muted, is_muted=False).update(is_muted=True)
+            refresh_goal_counts(Player.objects.filter(
+                pk__in={event.player_id for event in created if event.event_type == 'goal'}
+            ))
+            if match.is_finished:
+                recalculate_points(match)
+            bump_version(tournament.pk, RESULTS)
+            invalidate_scoreboards([match.field_id])
+            # bulk_create bypasses MatchEvent.save()
+            record_change(tournament.pk, ChangeLogEntry.MATCH, match.pk)
+
+    score = match.events.aggregate(
+        home_score=(
+            Count('pk', filter=Q(event_type='goal', team_id=match.home_team_id))
+            + Count('pk', filter=Q(event_type='own_goal', team_id=match.away_team_id))
+        ),
+        away_score=(
+            Count('pk', filter=Q(event_type='goal', team_id=match.away_team_id))
+            + Count('pk', filter=Q(event_type='own_goal', team_id=match.home_team_id))
+        ),
+    )
+    return {'results': results, **score}
+
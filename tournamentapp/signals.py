@@ -0,0 +1,69 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import RESULTS, SCHEDULE, TOURNAMENT, bump_version, invalidate_scoreboards
+from .changes import record_change
+from .clock import forget_clock
+from .models import ChangeLogEntry, Field, Match, Player, Team, Tournament
+from .scoreboard import invalidate_tournament_scoreboards
+from .slugs import forget_tournament
+
+
+@receiver([post_save, post_delete], sender=Match)
+def match_changed(sender, instance, **kwargs):
+    bump_version(instance.tournament_id, RESULTS, SCHEDULE)
+
+
+@receiver([post_save, post_delete], sender=Match)
+def match_scoreboard_changed(sender, instance, **kwargs):
+    invalidate_scoreboards({instance.field_id, getattr(instance, '_loaded_field_id', None)})
+
+
+@receiver(post_save, sender=Match)
+def match_saved(sender, instance, **kwargs):
+    record_change(instance.tournament_id, ChangeLogEntry.MATCH, instance.pk)
+
+
+@receiver(post_delete, sender=Match)
+def match_deleted(sender, instance, **kwargs):
+    forget_clock(instance.pk)
+    record_change(instance.tournament_id, ChangeLogEntry.MATCH, instance.pk, deleted=True)
+
+
+@receiver([post_save, post_delete], sender=Team)
+def team_changed(sender, instance, **kwargs):
+    bump_version(instance.tournament_id, RESULTS, SCHEDULE)
+    invalidate_tournament_scoreboards(instance.tournament_id)
+    record_change(
+        instance.tournament_id, ChangeLogEntry.TEAM, instance.pk,
+        deleted=kwargs['signal'] is post_delete,
+    )
+    if getattr(instance, '_loaded_name', instance.name) != instance.name:
+        # the schedule shows team names on every match
+        record_change(instance.tournament_id, ChangeLogEntry.SCHEDULE, 0)
+        instance._loaded_name = instance.name
+
+
+@receiver(post_save, sender=Player)
+def player_changed(sender, instance, **kwargs):
+    bump_version(instance.team.tournament_id, RESULTS)
+
+
+@receiver([post_save, post_delete], sender=Field)
+def field_changed(sender, instance, **kwargs):
+    bump_version(instance.tournament_id, SCHEDULE)
+    invalidate_scoreboards([instance.pk])
+    record_change(instance.tournament_id, ChangeLogEntry.SCHEDULE, 0)
+
+
+@receiver(post_save, sender=Tournament)
+def tournament_changed(sender, instance, **kwargs):
+    bump_version(instance.pk, RESULTS, SCHEDULE, TOURNAMENT)
+    invalidate_tournament_scoreboards(instance.pk)
+    forget_tournament(instance.pk)
+
+
+@receiver(post_delete, sender=Tournament)
+def tournament_deleted(sender, instance, **kwargs):
+    bump_version(instance.pk, TOURNAMENT)
+    forget_tournament(instance.pk)
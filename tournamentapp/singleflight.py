@@ -0,0 +1,97 @@
+"""
+Single-flight filling of cache misses.
+
+When results change, every spectator's next poll misses the cache at the
+same moment. Only one request rebuilds the payload: within a process the
+first miss leads and the others wait for it, and across worker processes
+the leader also has to win a short cache lease. While someone else is
+rebuilding, readers get the previous payload (stale-while-revalidate)
+when there is one, and otherwise wait for the new one to be cached.
+
+A reader never waits longer than `WAIT_SECONDS`; after that it builds
+the payload itself, so a crashed or stuck leader can't stall the API.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+from .routers import cache_timeout
+
+LEASE_SECONDS = 30
+WAIT_SECONDS = 5
+POLL_SECONDS = 0.05
+STALE_TIMEOUT = 24 * 60 * 60
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def single_flight(key, builder, timeout, stale_key=None):
+    """
+    The value cached under `key`, calling `builder()` at most once at a
+    time across processes to fill it. With `stale_key`, every value is
+    also kept there and returned to readers while a rebuild is running.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        stale = _stale(stale_key)
+        if stale is not None:
+            return stale
+        flight.done.wait(WAIT_SECONDS)
+        value = cache.get(key)
+        return value if value is not None else builder()
+
+    try:
+        return _lead(key, builder, timeout, stale_key)
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def _lead(key, builder, timeout, stale_key):
+    lease = f"{key}:lease"
+    if not cache.add(lease, True, LEASE_SECONDS):
+        # another worker is rebuilding
+        stale = _stale(stale_key)
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(POLL_SECONDS)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        return _store(key, builder(), timeout, stale_key)
+
+    try:
+        # filled between our miss and the lease
+        value = cache.get(key)
+        if value is not None:
+            return value
+        return _store(key, builder(), timeout, stale_key)
+    finally:
+        cache.delete(lease)
+
+
+def _stale(stale_key):
+    return cache.get(stale_key) if stale_key else None
+
+
+def _store(key, value, timeout, stale_key):
+    cache.set(key, value, cache_timeout(timeout))
+    if stale_key:
+        cache.set(stale_key, value, STALE_TIMEOUT)
+    return value
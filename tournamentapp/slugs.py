@@ -0,0 +1,140 @@
+"""
+Slug resolution for the public API.
+
+Every public request starts from a tournament slug, and most of them are
+answered from the cache, so fetching the `Tournament` row was often the
+only query left. `resolve_tournament` maps a slug, case-insensitively,
+to the tournament, keeping the rows it loaded in a per-process LRU. Each
+call gets an instance of its own, built from the cached row.
+
+An entry remembers the `tournament` cache version it was loaded at.
+`Tournament.save` (and every other change to the row) bumps that
+version, so a hit costs one cache read. Because the version lives in the
+shared cache (see `CACHES` in settings), other worker processes notice
+the change on their next request; the saving process also drops its
+entries right away. Entries are reloaded after `SLUG_CACHE_TTL` seconds
+whatever the version says, so a bump that was lost with an evicted or
+flushed cache can't keep an old row, with its visibility flags, for
+longer than that. Rows are read from the primary through the
+`Lower('slug')` index, so a lagging replica can't put an old row in the
+LRU.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.functions import Lower
+
+from .cache import TOURNAMENT, aget_versions, get_versions
+from .models import Tournament
+
+SLUG_CACHE_SIZE = 1024
+SLUG_CACHE_TTL = 60
+
+# an entry loaded before its id was known; checked again on the next hit
+UNVERIFIED = object()
+
+
+class _LRU:
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_tournament(self, tournament_id):
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[0] == tournament_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_rows = _LRU(SLUG_CACHE_SIZE)
+
+
+def _field_names():
+    return [field.attname for field in Tournament._meta.concrete_fields]
+
+
+def _instance(values):
+    return Tournament.from_db(DEFAULT_DB_ALIAS, _field_names(), values)
+
+
+def _load(key, tournament_id=None):
+    """Load the row of `key` and cache it at the version read beforehand."""
+    # A version read after the row could belong to a save committed in
+    # between, which would keep the old row cached for good. Without the
+    # id the version can't be read first, so such an entry is unverified
+    # and reloaded on its next use, this time with the version first.
+    version = UNVERIFIED
+    if tournament_id is not None:
+        version, = get_versions(tournament_id, [TOURNAMENT])
+    values = (
+        Tournament.objects
+        .using(DEFAULT_DB_ALIAS)
+        .alias(slug_lower=Lower('slug'))
+        .filter(slug_lower=key)
+        .values_list(*_field_names())
+        .first()
+    )
+    if values is None:
+        _rows.discard(key)
+        return None
+    if values[0] != tournament_id:
+        version = UNVERIFIED
+    _rows.put(key, (values[0], values, version, time.monotonic() + SLUG_CACHE_TTL))
+    return _instance(values)
+
+
+def _fresh(entry):
+    return entry[2] is not UNVERIFIED and entry[3] > time.monotonic()
+
+
+def resolve_tournament(slug):
+    """The tournament with `slug` (any case), or None."""
+    key = slug.lower()
+    entry = _rows.get(key)
+    if entry is None:
+        return _load(key)
+    tournament_id, values, version, _ = entry
+    if _fresh(entry) and get_versions(tournament_id, [TOURNAMENT]) == [version]:
+        return _instance(values)
+    return _load(key, tournament_id)
+
+
+async def aresolve_tournament(slug):
+    key = slug.lower()
+    entry = _rows.get(key)
+    if entry is None:
+        return await sync_to_async(_load)(key)
+    tournament_id, values, version, _ = entry
+    if _fresh(entry) and await aget_versions(tournament_id, [TOURNAMENT]) == [version]:
+        return _instance(values)
+    return await sync_to_async(_load)(key, tournament_id)
+
+
+def forget_tournament(tournament_id):
+    """Drop this process's entries for a tournament."""
+    _rows.discard_tournament(tournament_id)
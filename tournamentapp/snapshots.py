@@ -0,0 +1,143 @@
+"""
+Static snapshots of finished tournaments.
+
+A finished tournament's public data no longer changes, so when it is
+marked finished every public API payload is rendered once into an
+immutable JSON file in the `snapshots` storage (the Azure container in
+production, any Django storage elsewhere). The SPA then reads those
+files directly and the public API redirects to them. Each publish goes
+under a new version prefix, so cached copies of an older snapshot are
+never served as current; reopening the tournament deletes the files.
+The prefix is stored with the snapshot, so renaming the tournament
+doesn't lose track of its files.
+
+Publishing runs on the `snapshots` job queue, off the request. Results
+can still be corrected after the finish, so the cache warming that
+follows every result-changing write republishes finished tournaments.
+"""
+import logging
+import secrets
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.http import HttpResponseRedirect
+from django.utils import timezone
+
+from .cache import TOURNAMENT, bump_version
+from .jobs import enqueue, job
+from .models import Tournament
+
+logger = logging.getLogger(__name__)
+
+STORAGE_ALIAS = 'snapshots'
+
+
+def _storage():
+    return storages[STORAGE_ALIAS]
+
+
+def _path(snapshot, name):
+    return f"{snapshot['prefix']}/{name}.json"
+
+
+def snapshot_payloads(tournament):
+    """`{file name: payload}` for every section the tournament makes public."""
+    # imported here: the API modules import this one
+    from announcements.api.serializers import AnnouncementSerializer
+    from programme.api.serializers import SideEventSerializer
+    from vendors.api.serializers import VendorSerializer
+    from .api.serializers import TournamentMetaSerializer
+    from .api.views import LeaderboardAPIView, ScheduleAPIView
+    from .utils import build_crosstable
+
+    payloads = {
+        'meta': TournamentMetaSerializer(tournament).data,
+        'schedule': ScheduleAPIView.build(tournament),
+    }
+    if tournament.show_leaderboard:
+        payloads['leaderboard'] = LeaderboardAPIView.build(tournament)
+        payloads['crosstable'] = build_crosstable(tournament)
+    if tournament.show_vendors:
+        payloads['vendors'] = VendorSerializer(
+            tournament.vendors.filter(is_active=True), many=True
+        ).data
+    if tournament.show_side_events:
+        payloads['side-events'] = SideEventSerializer(
+            tournament.side_events.filter(is_active=True), many=True
+        ).data
+    if tournament.show_announcements:
+        payloads['announcements'] = AnnouncementSerializer(
+            tournament.announcements.filter(is_active=True), many=True
+        ).data
+    return payloads
+
+
+def publish_snapshot(tournament):
+    """Write a new snapshot of `tournament` and make it the current one."""
+    from .api.renderers import FastJSONRenderer
+
+    storage = _storage()
+    version = timezone.now().strftime('%Y%m%d%H%M%S') + secrets.token_hex(4)
+    snapshot = {'version': version, 'prefix': f"tournaments/{tournament.slug}/{version}", 'files': []}
+    for name, payload in snapshot_payloads(tournament).items():
+        storage.save(_path(snapshot, name), ContentFile(FastJSONRenderer().render(payload)))
+        snapshot['files'].append(name)
+
+    previous = Tournament.objects.filter(pk=tournament.pk).values_list('snapshot', flat=True).first()
+    Tournament.objects.filter(pk=tournament.pk).update(snapshot=snapshot)
+    bump_version(tournament.pk, TOURNAMENT)
+    tournament.snapshot = snapshot
+    if previous:
+        _delete_files(tournament, previous)
+
+
+def unpublish_snapshot(tournament):
+    """Stop serving the snapshot and delete its files."""
+    previous = Tournament.objects.filter(pk=tournament.pk).values_list('snapshot', flat=True).first()
+    Tournament.objects.filter(pk=tournament.pk).update(snapshot=None)
+    bump_version(tournament.pk, TOURNAMENT)
+    tournament.snapshot = None
+    if previous:
+        _delete_files(tournament, previous)
+
+
+def _delete_files(tournament, snapshot):
+    storage = _storage()
+    for name in snapshot['files']:
+        try:
+            storage.delete(_path(snapshot, name))
+        except Exception:
+            logger.exception("Could not delete snapshot file %s of %s", name, tournament.slug)
+
+
+def schedule_snapshot_sync(tournament_id):
+    """Publish or unpublish the tournament's snapshot after the current commit."""
+    enqueue(sync_snapshot, tournament_id, dedupe_key=f"tournament:{tournament_id}:snapshot")
+
+
+@job(queue='snapshots')
+def sync_snapshot(tournament_id):
+    """Publish or unpublish to match the tournament's current `is_finished`."""
+    tournament = Tournament.objects.filter(pk=tournament_id).first()
+    if tournament is None:
+        return
+    if tournament.is_finished:
+        publish_snapshot(tournament)
+    else:
+        unpublish_snapshot(tournament)
+
+
+def snapshot_base_url(tournament):
+    """URL prefix of the current snapshot's files, or None."""
+    if not (tournament.is_finished and tournament.snapshot):
+        return None
+    url = _storage().url(_path(tournament.snapshot, 'meta'))
+    return url[:url.rindex('/meta.json')]
+
+
+def snapshot_redirect(tournament, name):
+    """A redirect to the published file `name`, if there is one."""
+    snapshot = tournament.snapshot
+    if not (tournament.is_finished and snapshot) or name not in snapshot['files']:
+        return None
+    return HttpResponseRedirect(_storage().url(_path(snapshot, name)))
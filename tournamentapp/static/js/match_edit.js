@@ -152,6 +152,75 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   });
 
+  // -------------------------
+  // Match clock
+  // -------------------------
+  const clockBox = document.getElementById("match-clock");
+  const stateLabels = {
+    pending: "Not started",
+    running: "",
+    paused: "Paused",
+    half_time: "Half-time",
+    finished: "Full-time",
+  };
+  let clock = null;
+  let clockOffset = 0; // server time - local time, in seconds
+
+  function clockMinute() {
+    if (!clock || clock.state === "pending") return 0;
+    let seconds = clock.elapsed_seconds;
+    if (clock.running_since !== null) {
+      seconds += Math.max(Date.now() / 1000 + clockOffset - clock.running_since, 0);
+    }
+    return (clock.period - 1) * clock.period_minutes + Math.floor(seconds / 60) + 1;
+  }
+
+  function renderClock() {
+    if (!clockBox || !clock) return;
+    clockBox.querySelector(".clock-minute").textContent = `${clockMinute()}'`;
+    clockBox.querySelector(".clock-state").textContent = stateLabels[clock.state] || "";
+  }
+
+  function loadClock() {
+    fetch(clockBox.dataset.stateUrl)
+      .then((res) => res.json())
+      .then((data) => {
+        clockOffset = data.server_time - Date.now() / 1000;
+        clock = data;
+        renderClock();
+      })
+      .catch((err) => console.error("❌ Error loading clock:", err));
+  }
+
+  if (clockBox) {
+    loadClock();
+    setInterval(renderClock, 1000);
+
+    clockBox.addEventListener("click", function (e) {
+      const button = e.target.closest(".clock-action");
+      if (!button) return;
+
+      fetch(clockBox.dataset.actionUrl, {
+        method: "POST",
+        headers: {
+          "X-CSRFToken": getCSRFToken(),
+          "Content-Type": "application/x-www-form-urlencoded",
+        },
+        body: new URLSearchParams({ action: button.dataset.action }),
+      })
+        .then((res) => res.json())
+        .then((data) => {
+          if (data.success) {
+            clock = data.clock;
+            renderClock();
+          } else {
+            alert(data.error || "Could not change the clock.");
+          }
+        })
+        .catch((err) => console.error("❌ Error changing clock:", err));
+    });
+  }
+
   // Init forms
   setupPlayerForm("home-player-form", "home-player-list", "home");
   setupPlayerForm("away-player-form", "away-player-list", "away");
@@ -0,0 +1,73 @@
+document.addEventListener("DOMContentLoaded", function () {
+  const board = document.getElementById("scoreboard");
+  const POLL_MS = 5000;
+  const stateLabels = {
+    pending: "Kick-off soon",
+    running: "",
+    paused: "Paused",
+    half_time: "Half-time",
+    finished: "Full-time",
+  };
+  let data = null;
+  let clockOffset = 0; // server time - local time, in seconds
+
+  function text(selector, value) {
+    board.querySelector(selector).textContent = value;
+  }
+
+  function clockMinute(clock) {
+    if (clock.state === "pending") return 0;
+    let seconds = clock.elapsed_seconds;
+    if (clock.running_since !== null) {
+      seconds += Math.max(Date.now() / 1000 + clockOffset - clock.running_since, 0);
+    }
+    return (clock.period - 1) * clock.period_minutes + Math.floor(seconds / 60) + 1;
+  }
+
+  function kickOffTime(iso) {
+    return new Date(iso).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" });
+  }
+
+  function renderClock() {
+    const clock = data && data.clock;
+    const running = clock && clock.state !== "pending";
+    text(".clock-minute", running ? `${clockMinute(clock)}'` : "");
+    text(".clock-state", clock ? stateLabels[clock.state] || "" : "");
+  }
+
+  function render() {
+    const current = data.current_match;
+    board.querySelector(".current-match .teams").hidden = !current;
+    board.querySelector(".clock").hidden = !current;
+    board.querySelector(".no-match").hidden = !!current;
+    if (current) {
+      text(".home-team", current.home_team);
+      text(".away-team", current.away_team);
+      text(".home-score", current.home_score);
+      text(".away-score", current.away_score);
+    }
+
+    const next = data.next_match;
+    board.querySelector(".next-match").hidden = !next;
+    if (next) {
+      text(".next-time", kickOffTime(next.start_time));
+      text(".next-teams", `${next.home_team} vs ${next.away_team}`);
+    }
+    renderClock();
+  }
+
+  function poll() {
+    fetch(board.dataset.url)
+      .then((res) => res.json())
+      .then((payload) => {
+        clockOffset = payload.server_time - Date.now() / 1000;
+        data = payload;
+        render();
+      })
+      .catch((err) => console.error("❌ Error loading scoreboard:", err));
+  }
+
+  poll();
+  setInterval(poll, POLL_MS);
+  setInterval(renderClock, 1000);
+});
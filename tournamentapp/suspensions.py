@@ -0,0 +1,84 @@
+"""
+Suspensions are settled once per match, when it finishes.
+
+Cards still mute a player the moment they are recorded, so a suspended
+player can't score later in the same match. At full time the engine then
+gives every player carded into a ban its length, counts the match as sat
+out for players who were already banned, lifts bans that have been served
+and logs each transition.
+"""
+from django.db.models import Count, Q
+
+from .cache import RESULTS, bump_version
+from .models import Player, SuspensionLog
+
+
+def apply_suspensions(match):
+    """
+    Settle suspensions for both teams of a finished match with one
+    aggregate query, one bulk update and one bulk insert.
+    """
+    tournament = match.tournament
+    threshold = tournament.yellow_cards_for_suspension
+
+    players = Player.objects.filter(
+        team_id__in=[match.home_team_id, match.away_team_id]
+    ).annotate(
+        total_yellows=Count('match_events', filter=Q(match_events__event_type='yellow_card')),
+        total_reds=Count('match_events', filter=Q(match_events__event_type='red_card')),
+        match_yellows=Count('match_events', filter=Q(
+            match_events__event_type='yellow_card', match_events__match=match,
+        )),
+        match_reds=Count('match_events', filter=Q(
+            match_events__event_type='red_card', match_events__match=match,
+        )),
+    )
+
+    changed = []
+    log = []
+    for player in players:
+        unserved_yellows = player.total_yellows - player.yellow_cards_served
+
+        if player.match_reds:
+            ban = ('red_card', tournament.red_suspension_games)
+        elif unserved_yellows >= threshold > unserved_yellows - player.match_yellows:
+            ban = ('yellow_cards', tournament.yellow_suspension_games)
+        else:
+            ban = None
+
+        if ban:
+            reason, games = ban
+            player.is_muted = True
+            player.games_sat_out = 0
+            player.suspension_games = games
+            log.append(SuspensionLog(
+                player=player, match=match, action=SuspensionLog.SUSPENDED,
+                reason=reason, games=games,
+            ))
+        elif player.is_muted:
+            player.games_sat_out += 1
+            log.append(SuspensionLog(
+                player=player, match=match, action=SuspensionLog.SAT_OUT,
+                games=player.games_sat_out,
+            ))
+            if player.suspension_games and player.games_sat_out >= player.suspension_games:
+                player.is_muted = False
+                player.games_sat_out = 0
+                player.suspension_games = 0
+                player.yellow_cards_served = player.total_yellows
+                player.red_cards_served = player.total_reds
+                log.append(SuspensionLog(
+                    player=player, match=match, action=SuspensionLog.SERVED,
+                ))
+        else:
+            continue
+        changed.append(player)
+
+    if changed:
+        Player.objects.bulk_update(changed, [
+            'is_muted', 'games_sat_out', 'suspension_games',
+            'yellow_cards_served', 'red_cards_served',
+        ])
+        SuspensionLog.objects.bulk_create(log)
+        bump_version(tournament.pk, RESULTS)
+    return log
@@ -0,0 +1,119 @@
+"""
+Helpers for asserting that a view's query count does not scale with the
+amount of data it renders (i.e. that it has no N+1 query patterns).
+
+Typical use:
+
+    def build(size):
+        world = build_world(size)
+        return lambda: client.get(url_for(world))
+
+    assert_constant_queries(build)
+
+`build(size)` sets up a data set of the given size and returns a callable
+that issues the request. The request is sent once to warm up per-process
+caches (content types, sites, sessions), the cache is cleared, and the
+second request is measured. If the counts differ between sizes, the SQL
+statements whose frequency grew are reported with the stack that ran them.
+"""
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+DEFAULT_SIZES = (3, 6)
+
+_PROJECT_ROOT = str(Path(settings.BASE_DIR))
+_TESTS_DIR = str(Path(__file__).resolve().parent)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_IN_LIST = re.compile(r"IN \([^)]*\)")
+
+
+class QueryScalingError(AssertionError):
+    pass
+
+
+class CapturedQuery:
+    def __init__(self, sql, stack):
+        self.sql = sql
+        self.stack = stack
+
+    @property
+    def shape(self):
+        """SQL with literals and IN-lists collapsed, used to group queries."""
+        return _IN_LIST.sub("IN (...)", _LITERAL.sub("?", self.sql))
+
+
+@contextmanager
+def capture_queries():
+    """
+    Record every query executed on the default connection together with
+    the project frames of the stack that issued it.
+    """
+    captured = []
+
+    def wrapper(execute, sql, params, many, context):
+        stack = [
+            frame for frame in traceback.extract_stack()[:-1]
+            if frame.filename.startswith(_PROJECT_ROOT)
+            and not frame.filename.startswith(_TESTS_DIR)
+            and "site-packages" not in frame.filename
+        ]
+        captured.append(CapturedQuery(sql, stack))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield captured
+
+
+def measure(request, warm_up=True):
+    if warm_up:
+        request()
+    cache.clear()
+    with capture_queries() as captured:
+        request()
+    return captured
+
+
+def assert_constant_queries(build, sizes=DEFAULT_SIZES, tolerance=0, warm_up=True):
+    """
+    Fail if the number of queries issued by the request built by `build`
+    differs by more than `tolerance` between the given data sizes.
+
+    Pass `warm_up=False` for requests that can only succeed once per data
+    set (deletes, resets).
+    """
+    runs = [(size, measure(build(size), warm_up)) for size in sizes]
+
+    baseline_size, baseline = runs[0]
+    for size, captured in runs[1:]:
+        if abs(len(captured) - len(baseline)) > tolerance:
+            raise QueryScalingError(
+                _report(baseline_size, baseline, size, captured)
+            )
+
+
+def _report(small_size, small, large_size, large):
+    small_shapes = Counter(q.shape for q in small)
+    large_shapes = Counter(q.shape for q in large)
+
+    lines = [
+        f"Query count scales with data size: {len(small)} queries at "
+        f"size {small_size}, {len(large)} at size {large_size}.",
+    ]
+    for shape, count in large_shapes.items():
+        if count == small_shapes[shape]:
+            continue
+        example = next(q for q in large if q.shape == shape)
+        lines.append("")
+        lines.append(f"{small_shapes[shape]} -> {count} x {example.sql}")
+        lines.extend(
+            "    " + line.rstrip()
+            for line in traceback.format_list(example.stack)
+        )
+    return "\n".join(lines)
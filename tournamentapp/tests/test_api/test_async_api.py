@@ -0,0 +1,93 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, override_settings
+from django.urls import resolve, reverse
+
+from tournamentapp.api.base import PublicAPIView
+
+PUBLIC_URLS = [
+    ('api-tournament-meta', {}),
+    ('api-schedule', {}),
+    ('api-leaderboard', {}),
+    ('api-scorers', {}),
+    ('api-crosstable', {}),
+    ('api-projection', {}),
+    ('api-changes', {}),
+    ('api-vendors', {}),
+    ('api-side-events', {}),
+    ('api-announcements', {}),
+    ('api-match-clock', {'match_id': 1}),
+    ('api-field-scoreboard', {'field_id': 1}),
+]
+
+
+def _get(path, **headers):
+    return async_to_sync(AsyncClient().get)(path, headers=headers)
+
+
+@pytest.mark.parametrize('url_name, kwargs', PUBLIC_URLS)
+def test_public_endpoints_are_async(url_name, kwargs):
+    view = resolve(reverse(url_name, kwargs={'slug': 'cup', **kwargs})).func
+    assert issubclass(view.view_class, PublicAPIView)
+    assert view.view_class.view_is_async
+
+
+def test_organiser_views_stay_sync():
+    view = resolve(reverse('tournament-detail', kwargs={'pk': 1})).func
+    assert not getattr(view.view_class, 'view_is_async', False)
+
+
+@override_settings(DEBUG=True)
+def test_middleware_runs_on_the_event_loop(caplog):
+    # a sync-only middleware makes Django run the rest of the chain, async
+    # views included, in a thread for every request (logged under DEBUG)
+    caplog.set_level(logging.DEBUG, logger='django.request')
+    ASGIHandler()
+    assert 'adapted for middleware' not in caplog.text
+
+
+@override_settings(STATIC_URL='/static/', WHITENOISE_USE_FINDERS=True, WHITENOISE_AUTOREFRESH=True)
+def test_static_files_over_asgi():
+    response = _get('/static/css/components/forms.css')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/css')
+
+
+@pytest.mark.django_db
+def test_schedule_over_asgi(tournament, match):
+    response = _get(reverse('api-schedule', kwargs={'slug': tournament.slug}))
+
+    assert response.status_code == 200
+    assert response.json()['timeline'][0]['matches'][0]['id'] == match.pk
+
+
+@pytest.mark.django_db
+def test_not_found_is_json(tournament):
+    missing = _get(reverse('api-leaderboard', kwargs={'slug': 'no-such-cup'}))
+    assert missing.status_code == 404
+    assert missing.json() == {'detail': 'Not found.'}
+
+    tournament.show_vendors = False
+    tournament.save()
+    hidden = _get(reverse('api-vendors', kwargs={'slug': tournament.slug}))
+    assert hidden.status_code == 404
+    assert hidden.json() == {'detail': 'Vendors are not public for this tournament.'}
+
+
+@pytest.mark.django_db
+def test_only_get_allowed(tournament):
+    response = async_to_sync(AsyncClient().post)(
+        reverse('api-schedule', kwargs={'slug': tournament.slug})
+    )
+    assert response.status_code == 405
+
+
+@pytest.mark.django_db
+def test_async_requests_are_instrumented(tournament):
+    response = _get(reverse('api-changes', kwargs={'slug': tournament.slug}))
+
+    assert response.status_code == 200
+    assert '"2 queries"' in response['Server-Timing']
@@ -0,0 +1,215 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from announcements.models import Announcement
+from tournamentapp.changes import record_change
+from tournamentapp.models import ChangeLogEntry, Match, MatchEvent, Player, Team
+from tournamentapp.services import record_event_batch
+from vendors.models import Vendor
+
+
+@pytest.fixture
+def sync(client, django_capture_on_commit_callbacks):
+    """Make a change with on-commit hooks run, then fetch the delta."""
+    def changes(tournament, since=0):
+        return client.get(f'/api/tournaments/{tournament.slug}/changes/', {'since': since}).json()
+
+    def commit(change):
+        # a transaction of its own, like a request's
+        with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+            change()
+
+    changes.commit = commit
+    return changes
+
+
+@pytest.mark.django_db
+def test_only_changes_after_cursor_returned(sync, tournament, match):
+    cursor = sync(tournament)['cursor']
+
+    def score():
+        match.home_score = 2
+        match.save()
+    sync.commit(score)
+
+    data = sync(tournament, cursor)
+    assert [m['id'] for m in data['matches']] == [match.pk]
+    assert data['matches'][0]['home_score'] == 2
+    assert data['matches'][0]['field'] == "Main Field"
+    assert data['cursor'] > cursor
+
+    again = sync(tournament, data['cursor'])
+    assert again['matches'] == [] and again['cursor'] == data['cursor']
+
+
+@pytest.mark.django_db
+def test_each_entity_keeps_one_entry(sync, tournament, match):
+    for score in range(3):
+        match.home_score = score
+        sync.commit(match.save)
+
+    assert ChangeLogEntry.objects.filter(entity=ChangeLogEntry.MATCH, entity_id=match.pk).count() == 1
+
+
+@pytest.mark.django_db
+def test_deleted_match_and_standings_reported(sync, tournament, match):
+    cursor = sync(tournament)['cursor']
+
+    sync.commit(match.apply_result)
+    data = sync(tournament, cursor)
+    standings = data['standings']
+    assert {team['team_id'] for team in standings['teams']} == {match.home_team_id, match.away_team_id}
+    assert len(standings['order']) == 2
+
+    cursor, match_id = data['cursor'], match.pk
+    sync.commit(match.delete)
+    data = sync(tournament, cursor)
+    assert data['deleted_matches'] == [match_id]
+
+
+@pytest.mark.django_db
+def test_match_events_reported_with_top_scorers(sync, tournament, match):
+    player = Player.objects.create(name="Striker", team=match.home_team)
+    cursor = sync(tournament)['cursor']
+
+    def goal():
+        return MatchEvent.objects.create(match=match, team=player.team, player=player, event_type='goal')
+    sync.commit(goal)
+    data = sync(tournament, cursor)
+    assert [m['id'] for m in data['matches']] == [match.pk]
+    assert [s['player_name'] for s in data['standings']['top_scorers']] == ["Striker"]
+
+    cursor = data['cursor']
+    sync.commit(lambda: record_event_batch(match, [
+        {'key': 'k1', 'event_type': 'goal', 'team_id': player.team_id, 'player_id': player.pk},
+    ]))
+    data = sync(tournament, cursor)
+    assert [m['id'] for m in data['matches']] == [match.pk]
+    assert data['standings']['top_scorers'][0]['goals'] == 2
+
+    cursor = data['cursor']
+    def remove():
+        for event in MatchEvent.objects.filter(player=player):
+            event.delete()
+    sync.commit(remove)
+    data = sync(tournament, cursor)
+    assert [m['id'] for m in data['matches']] == [match.pk]
+    assert data['standings']['top_scorers'] == []
+
+
+@pytest.mark.django_db
+def test_announcements_and_vendors_in_delta(sync, tournament):
+    now = timezone.now()
+
+    def create():
+        Announcement.objects.create(
+            tournament=tournament, message="Lunch is served",
+            starts_at=now, ends_at=now + timedelta(hours=1),
+        )
+        Vendor.objects.create(tournament=tournament, name="Coffee", is_active=False)
+    sync.commit(create)
+
+    data = sync(tournament)
+    assert [a['message'] for a in data['announcements']] == ["Lunch is served"]
+    assert data['vendors'] == []
+    assert data['deleted_vendors'] == [Vendor.objects.get().pk]
+
+
+@pytest.mark.django_db
+def test_bulk_reschedule_and_rename_flag_schedule(sync, tournament, match):
+    cursor = sync(tournament)['cursor']
+
+    team = Team.objects.get(pk=match.home_team_id)
+    team.tournament_points = 3
+    sync.commit(team.save)
+    assert sync(tournament, cursor)['schedule_changed'] is False
+
+    team.name = "Renamed"
+    sync.commit(team.save)
+    assert sync(tournament, cursor)['schedule_changed'] is True
+
+
+@pytest.mark.django_db
+def test_rolled_back_changes_not_logged(sync, tournament, match):
+    from django.db import transaction
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            match.home_score = 5
+            match.save()
+            raise RuntimeError
+
+    match.home_score = 1
+    sync.commit(match.save)
+    assert ChangeLogEntry.objects.filter(entity=ChangeLogEntry.MATCH).count() == 1
+
+
+def _record(tournament, ids, deleted=False):
+    for entity_id in ids:
+        record_change(tournament.pk, ChangeLogEntry.MATCH, entity_id, deleted)
+
+
+@pytest.mark.django_db
+def test_changes_of_a_transaction_are_written_together(tournament, django_capture_on_commit_callbacks):
+    def write(ids):
+        with django_capture_on_commit_callbacks() as callbacks:
+            with transaction.atomic():
+                _record(tournament, ids)
+        assert len(callbacks) == 1
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        return len(queries)
+
+    assert write(range(1, 3)) == write(range(10, 20))
+    assert ChangeLogEntry.objects.count() == 12
+
+
+@pytest.mark.django_db
+def test_changes_of_rolled_back_savepoints_are_dropped(tournament, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            _record(tournament, [1, 2])
+            with pytest.raises(RuntimeError), transaction.atomic():
+                _record(tournament, [3])
+                raise RuntimeError
+            with transaction.atomic():
+                _record(tournament, [2], deleted=True)
+            _record(tournament, [4])
+
+    assert dict(ChangeLogEntry.objects.values_list('entity_id', 'deleted')) == {
+        1: False, 2: True, 4: False,
+    }
+
+
+@pytest.mark.django_db
+def test_compaction_forces_reset_for_old_cursors(sync, tournament, match):
+    sync.commit(match.delete)
+    ChangeLogEntry.objects.update(changed_at=timezone.now() - timedelta(days=2))
+
+    call_command('compact_change_log')
+
+    assert not ChangeLogEntry.objects.exists()
+    assert sync(tournament, 0)['reset'] is True
+    tournament.refresh_from_db()
+    assert sync(tournament, tournament.changes_floor)['reset'] is False
+
+
+@pytest.mark.django_db
+def test_cursor_without_since(sync, client, tournament, match):
+    sync.commit(match.save)
+
+    data = client.get(f'/api/tournaments/{tournament.slug}/changes/').json()
+
+    assert data == {'cursor': ChangeLogEntry.objects.get().pk, 'reset': True}
+
+
+@pytest.mark.django_db
+def test_invalid_cursor(client, tournament):
+    response = client.get(f'/api/tournaments/{tournament.slug}/changes/', {'since': 'abc'})
+    assert response.status_code == 400
@@ -0,0 +1,110 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import combinations
+
+import brotli
+import pytest
+
+from django.core.cache import cache
+
+from tournamentapp import singleflight
+from tournamentapp.api import responses
+from tournamentapp.api.responses import choose_encoding
+from tournamentapp.cache import RESULTS, SCHEDULE, payload_key
+from tournamentapp.timeline import TIMELINE_SCOPES
+from tournamentapp.models import Match, Team
+
+
+@pytest.fixture
+def schedule_url(tournament, field):
+    teams = [Team.objects.create(name=f"Team {i:02d}", tournament=tournament) for i in range(8)]
+    start = datetime(2026, 6, 1, 8, 0, tzinfo=dt_timezone.utc)
+    for i, (home, away) in enumerate(combinations(teams, 2)):
+        Match.objects.create(
+            tournament=tournament, home_team=home, away_team=away, field=field,
+            start_time=start + timedelta(minutes=20 * i),
+        )
+    return f'/api/tournaments/{tournament.slug}/schedule/'
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0, gzip;q=0.5', 'gzip'),
+    ('*', 'br'),
+    ('', 'identity'),
+    ('deflate', 'identity'),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, {'identity': b'', 'gzip': b'', 'br': b''}) == expected
+
+
+@pytest.mark.django_db
+def test_encodings_served_from_cache(client, schedule_url, monkeypatch):
+    plain = client.get(schedule_url)
+    assert 'Content-Encoding' not in plain
+    assert 'Accept-Encoding' in plain['Vary']
+
+    def fail(*args, **kwargs):
+        raise AssertionError("compressed on the request path")
+    monkeypatch.setattr(responses.gzip, 'compress', fail)
+    monkeypatch.setattr(responses.brotli, 'compress', fail)
+
+    gzipped = client.get(schedule_url, HTTP_ACCEPT_ENCODING='gzip')
+    assert gzipped['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped.content) == plain.content
+    assert len(gzipped.content) < len(plain.content)
+
+    brotlied = client.get(schedule_url, HTTP_ACCEPT_ENCODING='gzip, br')
+    assert brotlied['Content-Encoding'] == 'br'
+    assert brotli.decompress(brotlied.content) == plain.content
+
+
+@pytest.mark.django_db
+def test_new_version_reencoded(client, schedule_url, tournament):
+    before = client.get(schedule_url, HTTP_ACCEPT_ENCODING='gzip')
+
+    match = tournament.matches.first()
+    match.home_score = 4
+    match.save()
+
+    after = client.get(schedule_url, HTTP_ACCEPT_ENCODING='gzip')
+    assert after['ETag'] != before['ETag']
+    first = json.loads(gzip.decompress(after.content))['timeline'][0]['matches'][0]
+    assert first['home_score'] == 4
+
+
+@pytest.mark.django_db
+def test_not_modified_for_current_etag(client, schedule_url):
+    etag = client.get(schedule_url)['ETag']
+
+    response = client.get(schedule_url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b''
+
+
+@pytest.mark.django_db
+def test_small_payload_not_compressed(client, tournament):
+    response = client.get(f'/api/tournaments/{tournament.slug}/leaderboard/', HTTP_ACCEPT_ENCODING='gzip, br')
+
+    assert 'Content-Encoding' not in response
+    assert response.json() == {'standings': [], 'top_scorers': []}
+
+
+@pytest.mark.django_db
+def test_body_not_encoded_from_a_stale_inner_payload(client, schedule_url, tournament, monkeypatch):
+    monkeypatch.setattr(singleflight, 'WAIT_SECONDS', 0.1)
+    client.get(schedule_url)
+
+    match = tournament.matches.first()
+    match.home_score = 4
+    match.save()
+    # another worker is rebuilding the timeline for the new version
+    cache.add(payload_key('timeline', tournament.pk, TIMELINE_SCOPES) + ':lease', True)
+
+    data = client.get(schedule_url).json()
+
+    assert data['timeline'][0]['matches'][0]['home_score'] == 4
+    assert cache.get(payload_key('schedule', tournament.pk, [SCHEDULE, RESULTS]) + ':encoded')
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tournamentapp.models import Match, Team
+
+
+def _finish(match, home_score, away_score):
+    match.home_score = home_score
+    match.away_score = away_score
+    match.is_finished = True
+    match.save()
+
+
+@pytest.mark.django_db
+def test_crosstable_scores_from_row_team_side(client, tournament, match):
+    third = Team.objects.create(name="Team C", tournament=tournament)
+    Match.objects.create(
+        tournament=tournament, home_team=match.away_team, away_team=third,
+        field=match.field, start_time=timezone.now(),
+    )
+    _finish(match, 2, 1)
+
+    data = client.get(f'/api/tournaments/{tournament.slug}/crosstable/').json()
+
+    assert data['teams'] == ["Team A", "Team B", "Team C"]
+    assert data['matrix'] == [
+        [None, "2-1", None],
+        ["1-2", None, None],
+        [None, None, None],
+    ]
+
+
+@pytest.mark.django_db
+def test_crosstable_joins_repeat_meetings(client, tournament, match):
+    _finish(match, 1, 0)
+    rematch = Match.objects.create(
+        tournament=tournament, home_team=match.away_team, away_team=match.home_team,
+        field=match.field, start_time=match.start_time + timedelta(hours=1),
+    )
+    _finish(rematch, 3, 3)
+
+    data = client.get(f'/api/tournaments/{tournament.slug}/crosstable/').json()
+
+    assert data['matrix'][0][1] == "1-0, 3-3"
+    assert data['matrix'][1][0] == "0-1, 3-3"
+
+
+@pytest.mark.django_db
+def test_crosstable_rebuilt_after_result_changes(client, tournament, match):
+    url = f'/api/tournaments/{tournament.slug}/crosstable/'
+    assert client.get(url).json()['matrix'][0][1] is None
+
+    _finish(match, 4, 0)
+
+    assert client.get(url).json()['matrix'][0][1] == "4-0"
+
+
+@pytest.mark.django_db
+def test_crosstable_404_when_leaderboard_hidden(client, tournament):
+    tournament.show_leaderboard = False
+    tournament.save()
+
+    response = client.get(f'/api/tournaments/{tournament.slug}/crosstable/')
+    assert response.status_code == 404
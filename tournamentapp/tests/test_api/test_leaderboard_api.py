@@ -79,4 +79,50 @@ def test_leaderboard_no_auth_required(client, tournament):
 def test_leaderboard_404_for_unknown_slug(client):
     url = '/api/tournaments/nonexistent/leaderboard/'
     response = client.get(url)
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def _play(tournament, field, home, away, home_score, away_score, hours):
+    return Match.objects.create(
+        tournament=tournament, home_team=home, away_team=away, field=field,
+        start_time=timezone.now() + timedelta(hours=hours),
+        home_score=home_score, away_score=away_score, is_finished=True,
+    )
+
+
+@pytest.mark.django_db
+def test_leaderboard_form_and_streaks(client, tournament, field, team):
+    away = Team.objects.create(name="Away", tournament=tournament)
+    results = [(0, 1), (2, 0), (1, 1), (3, 0), (1, 0), (2, 1)]
+    for hours, (home_score, away_score) in enumerate(results):
+        _play(tournament, field, team, away, home_score, away_score, hours)
+
+    data = client.get(f'/api/tournaments/{tournament.slug}/leaderboard/').json()
+    standings = {s['team_name']: s for s in data['standings']}
+
+    assert standings[team.name]['form'] == "WDWWW"
+    assert standings[team.name]['win_streak'] == 3
+    assert standings[team.name]['unbeaten_streak'] == 5
+    assert standings["Away"]['form'] == "LDLLL"
+    assert standings["Away"]['win_streak'] == 0
+    assert standings["Away"]['unbeaten_streak'] == 0
+
+
+@pytest.mark.django_db
+def test_leaderboard_form_empty_before_first_match(client, tournament, team):
+    data = client.get(f'/api/tournaments/{tournament.slug}/leaderboard/').json()
+
+    entry = data['standings'][0]
+    assert entry['form'] == ""
+    assert entry['wins'] == entry['win_streak'] == entry['unbeaten_streak'] == 0
+
+
+@pytest.mark.django_db
+def test_leaderboard_cache_refreshed_after_result(client, tournament, field, team):
+    away = Team.objects.create(name="Away", tournament=tournament)
+    url = f'/api/tournaments/{tournament.slug}/leaderboard/'
+    assert client.get(url).json()['standings'][0]['form'] == ""
+
+    _play(tournament, field, team, away, 1, 0, 0)
+
+    standings = {s['team_name']: s for s in client.get(url).json()['standings']}
+    assert standings[team.name]['form'] == "W"
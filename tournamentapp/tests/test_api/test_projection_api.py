@@ -0,0 +1,56 @@
+import pytest
+from django.test import override_settings
+
+from tournamentapp.jobs import run_next
+from tournamentapp.models import Job, MatchEvent
+
+
+@pytest.mark.django_db
+def test_projection_returns_position_probabilities(client, tournament, match):
+    response = client.get(f'/api/tournaments/{tournament.slug}/projection/')
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data['is_current'] is True
+    assert data['remaining_matches'] == 1
+    assert {t['team_name'] for t in data['teams']} == {"Team A", "Team B"}
+    assert all(len(t['positions']) == 2 for t in data['teams'])
+
+
+@pytest.mark.django_db
+def test_projection_recomputed_after_result(client, tournament, match):
+    url = f'/api/tournaments/{tournament.slug}/projection/'
+    assert client.get(url).json()['remaining_matches'] == 1
+
+    MatchEvent.objects.create(match=match, event_type='goal', team=match.home_team)
+    match.apply_result()
+
+    data = client.get(url).json()
+    assert data['remaining_matches'] == 0
+    assert data['teams'][0]['team_name'] == "Team A"
+    assert data['teams'][0]['positions'][0] == 1.0
+
+
+@pytest.mark.django_db
+@override_settings(PROJECTION_RUN_INLINE=False, JOBS_RUN_INLINE=False)
+def test_projection_accepted_while_job_is_queued(client, tournament, match):
+    url = f'/api/tournaments/{tournament.slug}/projection/'
+
+    assert client.get(url).status_code == 202
+    assert client.get(url).status_code == 202
+    job_row = Job.objects.get()
+    assert (job_row.name, job_row.args) == ('tournamentapp.projection.compute_projection', [tournament.pk])
+
+    assert run_next('default', 'test')
+    data = client.get(url).json()
+    assert data['is_current'] is True
+    assert data['remaining_matches'] == 1
+
+
+@pytest.mark.django_db
+def test_projection_404_when_leaderboard_hidden(client, tournament):
+    tournament.show_leaderboard = False
+    tournament.save()
+
+    response = client.get(f'/api/tournaments/{tournament.slug}/projection/')
+    assert response.status_code == 404
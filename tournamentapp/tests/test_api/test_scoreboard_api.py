@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tournamentapp.clock import change_clock
+from tournamentapp.models import Field, Match, MatchEvent, Player, Team
+
+LOCAL_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def _url(match, field=None):
+    field_id = (field or match.field).pk
+    return f'/api/tournaments/{match.tournament.slug}/fields/{field_id}/scoreboard/'
+
+
+@pytest.fixture
+def next_match(tournament, match):
+    third = Team.objects.create(name="Team C", tournament=tournament)
+    return Match.objects.create(
+        tournament=tournament, home_team=third, away_team=match.home_team,
+        field=match.field, start_time=match.start_time + timedelta(minutes=20),
+    )
+
+
+@pytest.mark.django_db
+def test_scoreboard_shows_current_and_next_match_with_live_score(client, match, next_match):
+    scorer = Player.objects.create(name="Scorer", team=match.home_team)
+    unlucky = Player.objects.create(name="Unlucky", team=match.home_team)
+    MatchEvent.objects.create(match=match, team=match.home_team, player=scorer, event_type='goal', minute=3)
+    MatchEvent.objects.create(match=match, team=match.home_team, player=unlucky, event_type='own_goal', minute=9)
+    MatchEvent.objects.create(match=match, team=match.home_team, player=scorer, event_type='goal', minute=12)
+
+    data = client.get(_url(match)).json()
+
+    assert data['field_name'] == "Main Field"
+    assert data['current_match']['id'] == match.pk
+    assert (data['current_match']['home_score'], data['current_match']['away_score']) == (2, 1)
+    assert data['next_match']['home_team'] == "Team C"
+    assert data['clock']['state'] == 'pending'
+
+
+@pytest.mark.django_db
+def test_scoreboard_polls_do_not_query(client, match, next_match):
+    change_clock(match, 'kick_off')
+    for _ in range(2):
+        # the slug resolver's first entry is only trusted once verified
+        client.get(_url(match))
+
+    with CaptureQueriesContext(connection) as ctx:
+        data = client.get(_url(match)).json()
+
+    assert len(ctx) == 0
+    assert data['clock']['minute'] == 1
+
+
+@pytest.mark.django_db
+def test_scoreboard_rebuilt_only_for_changed_field(client, tournament, user, match, next_match):
+    other_field = Field.objects.create(name="Side Field", tournament=tournament, owner=user)
+    client.get(_url(match))
+    client.get(_url(match, other_field))
+
+    scorer = Player.objects.create(name="Scorer", team=match.away_team)
+    MatchEvent.objects.create(match=match, team=match.away_team, player=scorer, event_type='goal', minute=5)
+
+    assert cache.get(f"field:{other_field.pk}:scoreboard") is not None
+    assert client.get(_url(match)).json()['current_match']['away_score'] == 1
+
+
+@pytest.mark.django_db
+def test_moving_match_refreshes_both_fields(client, tournament, user, match, next_match):
+    other_field = Field.objects.create(name="Side Field", tournament=tournament, owner=user)
+    client.get(_url(match))
+    client.get(_url(match, other_field))
+
+    moved = Match.objects.get(pk=next_match.pk)
+    moved.field = other_field
+    moved.save()
+
+    assert client.get(_url(match)).json()['next_match'] is None
+    assert client.get(_url(match, other_field)).json()['current_match']['id'] == next_match.pk
+
+
+@pytest.mark.django_db
+def test_finished_match_makes_way_for_next(client, match, next_match):
+    client.get(_url(match))
+
+    match.apply_result()
+
+    data = client.get(_url(match)).json()
+    assert data['current_match']['id'] == next_match.pk
+    assert data['next_match'] is None
+
+
+@pytest.mark.django_db
+def test_scoreboard_404_for_other_tournament(client, match):
+    assert client.get(f'/api/tournaments/elsewhere/fields/{match.field.pk}/scoreboard/').status_code == 404
+    assert client.get(f'/api/tournaments/{match.tournament.slug}/fields/0/scoreboard/').status_code == 404
+
+
+@pytest.mark.django_db
+@override_settings(STORAGES=LOCAL_STORAGES, STATIC_URL="/static/")
+def test_scoreboard_page(client, match):
+    response = client.get(f'/display/{match.tournament.slug}/fields/{match.field.pk}/')
+
+    assert response.status_code == 200
+    assert _url(match).encode() in response.content
+    assert client.get(f'/display/elsewhere/fields/{match.field.pk}/').status_code == 404
+
+
+@pytest.mark.django_db
+@override_settings(STORAGES=LOCAL_STORAGES, STATIC_URL="/static/")
+def test_live_views_resolve_slugs_in_any_case(client, match):
+    slug = match.tournament.slug.upper()
+
+    assert client.get(f'/api/tournaments/{slug}/fields/{match.field.pk}/scoreboard/').status_code == 200
+    assert client.get(f'/api/tournaments/{slug}/matches/{match.pk}/clock/').status_code == 200
+    assert client.get(f'/display/{slug}/fields/{match.field.pk}/').status_code == 200
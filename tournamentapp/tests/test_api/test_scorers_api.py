@@ -0,0 +1,36 @@
+import pytest
+from tournamentapp.models import MatchEvent
+
+
+@pytest.mark.django_db
+def test_scorers_paginated_with_positions(client, tournament, match, team):
+    for i in range(30):
+        player = team.players.create(name=f"Player {i:02d}")
+        MatchEvent.objects.create(match=match, event_type='goal', team=team, player=player)
+
+    response = client.get(f'/api/tournaments/{tournament.slug}/scorers/?page=2')
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data['count'] == 30
+    assert data['num_pages'] == 2
+    assert len(data['results']) == 5
+    assert all(s['position'] == 1 for s in data['results'])
+
+
+@pytest.mark.django_db
+def test_scorers_404_when_leaderboard_hidden(client, tournament):
+    tournament.show_leaderboard = False
+    tournament.save()
+
+    response = client.get(f'/api/tournaments/{tournament.slug}/scorers/')
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_leaderboard_top_scorers_include_position(client, tournament, match, team):
+    player = team.players.create(name="Scorer")
+    MatchEvent.objects.create(match=match, event_type='goal', team=team, player=player)
+
+    data = client.get(f'/api/tournaments/{tournament.slug}/leaderboard/').json()
+    assert data['top_scorers'][0]['position'] == 1
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from tournamentapp.models import MatchEvent, Player
+
+
+def _post(client, match, events):
+    url = reverse("batch-match-events", kwargs={
+        "tournament_id": match.tournament.id,
+        "match_id": match.id,
+    })
+    return client.post(url, json.dumps({"events": events}), content_type="application/json")
+
+
+def _event(key, event_type, player, minute=10):
+    return {
+        "key": key,
+        "event_type": event_type,
+        "team_id": player.team_id,
+        "player_id": player.id,
+        "minute": minute,
+    }
+
+
+@pytest.mark.django_db
+def test_batch_records_events_and_score(auth_client, match):
+    home = match.home_team.players.create(name="Home 1")
+    away = match.away_team.players.create(name="Away 1")
+
+    response = _post(auth_client, match, [
+        _event("a", "goal", home, 3),
+        _event("b", "goal", away, 7),
+        _event("c", "goal", home, 12),
+    ])
+
+    data = response.json()
+    assert data["success"] is True
+    assert [r["status"] for r in data["results"]] == ["created"] * 3
+    assert (data["home_score"], data["away_score"]) == (2, 1)
+    assert MatchEvent.objects.filter(match=match).count() == 3
+    assert Player.objects.get(pk=home.pk).goal_count == 2
+
+
+@pytest.mark.django_db
+def test_resent_batch_is_deduplicated(auth_client, match):
+    player = match.home_team.players.create(name="Home 1")
+    events = [_event("a", "goal", player), _event("b", "yellow_card", player)]
+
+    first = _post(auth_client, match, events).json()
+    second = _post(auth_client, match, events + [_event("c", "goal", player)]).json()
+
+    assert [r["status"] for r in second["results"]] == ["duplicate", "duplicate", "created"]
+    assert [r["id"] for r in second["results"][:2]] == [r["id"] for r in first["results"]]
+    assert MatchEvent.objects.filter(match=match).count() == 3
+    assert Player.objects.get(pk=player.pk).goal_count == 2
+
+
+@pytest.mark.django_db
+def test_suspension_applied_in_order_within_batch(auth_client, match):
+    player = match.home_team.players.create(name="Home 1")
+
+    data = _post(auth_client, match, [
+        _event("a", "goal", player),
+        _event("b", "red_card", player),
+        _event("c", "goal", player),
+    ]).json()
+
+    assert [r["status"] for r in data["results"]] == ["created", "created", "rejected"]
+    assert data["home_score"] == 1
+    assert Player.objects.get(pk=player.pk).is_muted is True
+
+
+@pytest.mark.django_db
+def test_invalid_events_rejected_individually(auth_client, match, tournament):
+    player = match.home_team.players.create(name="Home 1")
+    outsider = Player.objects.create(
+        name="Outsider",
+        team=tournament.teams.create(name="Team C"),
+    )
+
+    data = _post(auth_client, match, [
+        _event("a", "goal", outsider),
+        _event("b", "dance", player),
+        {**_event("c", "goal", player), "team_id": match.away_team_id},
+        _event("", "goal", player),
+        _event("d", "goal", player),
+    ]).json()
+
+    assert [r["status"] for r in data["results"]] == ["rejected"] * 4 + ["created"]
+    assert MatchEvent.objects.filter(match=match).count() == 1
+
+
+@pytest.mark.django_db
+def test_batch_on_finished_match_updates_points(auth_client, match):
+    match.apply_result()
+    player = match.away_team.players.create(name="Away 1")
+
+    _post(auth_client, match, [_event("a", "goal", player)])
+
+    match.refresh_from_db()
+    match.away_team.refresh_from_db()
+    assert match.away_score == 1
+    assert match.away_team.tournament_points == match.tournament.points_for_win
+
+
+@pytest.mark.django_db
+def test_batch_requires_owner(client, other_user, match):
+    client.force_login(other_user)
+    response = _post(client, match, [])
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_batch_rejects_malformed_body(auth_client, match):
+    url = reverse("batch-match-events", kwargs={
+        "tournament_id": match.tournament.id,
+        "match_id": match.id,
+    })
+    response = auth_client.post(url, "not json", content_type="application/json")
+    assert response.status_code == 400
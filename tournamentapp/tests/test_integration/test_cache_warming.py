@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tournamentapp import warming
+from tournamentapp.cache import RESULTS, SCHEDULE, payload_key
+from tournamentapp.jobs import run_next
+from tournamentapp.models import Job, MatchEvent, Player
+
+
+def _warm(tournament, name, scopes):
+    return cache.get(payload_key(name, tournament.pk, scopes) + ':encoded') is not None
+
+
+@pytest.fixture
+def player(team):
+    return Player.objects.create(name='Striker', team=team)
+
+
+@pytest.mark.django_db
+def test_goal_warms_public_payloads(auth_client, tournament, match, player, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = auth_client.post(
+            reverse('add-match-event', kwargs={'tournament_id': tournament.pk, 'match_id': match.pk}),
+            {'event_type': 'goal', 'team': 'home', 'player_id': player.pk, 'team_id': player.team_id},
+        )
+    assert response.status_code == 200
+
+    assert _warm(tournament, 'schedule', [SCHEDULE, RESULTS])
+    assert _warm(tournament, 'leaderboard', [RESULTS])
+    assert _warm(tournament, 'crosstable', [RESULTS])
+
+    # the next poll is a cache hit
+    with CaptureQueriesContext(connection) as queries:
+        poll = Client().get(reverse('api-leaderboard', kwargs={'slug': tournament.slug}))
+    assert poll.status_code == 200
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_hidden_leaderboard_not_warmed(tournament, match):
+    tournament.show_leaderboard = False
+    tournament.save()
+
+    warming.warm_tournament_caches(tournament.pk)
+
+    assert _warm(tournament, 'schedule', [SCHEDULE, RESULTS])
+    assert not _warm(tournament, 'leaderboard', [RESULTS])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('action', ['finish', 'remove_event', 'reschedule'])
+def test_result_changing_writes_warm(action, auth_client, tournament, match, player, field, django_capture_on_commit_callbacks):
+    event = MatchEvent.objects.create(match=match, team=player.team, player=player, event_type='goal', minute=3)
+    requests = {
+        'finish': lambda: auth_client.post(reverse('finish-match', kwargs={
+            'tournament_id': tournament.pk, 'match_id': match.pk,
+        })),
+        'remove_event': lambda: auth_client.delete(reverse('delete-match-event', kwargs={
+            'tournament_id': tournament.pk, 'event_id': event.pk,
+        })),
+        'reschedule': lambda: auth_client.post(reverse('edit-match', kwargs={
+            'tournament_id': tournament.pk, 'match_id': match.pk,
+        }), {'start_time': '10:30', 'field': field.pk}),
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = requests[action]()
+    assert response.status_code in (200, 302)
+
+    assert _warm(tournament, 'schedule', [SCHEDULE, RESULTS])
+    assert _warm(tournament, 'leaderboard', [RESULTS])
+
+
+@pytest.mark.django_db
+@override_settings(JOBS_RUN_INLINE=False, CACHE_WARM_DEBOUNCE=2.0)
+def test_bursts_are_debounced_into_one_rebuild(tournament):
+    before = timezone.now()
+    for _ in range(5):
+        warming.schedule_cache_warm(tournament.pk)
+
+    queued = Job.objects.get()
+    assert queued.queue == 'warming'
+    assert queued.name == 'tournamentapp.warming.warm_tournament_caches'
+    assert queued.args == [tournament.pk]
+    assert queued.run_at >= before + timedelta(seconds=2)
+
+    # the rebuild reopens the window for writes that come after it
+    Job.objects.update(run_at=timezone.now())
+    assert run_next('warming', 'test')
+    assert _warm(tournament, 'schedule', [SCHEDULE, RESULTS])
+    warming.schedule_cache_warm(tournament.pk)
+    assert Job.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_failed_rebuild_is_logged_not_raised(tournament, monkeypatch, caplog, django_capture_on_commit_callbacks):
+    def broken(tournament_id):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(warming, 'ScheduleAPIView', type('Broken', (), {'build': broken}))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        warming.schedule_cache_warm(tournament.pk)
+
+    assert 'tournamentapp.warming.warm_tournament_caches' in caplog.text
+    assert 'boom' in caplog.text
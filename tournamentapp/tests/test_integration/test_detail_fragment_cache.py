@@ -0,0 +1,81 @@
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tournamentapp.cache import payload_key
+from tournamentapp.models import Match, Team
+from tournamentapp.timeline import TIMELINE_SCOPES
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def static_files(settings):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+    settings.STATIC_URL = '/static/'
+
+
+@pytest.fixture
+def matches(tournament, team, field):
+    away = Team.objects.create(name="Away", tournament=tournament)
+    return [
+        Match.objects.create(
+            tournament=tournament, home_team=home, away_team=visitor, field=field,
+            start_time=datetime(2026, 6, 1, hour, tzinfo=dt_timezone.utc),
+        )
+        for hour, (home, visitor) in zip((10, 11), [(team, away), (away, team)])
+    ]
+
+
+def _cell_key(match, tournament):
+    return make_template_fragment_key('timeline-cell', [
+        match.pk, f'{match.start_time:%H:%M}', match.field_id, match.home_team.name,
+        match.away_team.name, match.home_score, match.away_score, match.is_finished,
+        tournament.is_finished,
+    ])
+
+
+def _detail(auth_client, tournament):
+    response = auth_client.get(reverse('tournament-detail', kwargs={'pk': tournament.pk}))
+    assert response.status_code == 200
+    return response.content.decode()
+
+
+def _grid(page):
+    return page[page.index('<table class="timeline-table">'):page.index('</table>')]
+
+
+def test_cached_grid_skips_the_timeline(auth_client, tournament, matches):
+    first = _detail(auth_client, tournament)
+    cache.delete(payload_key('timeline', tournament.pk, TIMELINE_SCOPES))
+
+    with CaptureQueriesContext(connection) as queries:
+        again = _detail(auth_client, tournament)
+
+    assert _grid(again) == _grid(first)
+    # the grid came from the cache, so the dropped timeline wasn't rebuilt
+    assert not [q for q in queries if '"tournamentapp_match"."start_time"' in q['sql']]
+
+
+def test_only_changed_cells_are_rendered_again(auth_client, tournament, matches):
+    _detail(auth_client, tournament)
+    scored, untouched = matches
+    assert cache.get(_cell_key(scored, tournament)) is not None
+
+    # stands in for the untouched cell: served from the cache, not re-rendered
+    cache.set(_cell_key(untouched, tournament), '<div>cached cell</div>')
+    scored.home_score, scored.is_finished = 3, True
+    scored.save()
+
+    page = _detail(auth_client, tournament)
+
+    assert '<span class="score">3 - 0</span>' in page
+    assert '<div>cached cell</div>' in page
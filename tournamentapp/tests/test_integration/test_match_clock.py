@@ -0,0 +1,141 @@
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tournamentapp.clock import change_clock, clock_changed, clock_minute
+from tournamentapp.models import MatchClock, MatchEvent
+
+
+def _action(auth_client, match, action):
+    return auth_client.post(reverse('match-clock', kwargs={
+        'tournament_id': match.tournament_id, 'match_id': match.pk,
+    }), {'action': action})
+
+
+@pytest.mark.django_db
+def test_minute_derived_across_halves(tournament, match):
+    tournament.has_halves = True
+    tournament.half_duration = 20
+    tournament.save()
+    start = timezone.now()
+
+    document = change_clock(match, 'kick_off', now=start)
+    assert clock_minute(document, start + timedelta(minutes=5, seconds=10)) == 6
+
+    document = change_clock(match, 'pause', now=start + timedelta(minutes=10))
+    assert clock_minute(document, start + timedelta(minutes=30)) == 11
+
+    change_clock(match, 'resume', now=start + timedelta(minutes=12))
+    document = change_clock(match, 'half_time', now=start + timedelta(minutes=22))
+    assert document['half_time_ends_at'] == pytest.approx(
+        (start + timedelta(minutes=27)).timestamp()
+    )
+
+    document = change_clock(match, 'kick_off', now=start + timedelta(minutes=27))
+    assert document['period'] == 2
+    assert clock_minute(document, start + timedelta(minutes=27, seconds=30)) == 21
+
+
+@pytest.mark.django_db
+def test_invalid_transitions_rejected(auth_client, match):
+    assert _action(auth_client, match, 'pause').status_code == 400
+
+    assert _action(auth_client, match, 'kick_off').json()['clock']['state'] == MatchClock.RUNNING
+    response = _action(auth_client, match, 'half_time')
+    assert response.status_code == 400
+    assert response.json()['error'] == "This match is not played in halves."
+
+
+@pytest.mark.django_db
+def test_event_minute_filled_from_clock(auth_client, match):
+    change_clock(match, 'kick_off', now=timezone.now() - timedelta(minutes=7, seconds=30))
+    player = match.home_team.players.create(name="Scorer")
+
+    auth_client.post(reverse('add-match-event', kwargs={
+        'tournament_id': match.tournament_id, 'match_id': match.pk,
+    }), {
+        'event_type': 'goal', 'team': 'home',
+        'team_id': match.home_team_id, 'player_id': player.pk,
+    })
+
+    assert MatchEvent.objects.get(match=match).minute == 8
+
+
+@pytest.mark.django_db
+def test_clock_read_from_cache_and_pushed_on_change(auth_client, match, django_capture_on_commit_callbacks):
+    received = []
+
+    def subscriber(sender, match_id, document, **kwargs):
+        received.append((match_id, document['state']))
+
+    clock_changed.connect(subscriber)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            _action(auth_client, match, 'kick_off')
+    finally:
+        clock_changed.disconnect(subscriber)
+
+    assert received == [(match.pk, MatchClock.RUNNING)]
+
+    url = reverse('api-match-clock', kwargs={'slug': match.tournament.slug, 'match_id': match.pk})
+    for _ in range(2):
+        # the slug resolver's first entry is only trusted once verified
+        Client().get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        data = Client().get(url).json()
+    assert len(ctx) == 0
+    assert data['state'] == MatchClock.RUNNING
+    assert data['minute'] == 1
+
+
+@pytest.mark.django_db
+def test_clock_404_for_other_tournament(client, match):
+    url = reverse('api-match-clock', kwargs={'slug': 'elsewhere', 'match_id': match.pk})
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_clock_found_after_tournament_is_renamed(client, tournament, match):
+    change_clock(match, 'kick_off')
+    client.get(reverse('api-match-clock', kwargs={'slug': tournament.slug, 'match_id': match.pk}))
+
+    tournament.name = "Renamed Cup"
+    tournament.slug = "renamed-cup"
+    tournament.save()
+
+    url = reverse('api-match-clock', kwargs={'slug': 'renamed-cup', 'match_id': match.pk})
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()['state'] == MatchClock.RUNNING
+
+
+@pytest.mark.django_db
+def test_finishing_match_stops_clock(auth_client, match):
+    change_clock(match, 'kick_off')
+
+    auth_client.post(reverse('finish-match', kwargs={
+        'tournament_id': match.tournament_id, 'match_id': match.pk,
+    }))
+
+    assert MatchClock.objects.get(match=match).state == MatchClock.FINISHED
+
+
+@pytest.mark.django_db
+def test_schedule_form_settings_saved_for_clock(auth_client, tournament, field, team):
+    tournament.teams.create(name="Team B")
+
+    auth_client.post(reverse('generate-tournament-schedule', kwargs={'tournament_id': tournament.pk}), {
+        'start_date': '2026-06-01',
+        'start_time': '10:00',
+        'has_halves': 'on',
+        'half_duration': 25,
+        'half_time_break': 10,
+        'pause_duration': 5,
+    })
+
+    tournament.refresh_from_db()
+    assert (tournament.has_halves, tournament.half_duration, tournament.half_time_break) == (True, 25, 10)
@@ -0,0 +1,164 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tournamentapp import routers
+from tournamentapp.models import Tournament
+from tournamentapp.routers import PRIMARY_COOKIE, ReplicaRouter, cache_timeout, replica_reads
+
+# transactional, so the replica's connection sees the data other tests'
+# wrapping transaction would keep from it
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=['default', 'replica']),
+    pytest.mark.usefixtures('reset_replica_health'),
+]
+
+
+@pytest.fixture
+def reset_replica_health():
+    routers._down_until.clear()
+    yield
+    routers._down_until.clear()
+
+
+class FakeRequest:
+    def __init__(self, cookies=None):
+        self.COOKIES = cookies or {}
+
+
+def _read_alias(request=None):
+    with replica_reads(request or FakeRequest()):
+        return ReplicaRouter().db_for_read(Tournament)
+
+
+def _get(path, cookies=None):
+    client = AsyncClient()
+    for name, value in (cookies or {}).items():
+        client.cookies[name] = value
+    return async_to_sync(client.get)(path)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+def test_public_api_reads_from_replica(tournament):
+    with CaptureQueriesContext(connections['replica']) as replica, \
+            CaptureQueriesContext(connections['default']) as primary:
+        response = _get(reverse('api-tournament-meta', kwargs={'slug': tournament.slug}))
+
+    assert response.status_code == 200
+    assert len(replica) > 0
+    # only the slug lookup, which always reads the primary (see slugs.py)
+    assert len(primary) == 1
+    assert 'FROM "tournamentapp_tournament"' in primary[0]['sql']
+
+
+@override_settings(
+    DATABASE_REPLICAS=['replica'],
+    STORAGES={
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    STATIC_URL='/static/',
+)
+def test_organiser_pages_read_from_primary(auth_client, tournament):
+    with CaptureQueriesContext(connections['replica']) as replica:
+        response = auth_client.get(reverse('tournament-detail', kwargs={'pk': tournament.pk}))
+
+    assert response.status_code == 200
+    assert len(replica) == 0
+
+
+def test_without_replicas_reads_stay_on_primary():
+    assert _read_alias() == 'default'
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+def test_writes_go_to_primary():
+    with replica_reads(FakeRequest()):
+        assert ReplicaRouter().db_for_write(Tournament) == 'default'
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_STICKY_SECONDS=7)
+def test_writer_reads_its_own_writes_from_primary(auth_client, tournament):
+    response = auth_client.post(reverse('toggle-tournament-status', kwargs={'pk': tournament.pk}))
+    cookie = response.cookies[PRIMARY_COOKIE]
+    assert cookie['max-age'] == 7
+    assert cookie['httponly']
+
+    assert _read_alias(FakeRequest({PRIMARY_COOKIE: '1'})) == 'default'
+    with CaptureQueriesContext(connections['replica']) as replica:
+        _get(
+            reverse('api-tournament-meta', kwargs={'slug': tournament.slug}),
+            cookies={PRIMARY_COOKIE: '1'},
+        )
+    assert len(replica) == 0
+
+
+def test_no_sticky_cookie_without_replicas(auth_client, tournament):
+    response = auth_client.post(reverse('toggle-tournament-status', kwargs={'pk': tournament.pk}))
+    assert PRIMARY_COOKIE not in response.cookies
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_RETRY_SECONDS=30)
+def test_unreachable_replica_fails_over_to_primary(monkeypatch, caplog):
+    attempts = []
+
+    def refuse():
+        attempts.append(1)
+        raise OperationalError('connection refused')
+
+    monkeypatch.setattr(connections['replica'], 'ensure_connection', refuse)
+
+    assert _read_alias() == 'default'
+    assert 'Replica replica is unreachable' in caplog.text
+
+    # skipped until the retry delay is over
+    assert _read_alias() == 'default'
+    assert len(attempts) == 1
+
+    routers._down_until['replica'] = 0
+    monkeypatch.undo()
+    assert _read_alias() == 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_CACHE_TIMEOUT=15)
+def test_payloads_built_from_replica_are_cached_briefly():
+    assert cache_timeout(3600) == 3600
+    with replica_reads(FakeRequest()):
+        assert cache_timeout(3600) == 15
+        assert cache_timeout(5) == 5
+
+
+def test_replicas_share_the_primary_pool_settings():
+    # settings are read once per process, so load them in a fresh one
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'myproject.settings',
+        'SECRET_KEY': 'x',
+        'DATABASE_URL': 'postgres://app@primary/app',
+        'DATABASE_REPLICA_URLS': 'postgres://app@replica-1/app,postgres://app@replica-2/app',
+        'DB_POOL': 'True',
+    }
+    script = (
+        "import json; from django.conf import settings; "
+        "print(json.dumps({alias: [db['CONN_MAX_AGE'], db['OPTIONS'].get('pool')] "
+        "for alias, db in settings.DATABASES.items()}))"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], env=env, cwd=settings.BASE_DIR,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    databases = json.loads(output)
+
+    assert set(databases) == {'default', 'replica_1', 'replica_2'}
+    for alias, (conn_max_age, pool) in databases.items():
+        assert conn_max_age == 0
+        assert pool == {**databases['default'][1], 'name': alias}
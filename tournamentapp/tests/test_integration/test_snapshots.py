@@ -0,0 +1,161 @@
+import json
+
+import pytest
+from django.conf import settings
+from django.core.files.storage import storages
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from tournamentapp.models import Tournament
+from tournamentapp.snapshots import publish_snapshot, snapshot_base_url
+from vendors.models import Vendor
+
+
+def _toggle(auth_client, tournament, capture):
+    with capture(execute=True):
+        response = auth_client.post(reverse('toggle-tournament-status', kwargs={'pk': tournament.pk}))
+    assert response.status_code == 302
+    tournament.refresh_from_db()
+
+
+def _read(tournament, name):
+    with storages['snapshots'].open(f"{tournament.snapshot['prefix']}/{name}.json") as f:
+        return json.loads(f.read())
+
+
+@pytest.mark.django_db
+def test_finishing_publishes_snapshot(auth_client, tournament, match, django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+
+    assert tournament.is_finished
+    assert set(tournament.snapshot['files']) >= {'meta', 'schedule', 'leaderboard', 'crosstable'}
+
+    live = Client().get(reverse('api-schedule', kwargs={'slug': tournament.slug}))
+    assert live.status_code == 302
+    assert _read(tournament, 'schedule')['timeline'][0]['matches'][0]['id'] == match.pk
+    assert _read(tournament, 'meta')['slug'] == tournament.slug
+
+
+@pytest.mark.django_db
+def test_public_api_redirects_to_snapshot(auth_client, tournament, django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    base = snapshot_base_url(tournament)
+
+    client = Client()
+    for name, url_name in [
+        ('meta', 'api-tournament-meta'), ('schedule', 'api-schedule'),
+        ('leaderboard', 'api-leaderboard'), ('vendors', 'api-vendors'),
+        ('side-events', 'api-side-events'), ('announcements', 'api-announcements'),
+    ]:
+        response = client.get(reverse(url_name, kwargs={'slug': tournament.slug}))
+        assert response.status_code == 302
+        assert response['Location'] == f'{base}/{name}.json'
+
+
+@pytest.mark.django_db
+def test_hidden_sections_not_published(auth_client, tournament, django_capture_on_commit_callbacks):
+    tournament.show_vendors = False
+    tournament.show_leaderboard = False
+    tournament.save()
+    Vendor.objects.create(tournament=tournament, name='Burgers')
+
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+
+    assert 'vendors' not in tournament.snapshot['files']
+    assert 'leaderboard' not in tournament.snapshot['files']
+    response = Client().get(reverse('api-vendors', kwargs={'slug': tournament.slug}))
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_reopening_unpublishes(auth_client, tournament, django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    snapshot = tournament.snapshot
+
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+
+    assert not tournament.is_finished
+    assert tournament.snapshot is None
+    assert not storages['snapshots'].exists(f"{snapshot['prefix']}/schedule.json")
+    response = Client().get(reverse('api-schedule', kwargs={'slug': tournament.slug}))
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_reopening_stops_redirects_before_the_job_runs(auth_client, tournament, settings,
+                                                       django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    client = Client()
+    assert client.get(reverse('api-schedule', kwargs={'slug': tournament.slug})).status_code == 302
+
+    # the unpublish job is only queued; the request's own commit has to
+    # be enough for the public API to stop pointing at the snapshot
+    settings.JOBS_RUN_INLINE = False
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+
+    assert tournament.snapshot is not None
+    assert client.get(reverse('api-schedule', kwargs={'slug': tournament.slug})).status_code == 200
+
+
+@pytest.mark.django_db
+def test_republish_replaces_previous_files(tournament):
+    Tournament.objects.filter(pk=tournament.pk).update(is_finished=True)
+    tournament.refresh_from_db()
+    publish_snapshot(tournament)
+    first = tournament.snapshot
+
+    publish_snapshot(tournament)
+
+    assert tournament.snapshot['version'] != first['version']
+    assert not storages['snapshots'].exists(f"{first['prefix']}/meta.json")
+
+
+@pytest.mark.django_db
+def test_snapshot_survives_rename(auth_client, tournament, django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    snapshot = tournament.snapshot
+    tournament.slug = 'renamed-cup'
+    tournament.save()
+
+    response = Client().get(reverse('api-schedule', kwargs={'slug': 'renamed-cup'}))
+    assert response.status_code == 302
+    assert response['Location'] == storages['snapshots'].url(f"{snapshot['prefix']}/schedule.json")
+
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    assert not storages['snapshots'].exists(f"{snapshot['prefix']}/schedule.json")
+
+
+@pytest.mark.django_db
+def test_result_edit_after_finish_republishes(auth_client, tournament, match,
+                                              django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    first = tournament.snapshot
+    player = match.home_team.players.create(name="Late Scorer")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = auth_client.post(
+            reverse('add-match-event', kwargs={'tournament_id': tournament.pk, 'match_id': match.pk}),
+            {'event_type': 'goal', 'team': 'home', 'player_id': player.pk,
+             'team_id': match.home_team.pk, 'minute': '10'},
+        )
+    assert response.status_code == 200
+
+    tournament.refresh_from_db()
+    assert tournament.snapshot['version'] != first['version']
+    assert not storages['snapshots'].exists(f"{first['prefix']}/schedule.json")
+    scorers = _read(tournament, 'leaderboard')['top_scorers']
+    assert [row['player_name'] for row in scorers] == ['Late Scorer']
+
+
+@pytest.mark.django_db
+def test_spa_points_at_snapshot(auth_client, tournament, django_capture_on_commit_callbacks):
+    _toggle(auth_client, tournament, django_capture_on_commit_callbacks)
+    local_static = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+
+    with override_settings(STORAGES=local_static, STATIC_URL="/static/"):
+        response = Client().get(reverse('public-tournament-leaderboard', kwargs={'slug': tournament.slug}))
+
+    assert response.context['snapshot_url'] == snapshot_base_url(tournament)
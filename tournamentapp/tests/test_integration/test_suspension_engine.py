@@ -0,0 +1,107 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+
+from tournamentapp.models import Match, MatchEvent, Player, SuspensionLog
+from tournamentapp.suspensions import apply_suspensions
+
+
+def _next_match(match, hours):
+    return Match.objects.create(
+        tournament=match.tournament,
+        home_team=match.home_team, away_team=match.away_team,
+        field=match.field, start_time=match.start_time + timedelta(hours=hours),
+    )
+
+
+def _card(auth_client, match, player, event_type):
+    auth_client.post(reverse('add-match-event', kwargs={
+        'tournament_id': match.tournament_id, 'match_id': match.pk,
+    }), {
+        'event_type': event_type,
+        'team': 'home',
+        'team_id': player.team_id,
+        'player_id': player.pk,
+        'minute': 10,
+    })
+
+
+def _finish(auth_client, match):
+    auth_client.post(reverse('finish-match', kwargs={
+        'tournament_id': match.tournament_id, 'match_id': match.pk,
+    }))
+
+
+@pytest.mark.django_db
+def test_red_card_ban_served_after_configured_games(auth_client, tournament, match):
+    tournament.red_suspension_games = 2
+    tournament.save()
+    player = match.home_team.players.create(name="Player A")
+
+    _card(auth_client, match, player, 'red_card')
+    _finish(auth_client, match)
+    player.refresh_from_db()
+    assert (player.is_muted, player.suspension_games, player.games_sat_out) == (True, 2, 0)
+
+    _finish(auth_client, _next_match(match, 1))
+    player.refresh_from_db()
+    assert (player.is_muted, player.games_sat_out) == (True, 1)
+
+    _finish(auth_client, _next_match(match, 2))
+    player.refresh_from_db()
+    assert player.is_muted is False
+    assert player.is_suspended() is False
+    assert list(SuspensionLog.objects.filter(player=player).values_list('action', flat=True)) == [
+        SuspensionLog.SUSPENDED, SuspensionLog.SAT_OUT, SuspensionLog.SAT_OUT, SuspensionLog.SERVED,
+    ]
+
+
+@pytest.mark.django_db
+def test_served_yellow_cards_no_longer_count(auth_client, tournament, match):
+    tournament.yellow_suspension_games = 1
+    tournament.save()
+    player = match.home_team.players.create(name="Player A")
+
+    _card(auth_client, match, player, 'yellow_card')
+    _card(auth_client, match, player, 'yellow_card')
+    _finish(auth_client, match)
+    _finish(auth_client, _next_match(match, 1))
+
+    later = _next_match(match, 2)
+    _card(auth_client, later, player, 'yellow_card')
+    player.refresh_from_db()
+    assert player.is_muted is False
+    assert player.yellow_cards_served == 2
+
+    _card(auth_client, later, player, 'yellow_card')
+    player.refresh_from_db()
+    assert player.is_muted is True
+
+
+@pytest.mark.django_db
+def test_default_ban_lasts_until_lifted(auth_client, match):
+    player = match.home_team.players.create(name="Player A")
+
+    _card(auth_client, match, player, 'red_card')
+    _finish(auth_client, match)
+    for hours in (1, 2, 3):
+        _finish(auth_client, _next_match(match, hours))
+
+    player.refresh_from_db()
+    assert (player.is_muted, player.games_sat_out) == (True, 3)
+
+
+@pytest.mark.django_db
+def test_engine_applies_bans_for_cards_recorded_outside_views(tournament, match):
+    tournament.yellow_suspension_games = 1
+    tournament.save()
+    player = match.home_team.players.create(name="Player A")
+    bystander = match.away_team.players.create(name="Player B")
+    for _ in range(2):
+        MatchEvent.objects.create(match=match, event_type='yellow_card', team=player.team, player=player)
+
+    log = apply_suspensions(match)
+
+    assert [(entry.player_id, entry.reason) for entry in log] == [(player.pk, 'yellow_cards')]
+    assert Player.objects.get(pk=player.pk).is_muted is True
+    assert Player.objects.get(pk=bystander.pk).is_muted is False
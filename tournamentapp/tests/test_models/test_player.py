@@ -55,6 +55,19 @@ class PlayerModelTests(TestCase):
         )
         self.assertEqual(self.player.goals(), 2)
 
+    def test_save_keeps_goals_recorded_since_load(self):
+        stale = Player.objects.get(pk=self.player.pk)
+        MatchEvent.objects.create(
+            match=self.match, event_type='goal',
+            minute=10, team=self.team, player=self.player
+        )
+        stale.name = "John Smith"
+        stale.save()
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.name, "John Smith")
+        self.assertEqual(self.player.goal_count, 1)
+
     def test_own_goals(self):
         MatchEvent.objects.create(
             match=self.match, event_type='own_goal',
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import AppUser
+from tournamentapp.models import Tournament
+
+
+class TournamentSlugTests(TestCase):
+    def setUp(self):
+        self.user = AppUser.objects.create(
+            email="testuser@abv.bg",
+            password="testpass123"
+        )
+
+    def create(self, name, **kwargs):
+        return Tournament.objects.create(name=name, owner=self.user, **kwargs)
+
+    def test_slug_from_name(self):
+        self.assertEqual(self.create("Summer Cup").slug, "summer-cup")
+
+    def test_taken_slugs_get_lowest_free_suffix(self):
+        slugs = [self.create("Summer Cup").slug for _ in range(3)]
+        self.assertEqual(slugs, ["summer-cup", "summer-cup-1", "summer-cup-2"])
+
+        Tournament.objects.get(slug="summer-cup-1").delete()
+        self.assertEqual(self.create("Summer Cup").slug, "summer-cup-1")
+
+    def test_longer_names_with_the_same_prefix_do_not_conflict(self):
+        self.create("Summer Cup Final")
+        self.assertEqual(self.create("Summer Cup").slug, "summer-cup")
+
+    def test_conflicts_are_case_insensitive(self):
+        imported = self.create("Imported")
+        Tournament.objects.filter(pk=imported.pk).update(slug="SUMMER-CUP")
+        tournament = self.create("Other")
+        tournament.name = "Summer Cup"
+        tournament.save()
+        self.assertEqual(tournament.slug, "summer-cup-1")
+
+    def test_allocation_query_count_does_not_grow_with_conflicts(self):
+        def queries_for_next():
+            with CaptureQueriesContext(connection) as queries:
+                self.create("Summer Cup")
+            return len(queries)
+
+        self.create("Summer Cup")
+        few = queries_for_next()
+        for _ in range(20):
+            self.create("Summer Cup")
+        self.assertEqual(queries_for_next(), few)
+
+    def test_save_without_rename_does_not_look_at_slugs(self):
+        tournament = Tournament.objects.get(pk=self.create("Summer Cup").pk)
+        tournament.show_vendors = False
+
+        with CaptureQueriesContext(connection) as queries:
+            tournament.save()
+
+        self.assertFalse([
+            q for q in queries if q['sql'].startswith('SELECT') and 'tournamentapp_tournament' in q['sql']
+        ])
+        self.assertEqual(tournament.slug, "summer-cup")
+
+    def test_rename_reallocates_slug(self):
+        tournament = Tournament.objects.get(pk=self.create("Summer Cup").pk)
+        tournament.name = "Winter Cup"
+        tournament.save()
+        self.assertEqual(tournament.slug, "winter-cup")
+
+        # the instance remembers its new name
+        tournament.save()
+        self.assertEqual(Tournament.objects.get(pk=tournament.pk).slug, "winter-cup")
+
+    def test_slug_taken_concurrently_is_retried(self):
+        self.create("Summer Cup")
+        free_slug = Tournament._free_slug
+        calls = []
+
+        def stale_read(tournament):
+            # the first read missed a tournament created meanwhile
+            calls.append(tournament)
+            return "summer-cup" if len(calls) == 1 else free_slug(tournament)
+
+        with mock.patch.object(Tournament, '_free_slug', stale_read):
+            tournament = self.create("Summer Cup")
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(tournament.slug, "summer-cup-1")
@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+from itertools import combinations
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tournamentapp.models import Match, Team
+
+TEAM_COUNT = 64
+
+
+@pytest.mark.django_db
+def test_crosstable_for_64_teams(client, tournament, field):
+    teams = Team.objects.bulk_create(
+        Team(name=f"Team {i:02d}", tournament=tournament) for i in range(TEAM_COUNT)
+    )
+    start = timezone.now()
+    Match.objects.bulk_create(
+        Match(
+            tournament=tournament, home_team=home, away_team=away, field=field,
+            start_time=start + timedelta(minutes=i), home_score=i % 4,
+            away_score=i % 3, is_finished=True,
+        )
+        for i, (home, away) in enumerate(combinations(teams, 2))
+    )
+    url = f'/api/tournaments/{tournament.slug}/crosstable/'
+
+    with CaptureQueriesContext(connection) as ctx:
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    matrix = response.json()['matrix']
+    assert len(matrix) == TEAM_COUNT
+    assert all(len(row) == TEAM_COUNT for row in matrix)
+    assert sum(cell is not None for row in matrix for cell in row) == TEAM_COUNT * (TEAM_COUNT - 1)
+    assert len(ctx) <= 3
+    assert elapsed < 0.5
+
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    assert len(ctx) == 1
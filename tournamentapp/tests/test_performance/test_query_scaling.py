@@ -0,0 +1,275 @@
+"""
+Every view in `tournamentapp.views` and every public API view is run
+against two data set sizes; the number of queries must not grow with the
+number of teams, players, matches or events.
+"""
+import json
+from datetime import timedelta
+from itertools import combinations
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from announcements.models import Announcement
+from programme.models import SideEvent
+from sponsors.models import SponsorBanner
+from tournamentapp.models import Field, Match, MatchEvent, Player, Team, Tournament
+from tournamentapp.tests.query_scaling import assert_constant_queries
+from vendors.models import Vendor
+
+User = get_user_model()
+
+LOCAL_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("local_storages"),
+]
+
+
+@pytest.fixture
+def local_storages():
+    with override_settings(STORAGES=LOCAL_STORAGES, STATIC_URL="/static/"):
+        yield
+
+
+class World:
+    """A tournament with `size` teams, `size` players per team and a full
+    round robin on two fields, half of it finished with goals and cards."""
+
+    def __init__(self, size):
+        self.owner = User.objects.create_user(
+            email=f"owner{size}@test.com", password="pass", is_staff=True
+        )
+        self.tournament = Tournament.objects.create(
+            name=f"Scaling {size}", owner=self.owner
+        )
+        self.fields = [
+            Field.objects.create(name=f"Field {i}", tournament=self.tournament, owner=self.owner)
+            for i in range(2)
+        ]
+        self.spare_field = Field.objects.create(
+            name="Spare", tournament=self.tournament, owner=self.owner
+        )
+        self.teams = [
+            Team.objects.create(name=f"Team {i}", tournament=self.tournament)
+            for i in range(size)
+        ]
+        for team in self.teams:
+            Player.objects.bulk_create(
+                Player(name=f"{team.name} P{i}", team=team) for i in range(size)
+            )
+
+        start = timezone.now()
+        self.matches = []
+        for i, (home, away) in enumerate(combinations(self.teams, 2)):
+            self.matches.append(Match.objects.create(
+                tournament=self.tournament,
+                home_team=home,
+                away_team=away,
+                field=self.fields[i % 2],
+                start_time=start + timedelta(minutes=30 * (i // 2)),
+            ))
+
+        for match in self.matches[: len(self.matches) // 2]:
+            for team in (match.home_team, match.away_team):
+                for player in team.players.all():
+                    MatchEvent.objects.create(
+                        match=match, team=team, player=player,
+                        event_type='goal', minute=5,
+                    )
+                MatchEvent.objects.create(
+                    match=match, team=team, player=team.players.first(),
+                    event_type='yellow_card', minute=10,
+                )
+            match.apply_result()
+
+        for i in range(size):
+            Vendor.objects.create(tournament=self.tournament, name=f"Vendor {i}")
+            SideEvent.objects.create(tournament=self.tournament, name=f"Side event {i}")
+            Announcement.objects.create(
+                tournament=self.tournament,
+                message=f"Announcement {i}",
+                starts_at=start - timedelta(hours=1),
+                ends_at=start + timedelta(hours=1),
+            )
+            SponsorBanner.objects.create(tournament=self.tournament, name=f"Sponsor {i}")
+
+        self.client = Client()
+        self.client.force_login(self.owner)
+
+    @property
+    def team(self):
+        return self.teams[0]
+
+    @property
+    def finished_match(self):
+        return self.matches[0]
+
+    @property
+    def open_match(self):
+        return self.matches[-1]
+
+    @property
+    def player(self):
+        return self.team.players.first()
+
+
+def get(path_name, **kwargs):
+    def request(world):
+        resolved = {
+            key: value(world) if callable(value) else value
+            for key, value in kwargs.items()
+        }
+        url = reverse(path_name, kwargs=resolved)
+        return lambda: world.client.get(url)
+    return request
+
+
+def post(path_name, data=None, body=None, **kwargs):
+    def request(world):
+        resolved = {key: value(world) for key, value in kwargs.items()}
+        url = reverse(path_name, kwargs=resolved)
+        payload = data(world) if data else {}
+        if body:
+            return lambda: world.client.post(
+                url, json.dumps(body(world)), content_type='application/json'
+            )
+        return lambda: world.client.post(url, payload)
+    return request
+
+
+def tid(world):
+    return world.tournament.pk
+
+
+def slug(world):
+    return world.tournament.slug
+
+
+VIEW_CASES = {
+    # tournamentapp.views
+    'landing-page': get('landing-page'),
+    'about': get('about'),
+    'contact': get('contact'),
+    'privacy-policy': get('privacy-policy'),
+    'tournament-create': get('tournament-create'),
+    'tournament-edit': get('tournament-edit', pk=tid),
+    'tournament-detail': get('tournament-detail', pk=tid),
+    'tournament-delete': get('tournament-delete', pk=tid),
+    'tournament-dashboard': get('tournament-dashboard', pk=tid),
+    'public-tournament-leaderboard': get('public-tournament-leaderboard', slug=slug),
+    'field-scoreboard': get('field-scoreboard', slug=slug, field_id=lambda w: w.fields[0].pk),
+    'generate-tournament-schedule': get('generate-tournament-schedule', tournament_id=tid),
+    'team-list': get('team-list', tournament_id=tid),
+    'team-list-rename': post(
+        'team-list', tournament_id=tid,
+        data=lambda w: {'team_id': w.team.pk, 'name': w.team.name},
+    ),
+    'team-detail': get('team-detail', tournament_id=tid, pk=lambda w: w.team.pk),
+    'team-create': get('team-create', tournament_id=tid),
+    'match-create': get('match-create', tournament_id=tid),
+    'match-detail': get('match-detail', tournament_id=tid, pk=lambda w: w.finished_match.pk),
+    'match-edit': get('match-edit', tournament_id=tid, pk=lambda w: w.finished_match.pk),
+    'leaderboard': get('leaderboard', tournament_id=tid),
+    'field-create': get('field-create', tournament_id=tid),
+    'add-match-event': post(
+        'add-match-event', tournament_id=tid, match_id=lambda w: w.finished_match.pk,
+        data=lambda w: {
+            'event_type': 'goal', 'team': 'home', 'team_id': w.team.pk,
+            'player_id': w.player.pk, 'minute': 12,
+        },
+    ),
+    'add-player': post(
+        'add-player', tournament_id=tid, team_id=lambda w: w.team.pk,
+        data=lambda w: {'player': 'Newcomer'},
+    ),
+    'finish-match': post('finish-match', tournament_id=tid, match_id=lambda w: w.open_match.pk),
+    'edit-match': post(
+        'edit-match', tournament_id=tid, match_id=lambda w: w.open_match.pk,
+        data=lambda w: {'start_time': '18:00', 'field': w.fields[1].pk},
+    ),
+    'match-clock': lambda world: (
+        lambda actions: lambda: world.client.post(
+            reverse('match-clock', kwargs={
+                'tournament_id': world.tournament.pk, 'match_id': world.open_match.pk,
+            }),
+            {'action': next(actions)},
+        )
+    )(iter(['kick_off', 'pause'])),
+    'edit-field': post(
+        'edit-field', tournament_id=tid, pk=lambda w: w.fields[0].pk,
+        body=lambda w: {'name': 'Renamed'},
+    ),
+    'toggle-tournament-status': post('toggle-tournament-status', pk=tid),
+    'toggle-player-mute': post(
+        'toggle-player-mute', tournament_id=tid, player_id=lambda w: w.player.pk,
+    ),
+    'rename-player': post(
+        'rename-player', tournament_id=tid, player_id=lambda w: w.player.pk,
+        data=lambda w: {'name': 'Renamed'},
+    ),
+    # public API
+    'api-tournament-meta': get('api-tournament-meta', slug=slug),
+    'api-schedule': get('api-schedule', slug=slug),
+    'api-leaderboard': get('api-leaderboard', slug=slug),
+    'api-scorers': get('api-scorers', slug=slug),
+    'api-crosstable': get('api-crosstable', slug=slug),
+    'api-projection': get('api-projection', slug=slug),
+    'api-match-clock': get('api-match-clock', slug=slug, match_id=lambda w: w.open_match.pk),
+    'api-field-scoreboard': get(
+        'api-field-scoreboard', slug=slug, field_id=lambda w: w.fields[0].pk,
+    ),
+    'api-changes': lambda world: (
+        lambda: world.client.get(reverse('api-changes', kwargs={'slug': world.tournament.slug}), {'since': 0})
+    ),
+    'api-vendors': get('api-vendors', slug=slug),
+    'api-side-events': get('api-side-events', slug=slug),
+    'api-announcements': get('api-announcements', slug=slug),
+    'api-performance-metrics': get('api-performance-metrics'),
+}
+
+
+@pytest.mark.parametrize('case', VIEW_CASES.keys())
+def test_view_query_count_does_not_scale(case):
+    build_request = VIEW_CASES[case]
+    assert_constant_queries(lambda size: build_request(World(size)))
+
+
+ONE_SHOT_CASES = {
+    'delete-match': post('delete-match', tournament_id=tid, match_id=lambda w: w.open_match.pk),
+    'delete-field': post('delete-field', tournament_id=tid, pk=lambda w: w.spare_field.pk),
+    'reset-schedule': post('reset-schedule', tournament_id=tid),
+    'batch-match-events': post(
+        'batch-match-events', tournament_id=tid, match_id=lambda w: w.finished_match.pk,
+        body=lambda w: {'events': [
+            {
+                'key': f'sync-{i}', 'event_type': event_type, 'team_id': w.team.pk,
+                'player_id': player.pk, 'minute': 30 + i,
+            }
+            for i, (event_type, player) in enumerate(
+                (event_type, player)
+                for player in w.team.players.all()
+                for event_type in ('goal', 'yellow_card')
+            )
+        ]},
+    ),
+    'delete-match-event': lambda world: (
+        lambda: world.client.delete(reverse('delete-match-event', kwargs={
+            'tournament_id': world.tournament.pk,
+            'event_id': world.finished_match.events.first().pk,
+        }))
+    ),
+}
+
+
+@pytest.mark.parametrize('case', ONE_SHOT_CASES.keys())
+def test_one_shot_view_query_count_does_not_scale(case):
+    build_request = ONE_SHOT_CASES[case]
+    assert_constant_queries(lambda size: build_request(World(size)), warm_up=False)
@@ -0,0 +1,137 @@
+import pytest
+from django.test import override_settings
+
+from tournamentapp import instrumentation
+from tournamentapp.instrumentation import RollingHistogram, RequestTimings, pool_stats, registry
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.mark.django_db
+def test_server_timing_header_on_api_response(client, tournament):
+    response = client.get(f'/api/tournaments/{tournament.slug}/leaderboard/')
+    header = response['Server-Timing']
+    assert 'db;dur=' in header
+    assert 'view;dur=' in header
+    assert 'render;dur=' in header
+    assert 'total;dur=' in header
+
+
+@pytest.mark.django_db
+def test_request_recorded_under_url_name(client, tournament):
+    client.get(f'/api/tournaments/{tournament.slug}/leaderboard/')
+    client.get(f'/api/tournaments/{tournament.slug}/leaderboard/')
+
+    snapshot = registry.snapshot()
+    assert snapshot['api-leaderboard']['total_ms']['count'] == 2
+    assert snapshot['api-leaderboard']['queries']['count'] == 2
+
+
+@pytest.mark.django_db
+def test_query_count_is_measured(client, tournament):
+    client.get(f'/api/tournaments/{tournament.slug}/leaderboard/')
+    queries = registry.snapshot()['api-leaderboard']['queries']
+    assert queries['mean'] > 0
+
+
+@pytest.mark.django_db
+@override_settings(PERF_SAMPLE_RATE=0.0)
+def test_unsampled_requests_are_not_instrumented(client, tournament):
+    response = client.get(f'/api/tournaments/{tournament.slug}/leaderboard/')
+    assert 'Server-Timing' not in response
+    assert registry.snapshot() == {}
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_staff(client, user):
+    response = client.get('/api/metrics/performance/')
+    assert response.status_code == 403
+
+    client.force_login(user)
+    response = client.get('/api/metrics/performance/')
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_returns_histograms_for_staff(client, user, tournament):
+    user.is_staff = True
+    user.save()
+    client.force_login(user)
+
+    client.get(f'/api/tournaments/{tournament.slug}/')
+    response = client.get('/api/metrics/performance/')
+
+    assert response.status_code == 200
+    views = response.json()['views']
+    assert views['api-tournament-meta']['total_ms']['count'] == 1
+    # SQLite has no connection pool
+    assert response.json()['database_pools'] == {}
+
+
+def test_rolling_histogram_drops_expired_windows():
+    histogram = RollingHistogram(buckets=(10, 100), window_seconds=1, window_count=3)
+    histogram.record(5, now=0)
+    histogram.record(50, now=1)
+    assert histogram.snapshot(now=1)['count'] == 2
+
+    # slice 0 has rotated out of the window
+    assert histogram.snapshot(now=3)['count'] == 1
+    assert histogram.snapshot(now=10)['count'] == 0
+
+
+def test_rolling_histogram_quantiles_use_bucket_bounds():
+    histogram = RollingHistogram(buckets=(10, 100), window_seconds=60, window_count=1)
+    for _ in range(9):
+        histogram.record(5, now=0)
+    histogram.record(500, now=0)
+
+    snapshot = histogram.snapshot(now=0)
+    assert snapshot['p50'] == 10
+    assert snapshot['p99'] == 500
+    assert snapshot['buckets'] == {'le_10': 9, 'le_100': 0, 'le_inf': 1}
+
+
+def test_request_timings_counts_wrapped_queries():
+    timings = RequestTimings()
+    timings.query_wrapper(lambda *args: None, "SELECT 1", None, False, {})
+    timings.query_wrapper(lambda *args: None, "SELECT 2", None, False, {})
+    assert timings.queries == 2
+
+
+class FakePool:
+    def get_stats(self):
+        return {
+            'pool_min': 2, 'pool_max': 10, 'pool_size': 4, 'pool_available': 1,
+            'requests_num': 120, 'requests_queued': 7, 'requests_wait_ms': 35,
+            'requests_errors': 1,
+        }
+
+
+class FakeConnections:
+    settings = {'default': {'OPTIONS': {'pool': {'max_size': 10}}}, 'replica': {'OPTIONS': {}}}
+
+    def __iter__(self):
+        return iter(self.settings)
+
+    def __getitem__(self, alias):
+        return type('Wrapper', (), {'pool': FakePool()})()
+
+
+def test_pool_stats_report_checkouts_waits_and_timeouts(monkeypatch):
+    monkeypatch.setattr(instrumentation, 'connections', FakeConnections())
+
+    stats = pool_stats()
+
+    assert list(stats) == ['default']
+    assert stats['default']['checkouts'] == 120
+    assert stats['default']['waits'] == 7
+    assert stats['default']['wait_ms'] == 35
+    assert stats['default']['timeouts'] == 1
+    assert stats['default']['size'] == 4
+    # counters psycopg_pool hasn't incremented yet
+    assert stats['default']['connections_lost'] == 0
@@ -0,0 +1,124 @@
+"""
+Serialization share of the public schedule and leaderboard responses,
+before (model instances, DRF serializers, stdlib JSON) and after
+(`values()` projections, plain dicts, orjson). Run with `-s` to see the
+numbers.
+"""
+import json
+import time
+from datetime import timedelta
+from collections import defaultdict
+from itertools import combinations
+
+import pytest
+from django.utils import timezone
+from django.utils.timezone import localtime
+from rest_framework.renderers import JSONRenderer
+
+from tournamentapp.api.renderers import FastJSONRenderer
+from tournamentapp.api.serializers import LeaderboardSerializer, MatchSerializer, ScheduleSerializer
+from tournamentapp.api.views import LeaderboardAPIView
+from tournamentapp.models import Field, Match, Team
+from tournamentapp.timeline import build_timeline
+
+TEAM_COUNT = 40
+REPEAT = 5
+
+
+def _best_of(fn):
+    best = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+@pytest.fixture
+def big_tournament(tournament, user):
+    fields = [
+        Field.objects.create(name=f"Field {i}", tournament=tournament, owner=user)
+        for i in range(4)
+    ]
+    teams = Team.objects.bulk_create(
+        Team(name=f"Team {i:02d}", tournament=tournament) for i in range(TEAM_COUNT)
+    )
+    # one day, so the time-only grid of the baseline doesn't merge slots
+    start = timezone.now().replace(hour=6, minute=0, second=0, microsecond=0)
+    Match.objects.bulk_create(
+        Match(
+            tournament=tournament, home_team=home, away_team=away,
+            field=fields[i % 4], start_time=start + timedelta(minutes=5 * (i // 4)),
+            home_score=i % 3, away_score=i % 2, is_finished=i % 2 == 0,
+        )
+        for i, (home, away) in enumerate(combinations(teams, 2))
+    )
+    return tournament
+
+
+def _schedule_before(tournament):
+    # model instances grouped per match by local time and field name
+    matches = tournament.matches.select_related('field', 'home_team', 'away_team').order_by('start_time')
+    field_names = list(tournament.fields.order_by('name').values_list('name', flat=True))
+    rows = defaultdict(lambda: {field: None for field in field_names})
+    for match in matches:
+        rows[localtime(match.start_time).strftime('%H:%M')][match.field.name] = match
+    timeline = [
+        {'time': time_str, 'matches': [rows[time_str][field] for field in field_names]}
+        for time_str in sorted(rows)
+    ]
+    return ScheduleSerializer({'field_names': field_names, 'timeline': timeline}).data
+
+
+@pytest.mark.django_db
+def test_schedule_projection_and_renderer_faster(big_tournament):
+    query_before, before = _best_of(lambda: _schedule_before(big_tournament))
+    render_before, body_before = _best_of(lambda: JSONRenderer().render(before))
+    query_after, after = _best_of(lambda: build_timeline(big_tournament))
+    render_after, body_after = _best_of(lambda: FastJSONRenderer().render(after))
+
+    print(
+        f"\nschedule ({len(body_after)} bytes): "
+        f"build {query_before * 1000:.1f} -> {query_after * 1000:.1f} ms, "
+        f"render {render_before * 1000:.1f} -> {render_after * 1000:.1f} ms"
+    )
+    assert [
+        {
+            'time': row['time'],
+            'matches': [m and {key: m[key] for key in m if key in MatchSerializer.Meta.fields} for m in row['matches']],
+        }
+        for row in json.loads(body_after)['timeline']
+    ] == [
+        {
+            'time': row['time'],
+            'matches': [
+                m and {**m, 'start_time': m['start_time'].replace('Z', '+00:00')}
+                for m in row['matches']
+            ],
+        }
+        for row in json.loads(body_before)['timeline']
+    ]
+    assert query_after < query_before
+    assert render_after < render_before
+
+
+@pytest.mark.django_db
+def test_leaderboard_without_serializers_faster(big_tournament):
+    payload = LeaderboardAPIView.build(big_tournament)
+
+    serialize_before, _ = _best_of(lambda: JSONRenderer().render(LeaderboardSerializer(payload).data))
+    serialize_after, body = _best_of(lambda: FastJSONRenderer().render(payload))
+
+    print(
+        f"\nleaderboard ({len(body)} bytes): "
+        f"serialize {serialize_before * 1000:.2f} -> {serialize_after * 1000:.2f} ms"
+    )
+    assert serialize_after < serialize_before
+
+
+def test_fast_renderer_matches_drf_output():
+    now = timezone.now()
+    data = {'when': now, 'count': 3, 'items': [None, 'ä', 1.5], 1: 'key'}
+
+    assert json.loads(FastJSONRenderer().render(data)) == json.loads(JSONRenderer().render(data))
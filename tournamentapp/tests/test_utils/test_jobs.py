@@ -0,0 +1,183 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from tournamentapp import jobs
+from tournamentapp.jobs import LOCK_TIMEOUT, claim, enqueue, job, run_next
+from tournamentapp.models import Job
+
+calls = []
+
+
+@job()
+def record(value):
+    calls.append(value)
+
+
+@job(queue='other', max_attempts=2)
+def explode(value):
+    raise RuntimeError(value)
+
+
+@job()
+def claim_later(seconds):
+    time.sleep(seconds)
+    calls.append(claim('default', 'other-worker'))
+
+
+@pytest.fixture(autouse=True)
+def queued_mode(settings):
+    settings.JOBS_RUN_INLINE = False
+    calls.clear()
+
+
+@pytest.mark.django_db
+def test_enqueue_stores_job():
+    enqueue(record, 1, delay=30)
+
+    queued = Job.objects.get()
+    assert queued.queue == 'default'
+    assert queued.name == 'tournamentapp.tests.test_utils.test_jobs.record'
+    assert queued.args == [1]
+    assert queued.status == Job.QUEUED
+    assert queued.run_at > timezone.now() + timedelta(seconds=25)
+
+
+@pytest.mark.django_db
+def test_dedupe_key_keeps_one_queued_job():
+    enqueue(record, 1, dedupe_key='k')
+    enqueue(record, 2, dedupe_key='k')
+    enqueue(record, 3)
+
+    assert Job.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_run_next_runs_and_deletes_job():
+    enqueue(record, 'a')
+
+    assert run_next('default', 'w1')
+    assert calls == ['a']
+    assert not Job.objects.exists()
+    assert not run_next('default', 'w1')
+
+
+@pytest.mark.django_db
+def test_delayed_job_is_not_due():
+    enqueue(record, 'later', delay=60)
+
+    assert not run_next('default', 'w1')
+    assert calls == []
+
+
+@pytest.mark.django_db
+def test_queues_are_isolated():
+    enqueue(record, 'a')
+
+    assert not run_next('other', 'w1')
+    assert run_next('default', 'w1')
+
+
+@pytest.mark.django_db
+def test_failure_retries_with_backoff_then_fails():
+    enqueue(explode, 'boom')
+
+    assert run_next('other', 'w1')
+    retry = Job.objects.get()
+    assert retry.status == Job.QUEUED
+    assert retry.attempts == 1
+    assert retry.run_at > timezone.now()
+    assert 'RuntimeError: boom' in retry.last_error
+
+    Job.objects.update(run_at=timezone.now())
+    assert run_next('other', 'w1')
+    failed = Job.objects.get()
+    assert failed.status == Job.FAILED
+    assert failed.attempts == 2
+    assert not run_next('other', 'w1')
+
+
+def test_backoff_grows_exponentially():
+    assert 4 <= jobs.backoff(1) <= 6
+    assert 16 <= jobs.backoff(3) <= 24
+    assert jobs.backoff(50) <= jobs.BACKOFF_MAX_SECONDS * 1.2
+
+
+@pytest.mark.django_db
+def test_jobs_of_dead_workers_are_reclaimed():
+    enqueue(record, 'a')
+    assert claim('default', 'dead').locked_by == 'dead'
+    assert claim('default', 'w1') is None
+
+    Job.objects.update(locked_at=timezone.now() - LOCK_TIMEOUT - timedelta(seconds=1))
+    reclaimed = claim('default', 'w1')
+    assert reclaimed.locked_by == 'w1'
+    assert reclaimed.attempts == 2
+
+
+@pytest.mark.django_db
+@override_settings(JOB_QUEUES={'default': 2})
+def test_queue_limit_holds_across_workers():
+    for value in range(3):
+        enqueue(record, value)
+        enqueue(explode, value)
+
+    assert claim('default', 'process-1:0')
+    assert claim('default', 'process-2:0')
+    assert claim('default', 'process-2:1') is None
+    # queues without a limit take every claim
+    assert all(claim('other', f'w{i}') for i in range(3))
+
+    Job.objects.filter(queue='default', status=Job.RUNNING).first().delete()
+    assert claim('default', 'process-2:1')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_running_jobs_renew_their_lock(monkeypatch):
+    monkeypatch.setattr(jobs, 'HEARTBEAT_SECONDS', 0.05)
+    enqueue(claim_later, 0.5)
+    job_row = claim('default', 'w1')
+    # running for longer than the lock timeout
+    Job.objects.update(locked_at=timezone.now() - LOCK_TIMEOUT - timedelta(seconds=1))
+
+    assert jobs.execute(job_row)
+    assert calls == [None]
+
+
+@pytest.mark.django_db
+@override_settings(JOBS_RUN_INLINE=True)
+def test_inline_mode_runs_after_commit(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        enqueue(record, 'now')
+        assert calls == []
+
+    assert calls == ['now']
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_workers_burst_drains_queue():
+    for value in range(3):
+        enqueue(record, value)
+
+    call_command('run_workers', '--burst', '--queue', 'default=2', stdout=StringIO(), stderr=StringIO())
+
+    assert sorted(calls) == [0, 1, 2]
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_workers_warns_about_a_process_local_cache(settings):
+    stderr = StringIO()
+    call_command('run_workers', '--burst', stdout=StringIO(), stderr=stderr)
+    assert "private to this process" in stderr.getvalue()
+
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    stderr = StringIO()
+    call_command('run_workers', '--burst', stdout=StringIO(), stderr=stderr)
+    assert stderr.getvalue() == ''
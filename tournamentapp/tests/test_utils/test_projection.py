@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from tournamentapp.models import Match, MatchEvent, Team
+from tournamentapp.projection import project_standings, simulate_positions
+
+
+def test_no_remaining_fixtures_is_certain():
+    probabilities = simulate_positions(
+        points=[3, 6, 0],
+        head_to_head=np.zeros((3, 3)),
+        fixtures=[],
+        scoring_rates=[],
+        runs=100,
+    )
+
+    assert probabilities[1, 0] == 1.0
+    assert probabilities[0, 1] == 1.0
+    assert probabilities[2, 2] == 1.0
+
+
+def test_points_tie_broken_by_head_to_head_then_name():
+    # A, B and C level on points; B beat A 2-0, A and C never met
+    head_to_head = np.zeros((3, 3))
+    head_to_head[1, 0] = 2
+    probabilities = simulate_positions(
+        points=[3, 3, 3],
+        head_to_head=head_to_head,
+        fixtures=[],
+        scoring_rates=[],
+        runs=10,
+    )
+
+    assert probabilities[:, 0].tolist() == [0.0, 1.0, 0.0]
+    assert probabilities[:, 1].tolist() == [0.0, 0.0, 1.0]
+    assert probabilities[:, 2].tolist() == [1.0, 0.0, 0.0]
+
+
+def test_probabilities_are_distributions_and_use_configured_points():
+    probabilities = simulate_positions(
+        points=[0, 1],
+        head_to_head=np.zeros((2, 2)),
+        fixtures=[(0, 1)],
+        scoring_rates=[(1.5, 1.5)],
+        points_for=(3, 0, 0),
+        runs=12_000,
+        batch_size=5_000,
+        seed=1,
+    )
+
+    assert np.allclose(probabilities.sum(axis=0), 1.0)
+    assert np.allclose(probabilities.sum(axis=1), 1.0)
+    # a draw leaves team 1 ahead, so team 0 tops the table only by winning
+    assert 0.3 < probabilities[0, 0] < 0.45
+
+
+@pytest.mark.django_db
+def test_project_standings(tournament, match, field):
+    third = Team.objects.create(name="Team C", tournament=tournament)
+    MatchEvent.objects.create(match=match, event_type='goal', team=match.home_team)
+    match.apply_result()
+    Match.objects.create(
+        tournament=tournament, home_team=match.away_team, away_team=third,
+        field=field, start_time=match.start_time,
+    )
+
+    projection = project_standings(tournament, runs=2_000, seed=3)
+
+    assert projection['runs'] == 2_000
+    assert projection['remaining_matches'] == 1
+    teams = {t['team_name']: t for t in projection['teams']}
+    assert teams["Team A"]['points'] == 3
+    # Team B can at best draw level on points and lost the meeting with Team A
+    assert teams["Team A"]["positions"][0] == 1.0
+    assert projection['teams'][0]['team_name'] == "Team A"
+    assert all(sum(t['positions']) == pytest.approx(1.0) for t in projection['teams'])
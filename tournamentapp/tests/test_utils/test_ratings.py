@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+
+from tournamentapp.models import Match, MatchEvent, RatingChange, Team
+from tournamentapp.ratings import DEFAULT_RATING, rating_delta
+from tournamentapp.utils import recalculate_points
+
+
+def test_rating_delta_rewards_upsets_and_margins():
+    assert rating_delta(1500, 1500, 1, 1) == 0
+    assert rating_delta(1500, 1500, 1, 0) == pytest.approx(15)
+    assert rating_delta(1500, 1500, 2, 0) > rating_delta(1500, 1500, 1, 0)
+    assert rating_delta(1400, 1600, 1, 0) > rating_delta(1600, 1400, 1, 0)
+    assert rating_delta(1600, 1400, 1, 1) < 0
+
+
+def _goal(match, team, count=1):
+    for _ in range(count):
+        MatchEvent.objects.create(match=match, event_type='goal', team=team)
+
+
+@pytest.mark.django_db
+def test_apply_result_updates_ratings_and_history(match):
+    _goal(match, match.home_team)
+    match.apply_result()
+
+    home = Team.objects.get(pk=match.home_team_id)
+    away = Team.objects.get(pk=match.away_team_id)
+    assert home.rating == pytest.approx(DEFAULT_RATING + 15)
+    assert away.rating == pytest.approx(DEFAULT_RATING - 15)
+
+    change = RatingChange.objects.get(match=match, team=home)
+    assert change.rating_before == DEFAULT_RATING
+    assert change.rating_after == pytest.approx(home.rating)
+
+
+@pytest.mark.django_db
+def test_recalculate_points_rerates_from_pre_match_ratings(match):
+    _goal(match, match.home_team)
+    match.apply_result()
+    _goal(match, match.away_team, count=3)
+
+    recalculate_points(match)
+
+    home = Team.objects.get(pk=match.home_team_id)
+    expected = rating_delta(DEFAULT_RATING, DEFAULT_RATING, 1, 3)
+    assert home.rating == pytest.approx(DEFAULT_RATING + expected)
+    assert RatingChange.objects.filter(match=match).count() == 2
+    assert RatingChange.objects.get(match=match, team=home).rating_before == DEFAULT_RATING
+
+
+@pytest.mark.django_db
+def test_replay_ratings_matches_incremental_updates(tournament, match, field):
+    third = Team.objects.create(name="Team C", tournament=tournament)
+    second = Match.objects.create(
+        tournament=tournament, home_team=third, away_team=match.home_team,
+        field=field, start_time=match.start_time + timedelta(hours=1),
+    )
+    _goal(match, match.home_team, count=2)
+    match.apply_result()
+    _goal(second, third)
+    second.apply_result()
+    incremental = dict(Team.objects.values_list('name', 'rating'))
+
+    Team.objects.update(rating=0)
+    RatingChange.objects.all().delete()
+    call_command('replay_ratings', tournament=tournament.slug)
+
+    replayed = dict(Team.objects.values_list('name', 'rating'))
+    assert replayed == pytest.approx(incremental)
+    assert RatingChange.objects.count() == 4
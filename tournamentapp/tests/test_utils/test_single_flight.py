@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from tournamentapp import singleflight
+from tournamentapp.cache import RESULTS, bump_version, cached_payload, payload_key
+from tournamentapp.singleflight import single_flight
+
+
+class CountingBuilder:
+    def __init__(self, value='fresh', delay=0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def test_concurrent_misses_build_once():
+    builder = CountingBuilder(delay=0.2)
+    results = []
+
+    def read():
+        results.append(single_flight('payload', builder, 60))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builder.calls == 1
+    assert results == ['fresh'] * 8
+    assert cache.get('payload') == 'fresh'
+    assert cache.get('payload:lease') is None
+
+
+def test_followers_get_stale_while_leader_rebuilds():
+    cache.set('payload:stale', 'old')
+    builder = CountingBuilder(delay=0.3)
+    leader = threading.Thread(target=single_flight, args=('payload', builder, 60, 'payload:stale'))
+    leader.start()
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    assert single_flight('payload', CountingBuilder('other'), 60, 'payload:stale') == 'old'
+    assert time.monotonic() - started < 0.2
+
+    leader.join()
+    assert cache.get('payload') == 'fresh'
+    assert cache.get('payload:stale') == 'fresh'
+
+
+def test_lease_held_by_other_worker_serves_stale():
+    cache.add('payload:lease', True)
+    cache.set('payload:stale', 'old')
+    builder = CountingBuilder()
+
+    assert single_flight('payload', builder, 60, 'payload:stale') == 'old'
+    assert builder.calls == 0
+
+
+def test_lease_held_by_other_worker_waits_for_value():
+    cache.add('payload:lease', True)
+    threading.Timer(0.1, cache.set, args=('payload', 'theirs')).start()
+    builder = CountingBuilder()
+
+    assert single_flight('payload', builder, 60) == 'theirs'
+    assert builder.calls == 0
+
+
+def test_abandoned_lease_does_not_stall_readers(monkeypatch):
+    monkeypatch.setattr(singleflight, 'WAIT_SECONDS', 0.1)
+    cache.add('payload:lease', True)
+    builder = CountingBuilder()
+
+    assert single_flight('payload', builder, 60) == 'fresh'
+    assert builder.calls == 1
+
+
+def test_failed_build_releases_lease():
+    def broken():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        single_flight('payload', broken, 60)
+
+    assert cache.get('payload:lease') is None
+    assert single_flight('payload', CountingBuilder(), 60) == 'fresh'
+
+
+@pytest.mark.django_db
+def test_cached_payload_serves_previous_version_during_rebuild(tournament):
+    cached_payload('standings', tournament.pk, [RESULTS], lambda: 'v1')
+    bump_version(tournament.pk, RESULTS)
+    # another worker took the lease for the new version
+    cache.add(payload_key('standings', tournament.pk, [RESULTS]) + ':lease', True)
+
+    assert cached_payload('standings', tournament.pk, [RESULTS], lambda: 'v2') == 'v1'
+
+    cache.clear()
+    assert cached_payload('standings', tournament.pk, [RESULTS], lambda: 'v2') == 'v2'
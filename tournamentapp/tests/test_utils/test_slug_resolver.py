@@ -0,0 +1,105 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from tournamentapp import slugs
+from tournamentapp.cache import TOURNAMENT, bump_version
+from tournamentapp.models import Tournament
+from tournamentapp.slugs import resolve_tournament
+
+
+@pytest.fixture(autouse=True)
+def empty_lru():
+    slugs._rows.clear()
+    yield
+    slugs._rows.clear()
+
+
+def _queries(func):
+    with CaptureQueriesContext(connection) as queries:
+        result = func()
+    return result, len(queries)
+
+
+@pytest.mark.django_db
+def test_resolves_case_insensitively(tournament):
+    assert resolve_tournament(tournament.slug.upper()).pk == tournament.pk
+    assert resolve_tournament('no-such-tournament') is None
+
+
+@pytest.mark.django_db
+def test_warm_lookups_skip_the_database(tournament):
+    resolve_tournament(tournament.slug)
+    resolve_tournament(tournament.slug)
+
+    found, queries = _queries(lambda: resolve_tournament(tournament.slug))
+    assert found.pk == tournament.pk
+    assert found.show_leaderboard is True
+    assert queries == 0
+
+
+@pytest.mark.django_db
+def test_each_lookup_gets_its_own_instance(tournament):
+    first = resolve_tournament(tournament.slug)
+    first.name = 'Changed in one request'
+
+    assert resolve_tournament(tournament.slug).name == tournament.name
+
+
+@pytest.mark.django_db
+def test_save_invalidates(tournament):
+    resolve_tournament(tournament.slug)
+    old_slug = tournament.slug
+
+    tournament.name = 'Renamed Cup'
+    tournament.show_leaderboard = False
+    tournament.save()
+
+    assert resolve_tournament(old_slug) is None
+    assert resolve_tournament('renamed-cup').show_leaderboard is False
+
+
+@pytest.mark.django_db
+def test_saves_in_other_processes_are_noticed(tournament):
+    for _ in range(2):
+        resolve_tournament(tournament.slug)
+
+    # another worker's save: the row and the shared version change, this
+    # process's LRU is untouched
+    Tournament.objects.filter(pk=tournament.pk).update(show_vendors=False)
+    bump_version(tournament.pk, TOURNAMENT)
+
+    assert resolve_tournament(tournament.slug).show_vendors is False
+
+
+@pytest.mark.django_db
+def test_least_recently_used_entries_are_evicted(user, monkeypatch):
+    monkeypatch.setattr(slugs._rows, 'size', 2)
+    cups = [Tournament.objects.create(name=f'Cup {i}', owner=user) for i in range(3)]
+    for cup in cups:
+        resolve_tournament(cup.slug)
+
+    assert slugs._rows.get(cups[0].slug) is None
+    assert slugs._rows.get(cups[2].slug) is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint', ['', 'schedule/', 'leaderboard/', 'crosstable/', 'changes/'])
+def test_public_api_slugs_are_case_insensitive(tournament, endpoint):
+    response = Client().get(f'/api/tournaments/{tournament.slug.upper()}/{endpoint}')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_entries_expire_even_without_a_version_bump(tournament, monkeypatch):
+    for _ in range(2):
+        resolve_tournament(tournament.slug)
+
+    # the bump never reached this process, e.g. the cache was flushed
+    Tournament.objects.filter(pk=tournament.pk).update(show_vendors=False)
+    assert resolve_tournament(tournament.slug).show_vendors is True
+
+    later = slugs.time.monotonic() + slugs.SLUG_CACHE_TTL + 1
+    monkeypatch.setattr(slugs.time, 'monotonic', lambda: later)
+    assert resolve_tournament(tournament.slug).show_vendors is False
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tournamentapp.api.views import ScheduleAPIView
+from tournamentapp.models import Field, Match, Team
+from tournamentapp.timeline import build_timeline, get_timeline
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def away(tournament):
+    return Team.objects.create(name="Away", tournament=tournament)
+
+
+def _match(tournament, home, away, field, start):
+    return Match.objects.create(
+        tournament=tournament, home_team=home, away_team=away, field=field, start_time=start,
+    )
+
+
+@pytest.mark.django_db
+def test_same_time_on_different_days_gets_separate_rows(tournament, team, away, field):
+    first = _match(tournament, team, away, field, _utc(2026, 6, 1, 10))
+    second = _match(tournament, away, team, field, _utc(2026, 6, 2, 10))
+
+    data = build_timeline(tournament)
+
+    assert data['days'] == ['2026-06-01', '2026-06-02']
+    assert [(row['date'], row['time']) for row in data['timeline']] == [
+        ('2026-06-01', '10:00'), ('2026-06-02', '10:00'),
+    ]
+    assert [row['matches'][0]['id'] for row in data['timeline']] == [first.pk, second.pk]
+
+
+@pytest.mark.django_db
+def test_columns_are_keyed_by_field_id(tournament, user, team, away, field):
+    other = Field.objects.create(name="Annex", tournament=tournament, owner=user)
+    on_field = _match(tournament, team, away, field, _utc(2026, 6, 1, 10))
+    on_other = _match(tournament, away, team, other, _utc(2026, 6, 1, 10))
+
+    data = build_timeline(tournament)
+
+    assert data['fields'] == [{'id': other.pk, 'name': 'Annex'}, {'id': field.pk, 'name': field.name}]
+    assert [(m['id'], m['field_id']) for m in data['timeline'][0]['matches']] == [
+        (on_other.pk, other.pk), (on_field.pk, field.pk),
+    ]
+
+
+@pytest.mark.django_db
+def test_rows_are_in_the_tournament_timezone(tournament, team, away, field):
+    tournament.timezone = 'Europe/Sofia'
+    tournament.save()
+    _match(tournament, team, away, field, _utc(2026, 6, 1, 22, 30))
+
+    row, = build_timeline(tournament)['timeline']
+
+    assert row['slot'] == '2026-06-02T01:30:00+03:00'
+    assert (row['date'], row['time']) == ('2026-06-02', '01:30')
+    assert row['matches'][0]['start_time'] == '2026-06-01T22:30:00+00:00'
+
+
+@pytest.mark.django_db
+def test_unknown_timezone_is_rejected(tournament):
+    tournament.timezone = 'Mars/Olympus_Mons'
+    with pytest.raises(ValidationError):
+        tournament.full_clean()
+
+
+@pytest.mark.django_db
+def test_built_in_one_pass_over_the_matches(tournament, team, away, field):
+    for hour in range(8, 18):
+        _match(tournament, team, away, field, _utc(2026, 6, 1, hour))
+
+    with CaptureQueriesContext(connection) as queries:
+        build_timeline(tournament)
+
+    # the fields, then the matches
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    STATIC_URL='/static/',
+)
+def test_detail_page_and_schedule_api_share_the_grid(auth_client, tournament, team, away, field):
+    match = _match(tournament, team, away, field, _utc(2026, 6, 1, 10))
+
+    response = auth_client.get(reverse('tournament-detail', kwargs={'pk': tournament.pk}))
+    assert response.status_code == 200
+    assert f'data-match-id="{match.pk}"' in response.content.decode()
+
+    with CaptureQueriesContext(connection) as queries:
+        data = ScheduleAPIView.build(tournament)
+    assert len(queries) == 0
+    assert data == get_timeline(tournament)
+
+
+@pytest.mark.django_db
+def test_edited_kick_off_stays_on_the_match_day_in_the_tournament_timezone(
+        auth_client, tournament, team, away, field):
+    tournament.timezone = 'America/New_York'
+    tournament.tournament_date = datetime(2026, 6, 1).date()
+    tournament.save()
+    match = _match(tournament, team, away, field, _utc(2026, 6, 2, 14))
+
+    response = auth_client.post(
+        reverse('edit-match', kwargs={'tournament_id': tournament.pk, 'match_id': match.pk}),
+        {'start_time': '11:00', 'field': field.pk},
+    )
+
+    assert response.status_code == 302
+    match.refresh_from_db()
+    assert match.start_time == _utc(2026, 6, 2, 15)
@@ -0,0 +1,125 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from tournamentapp.models import MatchEvent, Player
+from tournamentapp.utils import get_top_scorers, get_scorers_page
+
+
+def score(match, player, goals):
+    for _ in range(goals):
+        MatchEvent.objects.create(
+            match=match, event_type='goal', team=player.team, player=player, minute=1
+        )
+
+
+def goals(*players):
+    counts = dict(Player.objects.filter(pk__in=[p.pk for p in players]).values_list('pk', 'goal_count'))
+    return [counts[p.pk] for p in players]
+
+
+@pytest.mark.django_db
+def test_goal_count_follows_event_create_and_delete(match, team):
+    player = team.players.create(name="Scorer")
+
+    score(match, player, 2)
+    player.refresh_from_db()
+    assert player.goal_count == 2
+
+    MatchEvent.objects.filter(player=player).first().delete()
+    player.refresh_from_db()
+    assert player.goal_count == 1
+
+
+@pytest.mark.django_db
+def test_cards_do_not_change_goal_count(match, team):
+    player = team.players.create(name="Defender")
+    MatchEvent.objects.create(match=match, event_type='yellow_card', team=team, player=player)
+    player.refresh_from_db()
+    assert player.goal_count == 0
+
+
+@pytest.mark.django_db
+def test_goal_count_follows_event_edits(match, team):
+    scorer = team.players.create(name="Scorer")
+    other = team.players.create(name="Other")
+    score(match, scorer, 1)
+    event = MatchEvent.objects.get(player=scorer)
+
+    event.player = other
+    event.save()
+    assert goals(scorer, other) == [0, 1]
+
+    event.event_type = 'yellow_card'
+    event.save()
+    assert goals(scorer, other) == [0, 0]
+
+    event.event_type, event.player = 'goal', scorer
+    event.minute = 80
+    event.save()
+    event.save()
+    assert goals(scorer, other) == [1, 0]
+
+
+@pytest.mark.django_db
+def test_top_scorers_include_ties_at_cutoff(tournament, match, team):
+    players = [team.players.create(name=f"P{i}") for i in range(4)]
+    score(match, players[0], 3)
+    score(match, players[1], 2)
+    score(match, players[2], 2)
+    score(match, players[3], 1)
+
+    top = get_top_scorers(tournament, limit=2)
+
+    assert [p.name for p in top] == ["P0", "P1", "P2"]
+    assert [p.position for p in top] == [1, 2, 2]
+
+
+@pytest.mark.django_db
+def test_top_scorers_when_fewer_scorers_than_limit(tournament, match, team):
+    player = team.players.create(name="Only")
+    team.players.create(name="Nobody")
+    score(match, player, 1)
+
+    top = get_top_scorers(tournament, limit=5)
+    assert [p.name for p in top] == ["Only"]
+
+
+@pytest.mark.django_db
+def test_scorers_page_positions_continue_across_pages(tournament, match, team):
+    players = [team.players.create(name=f"P{i}") for i in range(5)]
+    for player, goals in zip(players, [4, 3, 3, 3, 1]):
+        score(match, player, goals)
+
+    page = get_scorers_page(tournament, 2, per_page=2)
+
+    assert [p.name for p in page.object_list] == ["P2", "P3"]
+    assert [p.position for p in page.object_list] == [2, 2]
+
+    last = get_scorers_page(tournament, 3, per_page=2)
+    assert [p.position for p in last.object_list] == [5]
+
+
+@pytest.mark.django_db
+def test_deleting_match_refreshes_goal_counts(auth_client, tournament, match, team):
+    player = team.players.create(name="Scorer")
+    score(match, player, 2)
+
+    auth_client.post(reverse('delete-match', kwargs={
+        'tournament_id': tournament.pk, 'match_id': match.pk
+    }))
+
+    player.refresh_from_db()
+    assert player.goal_count == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_goal_counts_fixes_drift(tournament, match, team):
+    player = team.players.create(name="Scorer")
+    score(match, player, 2)
+    Player.objects.filter(pk=player.pk).update(goal_count=7)
+
+    call_command('rebuild_goal_counts', tournament=tournament.slug)
+
+    player.refresh_from_db()
+    assert player.goal_count == 2
@@ -0,0 +1,122 @@
+"""
+The schedule grid of a tournament.
+
+The organiser's tournament page and the public schedule show the same
+grid: one row per kick-off slot and one column per field. `get_timeline`
+builds it in a single pass over a `values()` projection of the matches,
+and caches it until the schedule or results change. Both views read the
+same cached payload.
+
+Rows are keyed by the full local kick-off datetime, in the tournament's
+own timezone, and columns by field id. Matches on different days, or on
+two fields that share a name, each keep a cell of their own. Matches
+sharing a kick-off are converted to local time once.
+"""
+from django.db.models import F
+
+from .cache import RESULTS, SCHEDULE, cached_payload
+from .models import Match
+
+TIMELINE_SCOPES = [SCHEDULE, RESULTS]
+
+
+def timeline_matches(matches, tzinfo):
+    """
+    Timeline entries of a Match queryset, in kick-off order, with the
+    local `slot` (and its `date` and `time`) of the row they belong to.
+    """
+    rows = (
+        matches
+        .order_by('start_time', 'id')
+        .values(
+            'id', 'start_time', 'home_score', 'away_score', 'is_finished', 'field_id',
+            home=F('home_team__name'), away=F('away_team__name'), field_name=F('field__name'),
+        )
+    )
+    # start_time -> (slot, date, time)
+    local = {}
+    entries = []
+    for m in rows:
+        start = m['start_time']
+        slot = local.get(start)
+        if slot is None:
+            kick_off = start.astimezone(tzinfo)
+            slot = local[start] = (
+                kick_off.isoformat(), kick_off.date().isoformat(), kick_off.strftime('%H:%M'),
+            )
+        entries.append({
+            "id": m['id'],
+            "slot": slot[0],
+            "date": slot[1],
+            "time": slot[2],
+            "home_team": m['home'],
+            "away_team": m['away'],
+            "field": m['field_name'],
+            "field_id": m['field_id'],
+            "start_time": start.isoformat(),
+            "home_score": m['home_score'],
+            "away_score": m['away_score'],
+            "is_finished": m['is_finished'],
+        })
+    return entries
+
+
+def build_timeline(tournament):
+    """
+    Returns:
+        {
+            'timezone': the tournament's timezone name,
+            'fields': [{'id', 'name'}, ...] ordered by name,
+            'field_names': the names of `fields`, in the same order,
+            'days': ['YYYY-MM-DD', ...] with at least one match,
+            'timeline': [
+                {
+                    'slot': local kick-off, ISO 8601 with offset,
+                    'date': 'YYYY-MM-DD',
+                    'time': 'HH:MM',
+                    'matches': [match_or_none, ...] one per field,
+                },
+                ...
+            ],
+            'current_matches': unfinished matches, in kick-off order,
+        }
+    """
+    fields = list(tournament.fields.order_by('name', 'id').values('id', 'name'))
+    column = {field['id']: i for i, field in enumerate(fields)}
+
+    rows = {}
+    current_matches = []
+    for match in timeline_matches(Match.objects.filter(tournament=tournament), tournament.tzinfo):
+        row = rows.get(match['slot'])
+        if row is None:
+            row = rows[match['slot']] = {
+                "slot": match['slot'],
+                "date": match['date'],
+                "time": match['time'],
+                "matches": [None] * len(fields),
+            }
+        row['matches'][column[match['field_id']]] = match
+
+        if not match['is_finished']:
+            current_matches.append({
+                key: match[key]
+                for key in ("id", "home_team", "away_team", "field", "field_id", "home_score", "away_score")
+            })
+
+    timeline = list(rows.values())
+    return {
+        "timezone": tournament.timezone,
+        "fields": fields,
+        "field_names": [field['name'] for field in fields],
+        "days": list(dict.fromkeys(row['date'] for row in timeline)),
+        "timeline": timeline,
+        "current_matches": current_matches,
+    }
+
+
+def get_timeline(tournament, stale=True):
+    """The cached `build_timeline` payload of the tournament."""
+    return cached_payload(
+        'timeline', tournament.pk, TIMELINE_SCOPES,
+        lambda: build_timeline(tournament), stale=stale,
+    )
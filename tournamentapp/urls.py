@@ -3,9 +3,9 @@ from .views import (
     TournamentCreateView, TournamentDetailView, TournamentUpdateView, TournamentDeleteView, LandingPageView,
     TeamListView, TeamDetailView, TeamCreateView,
     MatchCreateView, MatchDetailView, MatchEditView, LeaderboardView, FieldAddView,
-    create_match_event, add_player, finish_match, remove_match_event, field_edit, field_delete,
+    create_match_event, batch_match_events, match_clock, add_player, finish_match, remove_match_event, field_edit, field_delete,
     generate_tournament_schedule, about_view, contact_view, privacy_policy_view, toggle_tournament_status,
-    reset_schedule, edit_match, delete_match, toggle_player_mute, SpaView, DashboardView, rename_player
+    reset_schedule, edit_match, delete_match, toggle_player_mute, SpaView, FieldScoreboardView, DashboardView, rename_player
 )
 urlpatterns = [
     path('', LandingPageView.as_view(), name='landing-page'),
@@ -22,6 +22,7 @@ urlpatterns = [
     path('tournament/<int:pk>/delete', TournamentDeleteView.as_view(), name='tournament-delete'),
     path('tournament/<int:pk>/dashboard', DashboardView.as_view(), name='tournament-dashboard'),
     path('public/<slug:slug>/', SpaView.as_view(), name='public-tournament-leaderboard'),
+    path('display/<slug:slug>/fields/<int:field_id>/', FieldScoreboardView.as_view(), name='field-scoreboard'),
     path('public/<slug:slug>/<path:path>', SpaView.as_view()),
     path('tournament/<int:tournament_id>/generate-schedule/', generate_tournament_schedule, name='generate-tournament-schedule'),
     path('tournament/<int:tournament_id>/reset-schedule/', reset_schedule, name='reset-schedule'),
@@ -40,6 +41,8 @@ urlpatterns = [
     path('tournament/<int:tournament_id>/matches/<int:pk>/', MatchDetailView.as_view(), name='match-detail'),
     path('tournament/<int:tournament_id>/matches/<int:pk>/edit/', MatchEditView.as_view(), name='match-edit'),
     path('tournament/<int:tournament_id>/matches/<int:match_id>/add-event/', create_match_event, name='add-match-event'),
+    path('tournament/<int:tournament_id>/matches/<int:match_id>/events/batch/', batch_match_events, name='batch-match-events'),
+    path('tournament/<int:tournament_id>/matches/<int:match_id>/clock/', match_clock, name='match-clock'),
     path('tournament/<int:tournament_id>/matches/<int:match_id>/finish/', finish_match, name='finish-match'),
     path('tournament/<int:tournament_id>/matches/delete-event/<int:event_id>/', remove_match_event, name='delete-match-event'),
     path('tournament/<int:tournament_id>/matches/<int:match_id>/reschedule/', edit_match, name='edit-match'),
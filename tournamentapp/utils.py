@@ -1,12 +1,17 @@
 from django.contrib import messages
 from django.db import transaction
-from django.db.models import Q, F, Count, ExpressionWrapper, DateTimeField
+from django.core.paginator import Paginator
+from django.db.models import Q, F, Count, ExpressionWrapper, DateTimeField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django.utils.timezone import localtime
 from collections import defaultdict
 from datetime import timedelta, datetime
 from typing import List, Tuple, Optional
-from .models import Team, Player, Tournament, Match, Field, MatchEvent
+from .models import Team, Player, Tournament, Match, Field, MatchEvent, RatingChange, ChangeLogEntry
+from .ratings import DEFAULT_RATING, rating_delta
+from .cache import RESULTS, SCHEDULE, bump_version
+from .scoreboard import invalidate_tournament_scoreboards
+from .changes import record_change
 import json
 import logging
 import random
@@ -218,6 +223,9 @@ def create_round_robin_matches(
                 )
 
         Match.objects.bulk_create(matches_to_create)
+        bump_version(tournament.pk, SCHEDULE, RESULTS)
+        invalidate_tournament_scoreboards(tournament.pk)
+        record_change(tournament.pk, ChangeLogEntry.SCHEDULE, 0)
 
 def propagate_match_delay(match, new_start_time):
     """
@@ -250,6 +258,8 @@ def propagate_match_delay(match, new_start_time):
                 )
             )
         )
+        invalidate_tournament_scoreboards(match.tournament_id)
+        record_change(match.tournament_id, ChangeLogEntry.SCHEDULE, 0)
 
 def get_team_standings(tournament):
     """
@@ -315,68 +325,173 @@ def get_team_standings(tournament):
 
     return sorted_teams
 
-def get_top_scorers(tournament, limit=5):
+FORM_LENGTH = 5
+
+def get_team_records(tournament):
     """
-    Returns the top scoring players in a tournament.
-    Annotates each player with 'goal_count'.
+    Returns {team_id: record} for every team that has played, built from
+    a single pass over finished matches in kick-off order.
+
+    A record holds wins/draws/losses, goals for/against, `form` (the last
+    five results as "W"/"D"/"L", most recent last) and the current
+    `win_streak` and `unbeaten_streak`.
     """
+    records = defaultdict(lambda: {
+        'wins': 0,
+        'draws': 0,
+        'losses': 0,
+        'goals_for': 0,
+        'goals_against': 0,
+        'form': '',
+        'win_streak': 0,
+        'unbeaten_streak': 0,
+    })
+
+    results = (
+        Match.objects
+        .filter(tournament=tournament, is_finished=True)
+        .order_by('start_time', 'pk')
+        .values_list('home_team_id', 'away_team_id', 'home_score', 'away_score')
+    )
+    for home_id, away_id, home_score, away_score in results:
+        for team_id, gf, ga in (
+            (home_id, home_score, away_score),
+            (away_id, away_score, home_score),
+        ):
+            record = records[team_id]
+            record['goals_for'] += gf
+            record['goals_against'] += ga
+            if gf > ga:
+                record['wins'] += 1
+                record['win_streak'] += 1
+                record['unbeaten_streak'] += 1
+                outcome = 'W'
+            elif gf == ga:
+                record['draws'] += 1
+                record['win_streak'] = 0
+                record['unbeaten_streak'] += 1
+                outcome = 'D'
+            else:
+                record['losses'] += 1
+                record['win_streak'] = 0
+                record['unbeaten_streak'] = 0
+                outcome = 'L'
+            record['form'] = (record['form'] + outcome)[-FORM_LENGTH:]
+
+    return records
+
+def _ranked_scorers(tournament):
+    return (
+        Player.objects
+        .filter(team__tournament=tournament, goal_count__gt=0)
+        .select_related('team')
+        .order_by('-goal_count', 'name')
+    )
 
-    top_players = Player.objects.filter(
-        team__tournament=tournament
-    ).annotate(
-        goal_count=Count(
-            'match_events',
-            filter=Q(match_events__event_type='goal')
-        )
-    ).filter(
-        goal_count__gt=0
-    ).order_by('-goal_count')[:limit]
+def _assign_positions(players, first_position=1, previous=None):
+    """
+    Set `position` on each player using standard competition ranking
+    (1, 2, 2, 4): tied players share the position of the first of them.
 
-    return top_players
+    `previous` is the (goal_count, position) of the player ranked just
+    before `players`, used when ranking a page that doesn't start at 1.
+    """
+    last_goals, last_position = previous or (None, None)
+    for offset, player in enumerate(players):
+        if player.goal_count == last_goals:
+            player.position = last_position
+        else:
+            player.position = first_position + offset
+            last_goals, last_position = player.goal_count, player.position
+    return players
 
-def build_timeline(tournament):
+def get_top_scorers(tournament, limit=5):
     """
-    Builds a timeline structure for matches grouped by time and field.
+    Returns the top `limit` scorers of a tournament with their `position`,
+    plus everyone tied with the last of them.
 
-    Returns:
-        timeline: [
-            {
-                'time': 'HH:MM',
-                'matches': [match_or_none, ...]
-            },
-            ...
-        ]
-        field_names: ordered list of field names
+    Reads the maintained `Player.goal_count`, so this is two index-ordered
+    queries rather than an aggregate over every match event.
     """
+    ranked = _ranked_scorers(tournament)
 
-    # Get all matches with related data
-    matches = (
-        tournament.matches
-        .select_related('field', 'home_team', 'away_team')
-        .order_by('start_time')
-    )
+    cutoff = ranked.values_list('goal_count', flat=True)[limit - 1:limit].first()
+    if cutoff is None:
+        return _assign_positions(list(ranked[:limit]))
 
-    # Always derive fields from tournament (more stable than from matches)
-    field_names = list(
-        tournament.fields.order_by('name').values_list('name', flat=True)
-    )
+    return _assign_positions(list(ranked.filter(goal_count__gte=cutoff)))
 
-    # Initialize timeline structure
-    timeline_dict = defaultdict(lambda: {field: None for field in field_names})
+def get_scorers_page(tournament, page_number, per_page=25):
+    """
+    Returns a Django `Page` of every scorer in the tournament, ranked,
+    with `position` set on each player.
+    """
+    ranked = _ranked_scorers(tournament)
+    page = Paginator(ranked, per_page).get_page(page_number)
+
+    players = list(page.object_list)
+    if players:
+        first = players[0]
+        better = ranked.filter(goal_count__gt=first.goal_count).count()
+        _assign_positions(players, first_position=page.start_index(),
+                          previous=(first.goal_count, better + 1))
+    page.object_list = players
+    return page
+
+def refresh_goal_counts(players):
+    """
+    Recompute `goal_count` for the given players from their goal events
+    in a single UPDATE. Used after bulk inserts/deletes that bypass
+    `MatchEvent.save()`/`delete()` and by `rebuild_goal_counts`.
+    """
+    goals = (
+        MatchEvent.objects
+        .filter(player=OuterRef('pk'), event_type='goal')
+        .order_by()
+        .values('player')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return players.update(goal_count=Coalesce(Subquery(goals), 0))
 
-    for match in matches:
-        time_str = localtime(match.start_time).strftime('%H:%M')
-        timeline_dict[time_str][match.field.name] = match
+def build_crosstable(tournament):
+    """
+    Builds the head-to-head grid of finished matches.
 
-    timeline = [
+    Returns:
         {
-            'time': time_str,
-            'matches': [timeline_dict[time_str][field] for field in field_names],
+            'teams': [team names, alphabetical],
+            'matrix': N x N list where matrix[i][j] is the score of team i
+                      against team j from team i's side ("2-1"), repeat
+                      meetings joined by ", ", or None if they haven't met
         }
-        for time_str in sorted(timeline_dict.keys())
-    ]
+    """
+    teams = list(
+        tournament.teams.order_by('name').values_list('id', 'name')
+    )
+    index = {team_id: i for i, (team_id, _) in enumerate(teams)}
+    size = len(teams)
+    matrix = [[None] * size for _ in range(size)]
 
-    return timeline, field_names
+    results = (
+        Match.objects
+        .filter(tournament=tournament, is_finished=True)
+        .order_by('start_time')
+        .values_list('home_team_id', 'away_team_id', 'home_score', 'away_score')
+    )
+    for home_id, away_id, home_score, away_score in results:
+        home, away = index[home_id], index[away_id]
+        for row, col, score in (
+            (home, away, f"{home_score}-{away_score}"),
+            (away, home, f"{away_score}-{home_score}"),
+        ):
+            cell = matrix[row][col]
+            matrix[row][col] = score if cell is None else f"{cell}, {score}"
+
+    return {
+        'teams': [name for _, name in teams],
+        'matrix': matrix,
+    }
 
 def recalculate_match_points(match, new_home_score, new_away_score):
     """
@@ -413,13 +528,48 @@ def recalculate_match_points(match, new_home_score, new_away_score):
         home_team.save()
         away_team.save()
 
+def replay_ratings(tournament):
+    """
+    Rebuild every team's rating and the rating history of a tournament
+    from its finished matches, in kick-off order.
+    """
+    teams = {team.pk: team for team in tournament.teams.all()}
+    for team in teams.values():
+        team.rating = DEFAULT_RATING
+
+    changes = []
+    results = (
+        Match.objects
+        .filter(tournament=tournament, is_finished=True)
+        .order_by('start_time', 'pk')
+        .values_list('pk', 'home_team_id', 'away_team_id', 'home_score', 'away_score')
+    )
+    for match_id, home_id, away_id, home_score, away_score in results:
+        home, away = teams[home_id], teams[away_id]
+        delta = rating_delta(home.rating, away.rating, home_score, away_score)
+        for team, change in ((home, delta), (away, -delta)):
+            changes.append(RatingChange(
+                team=team, match_id=match_id,
+                rating_before=team.rating, rating_after=team.rating + change,
+            ))
+            team.rating += change
+
+    with transaction.atomic():
+        RatingChange.objects.filter(match__tournament=tournament).delete()
+        RatingChange.objects.bulk_create(changes)
+        Team.objects.bulk_update(teams.values(), ['rating'])
+        bump_version(tournament.pk, RESULTS)
+
+    return len(changes) // 2
+
 def reset_tournament_schedule(tournament):
     """
     Delete all matches (cascades to MatchEvent) and reset team points.
     """
     with transaction.atomic():
         tournament.matches.all().delete()
-        tournament.teams.all().update(tournament_points=0)
+        tournament.teams.all().update(tournament_points=0, rating=DEFAULT_RATING)
+        Player.objects.filter(team__tournament=tournament).update(goal_count=0)
 
 def recalculate_points(match):
     tournament = match.tournament
@@ -458,6 +608,8 @@ def recalculate_points(match):
         home.tournament_points += tournament.points_for_draw
         away.tournament_points += tournament.points_for_draw
 
+    match.update_ratings(home, away, home_goals, away_goals)
+
     home.save()
     away.save()
 
@@ -10,6 +10,7 @@ from django.views.generic.edit import CreateView, UpdateView
 from django.http import JsonResponse, HttpResponseForbidden, Http404
 from django.utils.timezone import localtime
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from datetime import timedelta, datetime
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -19,12 +20,22 @@ from .models import Match, Team, GoalEvent, Player, MatchEvent, Field, Tournamen
 from .forms import TeamCreateForm, TeamNameForm, MatchCreateForm, MatchEditForm, MatchEventForm, FieldCreateForm, TournamentCreateForm, TournamentUpdateForm, TournamentScheduleForm, MatchRescheduleForm
 from .mixins import TournamentOwnerMixin, TournamentAccessMixin
 from django.urls import reverse_lazy, reverse
-from django.db.models import Q, Count, F
+from django.db import transaction
+from django.db.models import Q, Count
 from collections import defaultdict
 from django.utils.timezone import localtime, datetime
 from formtools.wizard.views import SessionWizardView
-from .utils import create_round_robin_matches, propagate_match_delay, get_team_standings, get_top_scorers, build_timeline, reset_tournament_schedule, recalculate_points, get_vite_asset
-from .services import handle_batch_lines
+from .utils import create_round_robin_matches, propagate_match_delay, get_team_standings, get_top_scorers, reset_tournament_schedule, recalculate_points, get_vite_asset, refresh_goal_counts
+from .services import handle_batch_lines, record_event_batch, MAX_EVENT_BATCH
+from .suspensions import apply_suspensions
+from .cache import PAYLOAD_TIMEOUT, get_versions
+from .timeline import TIMELINE_SCOPES, get_timeline
+from .clock import change_clock, current_minute, clock_minute, stop_clock
+from .scoreboard import get_scoreboard_document
+from .routers import replica_reads
+from .slugs import resolve_tournament
+from .snapshots import schedule_snapshot_sync, snapshot_base_url
+from .warming import schedule_cache_warm
 
 
 def about_view(request):
@@ -78,13 +89,37 @@ class TournamentUpdateView(LoginRequiredMixin, TournamentOwnerMixin, UpdateView)
 
 class TournamentDeleteView(LoginRequiredMixin, TournamentOwnerMixin, DeleteView):
     model = Tournament
-    template__name = 'tournament/tournament_confirm_delete.html'
+    template_name = 'tournament/tournament_confirm_delete.html'
     success_url = reverse_lazy('landing-page')
 
 
+class FieldScoreboardView(TemplateView):
+    """
+    Full-screen scoreboard of one field for venue TVs. The page is a thin
+    shell that polls the field's scoreboard API.
+    """
+    template_name = "display/scoreboard.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tournament = resolve_tournament(self.kwargs['slug'])
+        document = get_scoreboard_document(self.kwargs['field_id'])
+        if tournament is None or document is None or document['tournament_id'] != tournament.pk:
+            raise Http404("Field not found.")
+        context.update({
+            'field_name': document['field_name'],
+            'api_url': reverse('api-field-scoreboard', kwargs=self.kwargs),
+        })
+        return context
+
+
 class SpaView(TemplateView):
     template_name = "spa.html"
 
+    def get(self, request, *args, **kwargs):
+        with replica_reads(request):
+            return super().get(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         logger = logging.getLogger(__name__)
@@ -114,7 +149,9 @@ class SpaView(TemplateView):
         except Exception as e:
             logger.exception(f"Error loading manifest: {e}")
             context.update({'slug': self.kwargs.get('slug', ''), 'js': '', 'css': []})
-        
+
+        tournament = resolve_tournament(context['slug'])
+        context['snapshot_url'] = snapshot_base_url(tournament) if tournament else None
         return context
 
 class TournamentDetailView(LoginRequiredMixin, TournamentOwnerMixin, DetailView):
@@ -126,11 +163,13 @@ class TournamentDetailView(LoginRequiredMixin, TournamentOwnerMixin, DetailView)
         context = super().get_context_data(**kwargs)
         tournament = self.object
 
-        timeline, field_names = build_timeline(tournament)
-
+        # The grid is a fragment cached per schedule/results version, so
+        # the timeline is only loaded when the grid is rendered again. The
+        # organiser has to see their own edits, never the previous grid.
         context.update({
-            'timeline': timeline,
-            'field_names': field_names,
+            'timeline': SimpleLazyObject(lambda: get_timeline(tournament, stale=False)),
+            'timeline_versions': get_versions(tournament.pk, TIMELINE_SCOPES),
+            'fragment_timeout': PAYLOAD_TIMEOUT,
             'fields': tournament.fields.all(),
         })
 
@@ -232,7 +271,7 @@ class TeamDetailView(LoginRequiredMixin, TournamentAccessMixin, DetailView):
         context.update({
             'finished_matches': finished_matches,
             'upcoming_matches': upcoming_matches,
-            'players': team.players.all(),
+            'players': team.players.with_event_counts(),
             'tournament': tournament,
         })
 
@@ -247,7 +286,7 @@ class TeamCreateView(LoginRequiredMixin, TournamentAccessMixin, CreateView):
         context = super().get_context_data(**kwargs)
         tournament = self.get_tournament()
         context['tournament'] = tournament
-        context['teams'] = tournament.teams.all().prefetch_related('player_set')
+        context['teams'] = tournament.teams.all().prefetch_related('players')
         return context
 
     def get_success_url(self):
@@ -324,6 +363,9 @@ class MatchDetailView(LoginRequiredMixin, TournamentAccessMixin, DetailView):
     template_name = 'matches/match_detail.html'
     context_object_name = 'match'
 
+    def get_queryset(self):
+        return Match.objects.select_related('home_team', 'away_team', 'field')
+
     def get_object(self, queryset=None):
         match = super().get_object(queryset)
         if match.tournament_id != self.get_tournament().pk:
@@ -341,6 +383,7 @@ class MatchDetailView(LoginRequiredMixin, TournamentAccessMixin, DetailView):
         away_goals += match.events.filter(event_type='own_goal', team=match.home_team).count()
 
         context.update({
+            'match_events': match.events.select_related('player'),
             'home_goals': home_goals,
             'away_goals': away_goals,
             'tournament': self.get_tournament(),
@@ -352,6 +395,9 @@ class MatchEditView(LoginRequiredMixin, TournamentAccessMixin, UpdateView):
     form_class = MatchEditForm
     template_name = 'matches/match_edit.html'
 
+    def get_queryset(self):
+        return Match.objects.select_related('home_team', 'away_team')
+
     def get_object(self, queryset=None):
         match = super().get_object(queryset)
         tournament = self.get_tournament()
@@ -373,8 +419,13 @@ class MatchEditView(LoginRequiredMixin, TournamentAccessMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         match = self.object
+        players = Player.objects.filter(
+            team_id__in=[match.home_team_id, match.away_team_id]
+        ).with_event_counts()
         context.update({
-            'match_events': match.events.all(),
+            'match_events': match.events.select_related('player'),
+            'home_players': [p for p in players if p.team_id == match.home_team_id],
+            'away_players': [p for p in players if p.team_id == match.away_team_id],
             'tournament': self.get_tournament()
         })
         return context
@@ -428,7 +479,7 @@ def create_match_event(request, tournament_id, match_id):
     team_side = request.POST.get('team')
     player_id = request.POST.get('player_id')
     team_id = request.POST.get('team_id')
-    minute = request.POST.get('minute', '0')
+    minute = request.POST.get('minute') or current_minute(match)
 
     if not player_id or not team_id:
         return JsonResponse({'success': False, 'error': 'Missing player_id or team_id'}, status=400)
@@ -456,11 +507,9 @@ def create_match_event(request, tournament_id, match_id):
         event_type=event_type,
         minute=minute,
     )
-    if event_type == 'yellow_card':
-        if player.yellow_cards() >= match.tournament.yellow_cards_for_suspension:
-            player.is_muted = True
-            player.save(update_fields=['is_muted'])
-    elif event_type == 'red_card':
+    # Mute straight away so the player can't score later in this match;
+    # the ban's length is settled by apply_suspensions() at full time.
+    if event_type in ('yellow_card', 'red_card') and player.is_suspended():
         player.is_muted = True
         player.save(update_fields=['is_muted'])
 
@@ -477,6 +526,7 @@ def create_match_event(request, tournament_id, match_id):
 
     if match.is_finished:
         recalculate_points(match)
+    schedule_cache_warm(tournament.pk)
 
     return JsonResponse({
         'success': True,
@@ -492,6 +542,49 @@ def create_match_event(request, tournament_id, match_id):
         }
     })
 
+@require_POST
+@login_required
+def match_clock(request, tournament_id, match_id):
+    """Kick off, pause, resume, call half-time or end a match's clock."""
+    tournament = get_object_or_404(Tournament, id=tournament_id, owner=request.user)
+    match = get_object_or_404(Match, id=match_id, tournament=tournament)
+
+    try:
+        document = change_clock(match, request.POST.get('action', ''))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    return JsonResponse({'success': True, 'clock': {**document, 'minute': clock_minute(document)}})
+
+@require_POST
+@login_required
+def batch_match_events(request, tournament_id, match_id):
+    """
+    Sync a referee's queued events in one request. The JSON body is
+    `{"events": [{"key", "event_type", "team_id", "player_id", "minute"}, ...]}`;
+    resending a batch is safe, already recorded keys come back as duplicates.
+    """
+    tournament = get_object_or_404(Tournament, id=tournament_id, owner=request.user)
+    match = get_object_or_404(
+        Match.objects.select_related('tournament'), id=match_id, tournament=tournament
+    )
+
+    try:
+        events = json.loads(request.body).get('events')
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+
+    if not isinstance(events, list) or not all(isinstance(e, dict) for e in events):
+        return JsonResponse({'success': False, 'error': 'events must be a list of objects.'}, status=400)
+    if len(events) > MAX_EVENT_BATCH:
+        return JsonResponse(
+            {'success': False, 'error': f'At most {MAX_EVENT_BATCH} events per batch.'}, status=400
+        )
+
+    result = record_event_batch(match, events)
+    schedule_cache_warm(tournament.pk)
+    return JsonResponse({'success': True, **result})
+
 @login_required
 def add_player(request, tournament_id, team_id):
     tournament = get_object_or_404(Tournament, id=tournament_id)
@@ -524,11 +617,9 @@ def finish_match(request, tournament_id, match_id):
 
     if not match.is_finished:
         match.apply_result()
-        # increment games_sat_out for muted players on both teams
-        for team in [match.home_team, match.away_team]:
-            team.players.filter(is_muted=True).update(
-                games_sat_out=F('games_sat_out') + 1
-            )
+        apply_suspensions(match)
+        stop_clock(match)
+        schedule_cache_warm(tournament.pk)
     return redirect('tournament-detail', pk=tournament_id)
 
 @require_http_methods(['DELETE'])
@@ -549,6 +640,7 @@ def remove_match_event(request, tournament_id, event_id):
         match.away_score = 0
         match.save()
         match.apply_result()
+    schedule_cache_warm(match.tournament_id)
 
     return JsonResponse({
         'success': True,
@@ -598,7 +690,7 @@ def generate_tournament_schedule(request, tournament_id):
             pause_duration = timedelta(minutes=form.cleaned_data['pause_duration'])
 
             start_time = timezone.make_aware(
-                datetime.combine(start_date, start_time_input)
+                datetime.combine(start_date, start_time_input), tournament.tzinfo
             )
 
             if form.cleaned_data['has_halves']:
@@ -608,6 +700,13 @@ def generate_tournament_schedule(request, tournament_id):
             else:
                 total_match_duration = timedelta(minutes=form.cleaned_data['game_duration'])
 
+            # remembered for the match clock
+            tournament.has_halves = form.cleaned_data['has_halves']
+            for name in ('half_duration', 'half_time_break', 'game_duration'):
+                if form.cleaned_data[name] is not None:
+                    setattr(tournament, name, form.cleaned_data[name])
+            tournament.save(update_fields=['has_halves', 'half_duration', 'half_time_break', 'game_duration'])
+
             try:
                 create_round_robin_matches(
                     tournament=tournament,
@@ -621,7 +720,12 @@ def generate_tournament_schedule(request, tournament_id):
 
             return redirect('tournament-detail', pk=tournament.pk)
     else:
-        form = TournamentScheduleForm()
+        form = TournamentScheduleForm(initial={
+            'has_halves': tournament.has_halves,
+            'half_duration': tournament.half_duration,
+            'half_time_break': tournament.half_time_break,
+            'game_duration': tournament.game_duration,
+        })
 
     return render(request, 'tournament/generate_schedule.html', {
         'form': form,
@@ -634,6 +738,9 @@ def toggle_tournament_status(request, pk):
     tournament = get_object_or_404(Tournament, pk=pk, owner=request.user)
     tournament.is_finished = not tournament.is_finished
     tournament.save(update_fields=['is_finished'])
+    # Publish the finished tournament's static copy (or take it down when
+    # reopened) on the job queue, once the new status is committed.
+    schedule_snapshot_sync(tournament.pk)
     return redirect('tournament-detail', pk=pk)
 
 @require_POST
@@ -656,10 +763,11 @@ def edit_match(request, tournament_id, match_id):
         new_field = form.cleaned_data['field']
         propagate = form.cleaned_data['propagate']
 
-        # combine with tournament date or fall back to match's current date
-        base_date = tournament.tournament_date or match.start_time.date()
+        # the new time is on the match's own day, in the tournament's timezone
+        tzinfo = tournament.tzinfo
+        base_date = match.start_time.astimezone(tzinfo).date()
         new_start = timezone.make_aware(
-            datetime.combine(base_date, new_time)
+            datetime.combine(base_date, new_time), tzinfo
         )
 
         if propagate:
@@ -670,6 +778,7 @@ def edit_match(request, tournament_id, match_id):
 
         match.field = new_field
         match.save(update_fields=['field'])
+        schedule_cache_warm(tournament.pk)
 
         messages.success(request, "Match updated.")
     else:
@@ -685,6 +794,7 @@ def delete_match(request, tournament_id, match_id):
     match = get_object_or_404(Match, pk=match_id, tournament=tournament)
 
     match.delete()
+    refresh_goal_counts(Player.objects.filter(team_id__in=[match.home_team_id, match.away_team_id]))
     messages.success(request, "Match removed.")
     return redirect('tournament-detail', pk=tournament_id)
 
@@ -714,5 +824,5 @@ def rename_player(request, tournament_id, player_id):
         return JsonResponse({'success': False, 'error': 'A player with that name already exists.'})
     
     player.name = name
-    player.save()
+    player.save(update_fields=['name'])
     return JsonResponse({'success': True, 'name': player.name})
\ No newline at end of file
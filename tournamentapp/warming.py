@@ -0,0 +1,64 @@
+"""
+Cache warming after result-changing writes.
+
+Writes that change results or the schedule invalidate the public
+payloads by bumping cache versions, so without warming the first
+spectator poll after a goal pays for the rebuild. `schedule_cache_warm`
+queues a rebuild of the schedule, leaderboard, crosstable and field
+scoreboards of the tournament on the job queue, and of the static
+snapshot when the tournament is finished.
+
+Rebuilds are debounced per tournament: the first write of a burst queues
+a job to run `CACHE_WARM_DEBOUNCE` seconds later, and the writes after
+it find that job still waiting (same dedupe key) and add nothing, so one
+rebuild covers the whole burst.
+"""
+from django.conf import settings
+
+from .api.responses import cached_entry
+from .api.views import LeaderboardAPIView, ScheduleAPIView
+from .cache import RESULTS, SCHEDULE, cached_payload
+from .jobs import enqueue, job
+from .models import Tournament
+from .scoreboard import get_scoreboard_document
+from .snapshots import schedule_snapshot_sync
+from .utils import build_crosstable
+
+
+def schedule_cache_warm(tournament_id):
+    """Rebuild the tournament's public payloads after the current commit."""
+    enqueue(
+        warm_tournament_caches, tournament_id,
+        dedupe_key=f"tournament:{tournament_id}:warm",
+        delay=getattr(settings, 'CACHE_WARM_DEBOUNCE', 2.0),
+    )
+
+
+@job(queue='warming', max_attempts=3)
+def warm_tournament_caches(tournament_id):
+    """Build every public payload of the tournament that isn't cached."""
+    tournament = Tournament.objects.filter(pk=tournament_id).first()
+    if tournament is None:
+        return
+
+    cached_entry(
+        'schedule', tournament.pk, [SCHEDULE, RESULTS],
+        lambda: ScheduleAPIView.build(tournament),
+    )
+    if tournament.show_leaderboard:
+        cached_entry(
+            'leaderboard', tournament.pk, [RESULTS],
+            lambda: cached_payload(
+                'leaderboard', tournament.pk, [RESULTS],
+                lambda: LeaderboardAPIView.build(tournament), stale=False,
+            ),
+        )
+        cached_entry(
+            'crosstable', tournament.pk, [RESULTS],
+            lambda: build_crosstable(tournament),
+        )
+    for field_id in tournament.fields.values_list('pk', flat=True):
+        get_scoreboard_document(field_id)
+    if tournament.is_finished:
+        # a result corrected after the finish
+        schedule_snapshot_sync(tournament.pk)
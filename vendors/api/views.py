@@ -1,26 +1,22 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.permissions import AllowAny
-from django.shortcuts import get_object_or_404
-
-from tournamentapp.models import Tournament
+from tournamentapp.api.base import PublicAPIView
+from tournamentapp.snapshots import snapshot_redirect
 from vendors.models import Vendor
 from .serializers import VendorSerializer
 
 
-class VendorListAPIView(APIView):
-    permission_classes = [AllowAny]
-
-    def get(self, request, slug):
-        tournament = get_object_or_404(Tournament, slug=slug)
+class VendorListAPIView(PublicAPIView):
+    async def get(self, request, slug):
+        tournament = await self.get_tournament(slug)
 
         if not tournament.show_vendors:
-            return Response(
-                {'detail': 'Vendors are not public for this tournament.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            return self.error('Vendors are not public for this tournament.', 404)
+
+        published = snapshot_redirect(tournament, 'vendors')
+        if published:
+            return published
 
-        vendors = Vendor.objects.filter(tournament=tournament, is_active=True)
+        vendors = [
+            obj async for obj in Vendor.objects.filter(tournament=tournament, is_active=True)
+        ]
         serializer = VendorSerializer(vendors, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return self.respond(serializer.data)
\ No newline at end of file